@@ -0,0 +1,31 @@
+"""add shared llm rate limit buckets
+
+Revision ID: 20261019_0013
+Revises: 20260307_0012
+Create Date: 2026-10-19 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0013"
+down_revision = "20260307_0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_rate_limit_buckets",
+        sa.Column("bucket_key", sa.String(length=64), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("refilled_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("blocked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("bucket_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("llm_rate_limit_buckets")
@@ -0,0 +1,48 @@
+"""add per-status draft counters to intake batches
+
+Revision ID: 20261019_0014
+Revises: 20261019_0013
+Create Date: 2026-10-19 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0014"
+down_revision = "20261019_0013"
+branch_labels = None
+depends_on = None
+
+_NEW_COUNTERS = {
+    "uploaded": "uploaded_count",
+    "processing": "processing_count",
+    "ready": "ready_count",
+    "review": "review_count",
+    "rejected": "rejected_count",
+    "error": "error_count",
+}
+
+
+def upgrade() -> None:
+    for column_name in _NEW_COUNTERS.values():
+        op.add_column(
+            "intake_batches",
+            sa.Column(column_name, sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    counters = {**_NEW_COUNTERS, "committed": "committed_count"}
+    for status_value, column_name in counters.items():
+        op.execute(
+            sa.text(
+                f"UPDATE intake_batches SET {column_name} = ("
+                "SELECT COUNT(*) FROM intake_drafts "
+                "WHERE intake_drafts.batch_id = intake_batches.id AND intake_drafts.status = :status"
+                ")"
+            ).bindparams(status=status_value)
+        )
+
+
+def downgrade() -> None:
+    for column_name in reversed(list(_NEW_COUNTERS.values())):
+        op.drop_column("intake_batches", column_name)
@@ -0,0 +1,64 @@
+"""add composite and partial indexes for warehouse-scoped queries
+
+Revision ID: 20261019_0015
+Revises: 20261019_0014
+Create Date: 2026-10-19 11:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0015"
+down_revision = "20261019_0014"
+branch_labels = None
+depends_on = None
+
+_ACTIVE_ROWS = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_items_warehouse_active_created",
+        "items",
+        ["warehouse_id", "created_at"],
+        unique=False,
+        postgresql_where=_ACTIVE_ROWS,
+        sqlite_where=_ACTIVE_ROWS,
+    )
+    op.create_index(
+        "ix_items_warehouse_box_active",
+        "items",
+        ["warehouse_id", "box_id"],
+        unique=False,
+        postgresql_where=_ACTIVE_ROWS,
+        sqlite_where=_ACTIVE_ROWS,
+    )
+    op.create_index("ix_boxes_warehouse_deleted", "boxes", ["warehouse_id", "deleted_at"], unique=False)
+    op.create_index(
+        "ix_intake_drafts_batch_status_position",
+        "intake_drafts",
+        ["batch_id", "status", "position"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_activity_events_warehouse_created",
+        "activity_events",
+        ["warehouse_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_intake_batches_warehouse_updated",
+        "intake_batches",
+        ["warehouse_id", "updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_intake_batches_warehouse_updated", table_name="intake_batches")
+    op.drop_index("ix_activity_events_warehouse_created", table_name="activity_events")
+    op.drop_index("ix_intake_drafts_batch_status_position", table_name="intake_drafts")
+    op.drop_index("ix_boxes_warehouse_deleted", table_name="boxes")
+    op.drop_index("ix_items_warehouse_box_active", table_name="items")
+    op.drop_index("ix_items_warehouse_active_created", table_name="items")
@@ -0,0 +1,27 @@
+"""normalize stored box short codes
+
+Revision ID: 20261019_0016
+Revises: 20261019_0015
+Create Date: 2026-10-19 13:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261019_0016"
+down_revision = "20261019_0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lookups now compare short_code by equality so ix_boxes_short_code is usable.
+    op.execute(
+        "UPDATE boxes SET short_code = UPPER(TRIM(short_code)) "
+        "WHERE short_code <> UPPER(TRIM(short_code))"
+    )
+
+
+def downgrade() -> None:
+    # Normalization is lossy; original casing cannot be restored.
+    pass
@@ -0,0 +1,29 @@
+"""add block-reserved sequence for box short codes
+
+Revision ID: 20261019_0017
+Revises: 20261019_0016
+Create Date: 2026-10-19 14:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0017"
+down_revision = "20261019_0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "box_code_sequences",
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.Column("next_value", sa.Integer(), nullable=False),
+        sa.Column("scramble_key", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("box_code_sequences")
@@ -0,0 +1,32 @@
+"""index revoked refresh tokens by update time
+
+Revision ID: 20261019_0018
+Revises: 20261019_0017
+Create Date: 2026-10-19 15:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0018"
+down_revision = "20261019_0017"
+branch_labels = None
+depends_on = None
+
+_REVOKED_ROWS = sa.text("revoked")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_refresh_tokens_revoked_updated",
+        "refresh_tokens",
+        ["updated_at"],
+        unique=False,
+        postgresql_where=_REVOKED_ROWS,
+        sqlite_where=_REVOKED_ROWS,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_revoked_updated", table_name="refresh_tokens")
@@ -0,0 +1,45 @@
+"""store media photo urls as host-relative paths
+
+Revision ID: 20261019_0019
+Revises: 20261019_0018
+Create Date: 2026-10-19 16:00:00
+
+Only URLs under the default /media/ path are rewritten. Deployments with a custom MEDIA_URL_PATH
+must pass it explicitly, e.g. `alembic -x media_url_path=/files upgrade head`.
+"""
+
+from alembic import context, op
+
+
+revision = "20261019_0019"
+down_revision = "20261019_0018"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("items", "intake_drafts")
+_DEFAULT_MEDIA_URL_PATH = "/media"
+
+
+def _media_prefix() -> str:
+    media_url_path = context.get_x_argument(as_dictionary=True).get("media_url_path", _DEFAULT_MEDIA_URL_PATH)
+    return "/" + media_url_path.strip("/").replace("'", "''") + "/"
+
+
+def upgrade() -> None:
+    # Photo URLs were stored with the request host; responses now sign host-relative paths.
+    # instr/strpos take the same arguments, so one statement serves SQLite and PostgreSQL.
+    position = "strpos" if op.get_context().dialect.name == "postgresql" else "instr"
+    media_path = f"'{_media_prefix()}' || warehouse_id || '/'"
+    scheme_end = f"{position}(photo_url, '://')"
+    # Only rewrite when the media prefix is the start of the path, i.e. the first '/' after the host.
+    path_start = f"{scheme_end} + 2 + {position}(substr(photo_url, {scheme_end} + 3), '/')"
+    for table in _TABLES:
+        op.execute(
+            f"UPDATE {table} SET photo_url = substr(photo_url, {position}(photo_url, {media_path})) "
+            f"WHERE {scheme_end} > 0 AND {position}(photo_url, {media_path}) = {path_start}"
+        )
+
+
+def downgrade() -> None:
+    # The original hosts are not recorded; relative paths still resolve against the API host.
+    pass
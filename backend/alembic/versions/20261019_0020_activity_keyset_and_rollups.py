@@ -0,0 +1,65 @@
+"""activity keyset indexes and daily rollups
+
+Revision ID: 20261019_0020
+Revises: 20261019_0019
+Create Date: 2026-10-19 17:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0020"
+down_revision = "20261019_0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The feed pages on (created_at, id); including id lets the index satisfy the tie-breaker too.
+    op.drop_index("ix_activity_events_warehouse_created", table_name="activity_events")
+    op.create_index(
+        "ix_activity_events_warehouse_created_id",
+        "activity_events",
+        ["warehouse_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_activity_events_warehouse_entity",
+        "activity_events",
+        ["warehouse_id", "entity_type", "entity_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_table(
+        "activity_daily_rollups",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("warehouse_id", sa.String(length=36), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("event_type", sa.String(length=64), nullable=False),
+        sa.Column("actor_user_id", sa.String(length=36), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["warehouse_id"], ["warehouses.id"]),
+        sa.ForeignKeyConstraint(["actor_user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "warehouse_id",
+            "day",
+            "event_type",
+            "actor_user_id",
+            name="uq_activity_daily_rollups_key",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("activity_daily_rollups")
+    op.drop_index("ix_activity_events_warehouse_entity", table_name="activity_events")
+    op.drop_index("ix_activity_events_warehouse_created_id", table_name="activity_events")
+    op.create_index(
+        "ix_activity_events_warehouse_created",
+        "activity_events",
+        ["warehouse_id", "created_at"],
+        unique=False,
+    )
@@ -0,0 +1,33 @@
+"""seed the box short code sequence row
+
+Revision ID: 20261019_0021
+Revises: 20261019_0020
+Create Date: 2026-10-19 18:00:00
+"""
+
+import secrets
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0021"
+down_revision = "20261019_0020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Reservations are a single UPDATE ... RETURNING, so the row must exist before the first one.
+    op.execute(
+        sa.text(
+            "INSERT INTO box_code_sequences (name, next_value, scramble_key) "
+            f"SELECT 'box_short_code', 0, {secrets.randbelow(1 << 24)} "
+            "WHERE NOT EXISTS (SELECT 1 FROM box_code_sequences WHERE name = 'box_short_code')"
+        )
+    )
+
+
+def downgrade() -> None:
+    # The row may already carry reservations; dropping it would reissue codes.
+    pass
@@ -1,18 +1,27 @@
+from collections.abc import Callable
 import logging
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.media import signing_epoch
 from app.db.session import get_db
 from app.models.membership import Membership
-from app.models.refresh_token import RefreshToken
 from app.models.user import User
+from app.services.auth_cache import (
+    get_cached_membership,
+    get_cached_user,
+    remember_membership,
+    remember_user,
+)
+from app.services.conditional_get import WarehouseVersion, build_warehouse_version, etag_matches
 from app.services.security import decode_token, hash_token
-from app.utils.datetime import ensure_utc, utcnow
+from app.services.sync_log import latest_change_seq
+from app.services.token_revocation import is_token_revoked
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_v1_prefix}/auth/login")
 logger = logging.getLogger(__name__)
@@ -29,20 +38,22 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         if not user_id or token_type != "access":
             logger.error("Invalid access token payload sub=%s type=%s", user_id, token_type)
             raise credentials_exception
-        if payload.get("remember_me"):
-            stored = db.scalar(select(RefreshToken).where(RefreshToken.token_hash == hash_token(token)))
-            if stored is None or stored.revoked or ensure_utc(stored.expires_at) < utcnow():
-                logger.error("Persistent access token revoked or missing user_id=%s", user_id)
-                raise credentials_exception
+        # Persistent tokens carry no exp; the signature proves issuance, so only revocation needs checking.
+        if payload.get("remember_me") and is_token_revoked(hash_token(token)):
+            logger.error("Persistent access token revoked user_id=%s", user_id)
+            raise credentials_exception
         logger.debug("Access token decoded for user_id=%s", user_id)
     except JWTError as exc:
         logger.error("JWT validation failed while resolving current user")
         raise credentials_exception from exc
 
-    user = db.scalar(select(User).where(User.id == user_id))
+    user = get_cached_user(db, user_id)
     if user is None:
-        logger.error("Access token sub=%s references missing user", user_id)
-        raise credentials_exception
+        user = db.scalar(select(User).where(User.id == user_id))
+        if user is None:
+            logger.error("Access token sub=%s references missing user", user_id)
+            raise credentials_exception
+        remember_user(db, user)
     logger.debug("Resolved authenticated user user_id=%s", user.id)
     return user
 
@@ -52,6 +63,10 @@ def require_warehouse_membership(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Membership:
+    membership = get_cached_membership(db, user_id=current_user.id, warehouse_id=warehouse_id)
+    if membership is not None:
+        return membership
+
     membership = db.scalar(
         select(Membership).where(
             Membership.warehouse_id == warehouse_id,
@@ -65,9 +80,42 @@ def require_warehouse_membership(
             current_user.id,
         )
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to warehouse")
+    remember_membership(db, membership)
     logger.debug(
         "Warehouse membership validated warehouse_id=%s user_id=%s",
         warehouse_id,
         current_user.id,
     )
     return membership
+
+
+def warehouse_version(*, per_user: bool = False, signed_media: bool = False) -> Callable[..., WarehouseVersion]:
+    # Runs before the endpoint body, so a matching If-None-Match costs one indexed max(seq) lookup.
+    def dependency(
+        request: Request,
+        response: Response,
+        warehouse_id: str,
+        _membership: Membership = Depends(require_warehouse_membership),
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db),
+    ) -> WarehouseVersion:
+        version = build_warehouse_version(
+            warehouse_id=warehouse_id,
+            path=request.url.path,
+            query_params=request.query_params,
+            last_seq=latest_change_seq(db, warehouse_id),
+            user_id=current_user.id if per_user else None,
+            media_epoch=signing_epoch() if signed_media else None,
+        )
+        if etag_matches(request.headers.get("if-none-match"), version.etag):
+            logger.debug(
+                "Conditional GET not modified warehouse_id=%s path=%s etag=%s",
+                warehouse_id,
+                request.url.path,
+                version.etag,
+            )
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=version.headers)
+        response.headers.update(version.headers)
+        return version
+
+    return dependency
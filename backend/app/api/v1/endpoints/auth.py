@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.core.config import settings
+from app.db.async_session import HotPathSession, get_hot_path_db
 from app.db.session import get_db
 from app.models.password_reset_token import PasswordResetToken
 from app.models.refresh_token import RefreshToken
@@ -24,14 +25,19 @@ from app.schemas.auth import (
     UserResponse,
 )
 from app.schemas.common import MessageResponse
+from app.services.auth_cache import invalidate_user
+from app.services.password_hashing import (
+    PasswordHashingBusyError,
+    hash_password_async,
+    verify_password_async,
+)
 from app.services.security import (
     build_access_token,
     build_refresh_token,
     decode_token,
-    hash_password,
     hash_token,
-    verify_password,
 )
+from app.services.token_revocation import mark_tokens_revoked, refresh_token_revocations
 from app.utils.datetime import ensure_utc, utcnow
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -106,6 +112,7 @@ def _revoke_token_values(db: Session, token_values: set[str]) -> None:
         return
     token_hashes = [hash_token(token) for token in token_values]
     db.execute(update(RefreshToken).where(RefreshToken.token_hash.in_(token_hashes)).values(revoked=True))
+    mark_tokens_revoked(token_hashes)
 
 
 def _resolve_refresh_token(request: Request, payload: RefreshRequest | None) -> tuple[str | None, bool]:
@@ -115,19 +122,51 @@ def _resolve_refresh_token(request: Request, payload: RefreshRequest | None) ->
     return cookie_token or body_token, remember_me
 
 
+async def _hash_password(password: str) -> str:
+    try:
+        return await hash_password_async(password)
+    except PasswordHashingBusyError as exc:
+        raise _password_hashing_busy() from exc
+
+
+async def _verify_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    try:
+        return await verify_password_async(plain_password, hashed_password)
+    except PasswordHashingBusyError as exc:
+        raise _password_hashing_busy() from exc
+
+
+def _password_hashing_busy() -> HTTPException:
+    logger.warning("Password hashing rejected: pool saturated")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication temporarily unavailable",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _find_user_by_email(db: Session, email: str) -> User | None:
+    return db.scalar(select(User).where(User.email == email))
+
+
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(payload: SignupRequest, db: Session = Depends(get_db)) -> UserResponse:
+async def signup(payload: SignupRequest, db: HotPathSession = Depends(get_hot_path_db)) -> UserResponse:
     normalized_email = payload.email.lower()
     logger.debug("Signup requested email=%s", normalized_email)
-    exists = db.scalar(select(User).where(User.email == normalized_email))
+    exists = await db.run(_find_user_by_email, normalized_email)
     if exists:
         logger.error("Signup rejected: email already exists email=%s", normalized_email)
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
 
+    password_hash = await _hash_password(payload.password)
+    return await db.run(_create_user, normalized_email, password_hash, payload.display_name)
+
+
+def _create_user(db: Session, email: str, password_hash: str, display_name: str | None) -> UserResponse:
     user = User(
-        email=normalized_email,
-        password_hash=hash_password(payload.password),
-        display_name=payload.display_name,
+        email=email,
+        password_hash=password_hash,
+        display_name=display_name,
     )
     db.add(user)
     db.commit()
@@ -137,16 +176,22 @@ def signup(payload: SignupRequest, db: Session = Depends(get_db)) -> UserRespons
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, response: Response, db: Session = Depends(get_db)) -> TokenResponse:
+async def login(
+    payload: LoginRequest,
+    response: Response,
+    db: HotPathSession = Depends(get_hot_path_db),
+) -> TokenResponse:
     normalized_email = payload.email.lower()
     logger.debug("Login requested email=%s", normalized_email)
-    user = db.scalar(select(User).where(User.email == normalized_email))
-    if user is None or not verify_password(payload.password, user.password_hash):
+    user = await db.run(_find_user_by_email, normalized_email)
+    valid, upgraded_hash = (False, None)
+    if user is not None:
+        valid, upgraded_hash = await _verify_password(payload.password, user.password_hash)
+    if user is None or not valid:
         logger.error("Login rejected for email=%s", normalized_email)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    tokens = _issue_token_pair(db, user.id, payload.remember_me)
-    db.commit()
+    tokens = await db.run(_complete_login, user, payload.remember_me, upgraded_hash)
     if payload.remember_me:
         _set_refresh_cookie(response, tokens.refresh_token, remember_me=True)
     else:
@@ -155,6 +200,17 @@ def login(payload: LoginRequest, response: Response, db: Session = Depends(get_d
     return tokens
 
 
+def _complete_login(db: Session, user: User, remember_me: bool, upgraded_hash: str | None) -> TokenResponse:
+    if upgraded_hash is not None:
+        user.password_hash = upgraded_hash
+        logger.info("Password hash upgraded to current argon2 parameters user_id=%s", user.id)
+    tokens = _issue_token_pair(db, user.id, remember_me)
+    db.commit()
+    if upgraded_hash is not None:
+        invalidate_user(user.id)
+    return tokens
+
+
 @router.post("/refresh", response_model=TokenResponse)
 def refresh(
     request: Request,
@@ -170,7 +226,7 @@ def refresh(
 
     try:
         token_payload = decode_token(refresh_token_value)
-    except Exception as exc:  # noqa: BLE001
+    except Exception as exc:
         logger.error("Refresh rejected: token decode failed")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token") from exc
 
@@ -252,9 +308,7 @@ def forgot_password(payload: ForgotPasswordRequest, db: Session = Depends(get_db
     )
 
 
-@router.post("/reset-password", response_model=MessageResponse)
-def reset_password(payload: ResetPasswordRequest, db: Session = Depends(get_db)) -> MessageResponse:
-    token_hash_value = hash_token(payload.token)
+def _load_reset_token(db: Session, token_hash_value: str) -> PasswordResetToken:
     reset_token = db.scalar(
         select(PasswordResetToken).where(PasswordResetToken.token_hash == token_hash_value)
     )
@@ -262,39 +316,65 @@ def reset_password(payload: ResetPasswordRequest, db: Session = Depends(get_db))
     if reset_token is None or reset_token.used or ensure_utc(reset_token.expires_at) < utcnow():
         logger.error("Reset-password rejected: invalid or expired token")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
+    return reset_token
+
 
+@router.post("/reset-password", response_model=MessageResponse)
+async def reset_password(
+    payload: ResetPasswordRequest,
+    db: HotPathSession = Depends(get_hot_path_db),
+) -> MessageResponse:
+    token_hash_value = hash_token(payload.token)
+    # Reject bad tokens before spending an argon2 hash on them.
+    await db.run(_load_reset_token, token_hash_value)
+    password_hash = await _hash_password(payload.new_password)
+    return await db.run(_apply_password_reset, token_hash_value, password_hash)
+
+
+def _apply_password_reset(db: Session, token_hash_value: str, password_hash: str) -> MessageResponse:
+    reset_token = _load_reset_token(db, token_hash_value)
     user = db.scalar(select(User).where(User.id == reset_token.user_id))
     if user is None:
         logger.error("Reset-password rejected: user not found user_id=%s", reset_token.user_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    user.password_hash = hash_password(payload.new_password)
+    user.password_hash = password_hash
     reset_token.used = True
     db.execute(update(RefreshToken).where(RefreshToken.user_id == user.id).values(revoked=True))
     db.commit()
+    invalidate_user(user.id)
+    refresh_token_revocations()
     logger.info("Password reset completed user_id=%s", user.id)
     return MessageResponse(message="Password reset successfully")
 
 
 @router.post("/change-password", response_model=MessageResponse)
-def change_password(
+async def change_password(
     payload: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: HotPathSession = Depends(get_hot_path_db),
 ) -> MessageResponse:
     logger.debug("Change-password requested user_id=%s", current_user.id)
-    if not verify_password(payload.current_password, current_user.password_hash):
+    valid, _upgraded_hash = await _verify_password(payload.current_password, current_user.password_hash)
+    if not valid:
         logger.error("Change-password rejected: current password mismatch user_id=%s", current_user.id)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect")
 
-    current_user.password_hash = hash_password(payload.new_password)
+    password_hash = await _hash_password(payload.new_password)
+    return await db.run(_apply_password_change, current_user.id, password_hash)
+
+
+def _apply_password_change(db: Session, user_id: str, password_hash: str) -> MessageResponse:
+    db.execute(update(User).where(User.id == user_id).values(password_hash=password_hash))
     db.execute(
         update(RefreshToken)
-        .where(RefreshToken.user_id == current_user.id)
+        .where(RefreshToken.user_id == user_id)
         .values(revoked=True)
     )
     db.commit()
-    logger.info("Password changed user_id=%s", current_user.id)
+    invalidate_user(user_id)
+    refresh_token_revocations()
+    logger.info("Password changed user_id=%s", user_id)
     return MessageResponse(message="Password changed")
 
 
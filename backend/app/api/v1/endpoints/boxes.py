@@ -2,11 +2,15 @@ from datetime import UTC, datetime
 import logging
 import secrets
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic_core import to_json
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_warehouse_membership
+from app.api.deps import get_current_user, require_warehouse_membership, warehouse_version
+from app.core.json_response import FastJSONResponse
+from app.core.media import sign_media_url
+from app.db.async_session import HotPathSession, get_hot_path_db
 from app.db.session import get_db
 from app.models.box import Box
 from app.models.item import Item
@@ -26,7 +30,27 @@ from app.schemas.box import (
 )
 from app.schemas.common import MessageResponse
 from app.services.activity import record_activity
+from app.services.auth_cache import get_cached_membership, remember_membership
 from app.services.box_codes import generate_unique_short_code, normalize_short_code
+from app.services.box_lookup import (
+    BoxLookupEntry,
+    get_cached_qr_lookup,
+    get_cached_short_code_lookup,
+    remember_qr_lookup,
+    remember_short_code_lookup,
+)
+from app.services.conditional_get import WarehouseVersion
+from app.services.read_models import (
+    BoxNode,
+    BoxRow,
+    ItemRow,
+    children_by_parent,
+    count_active_items_by_box,
+    fetch_rows,
+    load_box_nodes,
+    select_columns,
+)
+from app.services.response_cache import render_cached_json
 from app.services.sync_log import append_change_log
 
 router = APIRouter(prefix="/warehouses/{warehouse_id}/boxes", tags=["boxes"])
@@ -82,79 +106,112 @@ def _new_qr_token() -> str:
     return secrets.token_urlsafe(24)
 
 
-def _build_box_lookup_response(box: Box) -> BoxByQrResponse:
+def _build_box_lookup_response(entry: BoxLookupEntry) -> BoxByQrResponse:
     return BoxByQrResponse(
-        box_id=box.id,
-        warehouse_id=box.warehouse_id,
-        short_code=box.short_code,
-        name=box.name,
+        box_id=entry.box_id,
+        warehouse_id=entry.warehouse_id,
+        short_code=entry.short_code,
+        name=entry.name,
     )
 
 
-def _resolve_box_by_qr_token(db: Session, current_user: User, qr_token: str) -> Box:
+def _accessible_warehouse_ids(db: Session, current_user: User, warehouse_ids: set[str]) -> set[str]:
+    accessible = {
+        warehouse_id
+        for warehouse_id in warehouse_ids
+        if get_cached_membership(db, user_id=current_user.id, warehouse_id=warehouse_id) is not None
+    }
+    unknown = warehouse_ids - accessible
+    if unknown:
+        memberships = db.scalars(
+            select(Membership).where(
+                Membership.user_id == current_user.id,
+                Membership.warehouse_id.in_(unknown),
+            )
+        ).all()
+        for membership in memberships:
+            remember_membership(db, membership)
+            accessible.add(membership.warehouse_id)
+    return accessible
+
+
+def _find_qr_lookup(db: Session, qr_token: str) -> BoxLookupEntry | None:
+    entry = get_cached_qr_lookup(qr_token)
+    if entry is not None:
+        return entry
+    box = db.scalar(select(Box).where(Box.qr_token == qr_token, Box.deleted_at.is_(None)))
+    if box is None:
+        return None
+    return remember_qr_lookup(qr_token, box)
+
+
+def _resolve_box_by_qr_token(db: Session, current_user: User, qr_token: str) -> BoxLookupEntry:
     normalized_token = qr_token.strip()
     logger.debug("QR lookup requested qr_token_length=%s user_id=%s", len(normalized_token), current_user.id)
-    box = db.scalar(select(Box).where(Box.qr_token == normalized_token, Box.deleted_at.is_(None)))
-    if box is None:
+    entry = _find_qr_lookup(db, normalized_token)
+    if entry is None:
         logger.error("QR lookup failed: token not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR not found")
 
-    membership = db.scalar(
-        select(Membership.user_id).where(
-            Membership.user_id == current_user.id,
-            Membership.warehouse_id == box.warehouse_id,
-        )
-    )
-    if membership is None:
+    if not _accessible_warehouse_ids(db, current_user, {entry.warehouse_id}):
         logger.error(
             "QR lookup denied warehouse_id=%s user_id=%s",
-            box.warehouse_id,
+            entry.warehouse_id,
             current_user.id,
         )
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to warehouse")
 
     logger.info(
         "QR lookup resolved warehouse_id=%s box_id=%s user_id=%s",
-        box.warehouse_id,
-        box.id,
+        entry.warehouse_id,
+        entry.box_id,
         current_user.id,
     )
-    return box
+    return entry
+
+
+def _short_code_lookup_query(short_code: str) -> Select:
+    # Short codes are stored normalized, so plain equality can use ix_boxes_short_code.
+    return select(Box).where(Box.short_code == short_code, Box.deleted_at.is_(None)).order_by(Box.created_at.asc())
 
 
-def _resolve_box_by_short_code(db: Session, current_user: User, short_code: str) -> Box:
+def _find_short_code_lookups(db: Session, short_code: str) -> tuple[BoxLookupEntry, ...]:
+    entries = get_cached_short_code_lookup(short_code)
+    if entries is not None:
+        return entries
+    matching_boxes = db.scalars(_short_code_lookup_query(short_code)).all()
+    return remember_short_code_lookup(short_code, list(matching_boxes))
+
+
+def _resolve_box_by_short_code(db: Session, current_user: User, short_code: str) -> BoxLookupEntry:
     normalized_code = normalize_short_code(short_code)
     logger.debug("Short code lookup requested short_code=%s user_id=%s", normalized_code, current_user.id)
-    matching_boxes = db.scalars(
-        select(Box)
-        .where(func.upper(Box.short_code) == normalized_code, Box.deleted_at.is_(None))
-        .order_by(Box.created_at.asc())
-    ).all()
-    if not matching_boxes:
+    matching_entries = _find_short_code_lookups(db, normalized_code)
+    if not matching_entries:
         logger.error("Short code lookup failed: code not found short_code=%s", normalized_code)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Short code not found")
 
-    accessible_warehouse_ids = set(
-        db.scalars(select(Membership.warehouse_id).where(Membership.user_id == current_user.id)).all()
+    accessible_warehouse_ids = _accessible_warehouse_ids(
+        db, current_user, {entry.warehouse_id for entry in matching_entries}
     )
-    accessible_boxes = [box for box in matching_boxes if box.warehouse_id in accessible_warehouse_ids]
-    if len(accessible_boxes) == 1:
-        box = accessible_boxes[0]
+    accessible_entries = [entry for entry in matching_entries if entry.warehouse_id in accessible_warehouse_ids]
+    if len(accessible_entries) == 1:
+        entry = accessible_entries[0]
         logger.info(
             "Short code lookup resolved warehouse_id=%s box_id=%s user_id=%s short_code=%s",
-            box.warehouse_id,
-            box.id,
+            entry.warehouse_id,
+            entry.box_id,
             current_user.id,
             normalized_code,
         )
-        return box
+        return entry
 
-    if len(accessible_boxes) > 1:
+    if len(accessible_entries) > 1:
         logger.error(
             "Short code lookup ambiguous short_code=%s user_id=%s matches=%s",
             normalized_code,
             current_user.id,
-            len(accessible_boxes),
+            len(accessible_entries),
         )
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -166,12 +223,8 @@ def _resolve_box_by_short_code(db: Session, current_user: User, short_code: str)
 
 
 def _compute_recursive_counts(
-    boxes: dict[str, Box], children: dict[str | None, list[str]], warehouse_items: list[Item]
+    boxes: dict[str, BoxRow], children: dict[str | None, list[str]], direct_items: dict[str, int]
 ) -> tuple[dict[str, int], dict[str, int]]:
-    direct_items: dict[str, int] = {}
-    for item in warehouse_items:
-        direct_items[item.box_id] = direct_items.get(item.box_id, 0) + 1
-
     item_counts: dict[str, int] = {}
     box_counts: dict[str, int] = {}
 
@@ -219,7 +272,7 @@ def _favorite_set(db: Session, user_id: str, item_ids: list[str]) -> set[str]:
     return set(rows)
 
 
-def _box_path(warehouse_boxes: dict[str, Box], box_id: str) -> list[str]:
+def _box_path(warehouse_boxes: dict[str, BoxNode], box_id: str) -> list[str]:
     path: list[str] = []
     cursor = box_id
     safe_guard = 0
@@ -234,7 +287,7 @@ def _box_path(warehouse_boxes: dict[str, Box], box_id: str) -> list[str]:
     return path
 
 
-def _box_path_ids(warehouse_boxes: dict[str, Box], box_id: str) -> list[str]:
+def _box_path_ids(warehouse_boxes: dict[str, BoxNode], box_id: str) -> list[str]:
     path: list[str] = []
     cursor = box_id
     safe_guard = 0
@@ -254,25 +307,35 @@ def get_tree(
     warehouse_id: str,
     include_deleted: bool = False,
     _membership=Depends(require_warehouse_membership),
+    version: WarehouseVersion = Depends(warehouse_version()),
     db: Session = Depends(get_db),
-) -> list[BoxTreeNode]:
-    boxes, children = _build_box_maps(db, warehouse_id, include_deleted=include_deleted)
-    items = db.scalars(
-        select(Item).where(Item.warehouse_id == warehouse_id, Item.deleted_at.is_(None))
-    ).all()
-    item_counts, box_counts = _compute_recursive_counts(boxes, children, items)
+) -> Response:
+    return render_cached_json(
+        "box_tree",
+        version,
+        lambda: to_json(_build_tree(db, warehouse_id, include_deleted)),
+    )
 
-    ordered_nodes: list[BoxTreeNode] = []
+
+def _build_tree(db: Session, warehouse_id: str, include_deleted: bool) -> list[dict]:
+    query = select_columns(Box, BoxRow).where(Box.warehouse_id == warehouse_id)
+    if not include_deleted:
+        query = query.where(Box.deleted_at.is_(None))
+    boxes = {box.id: box for box in fetch_rows(db, BoxRow, query)}
+    children = children_by_parent(boxes)
+    item_counts, box_counts = _compute_recursive_counts(boxes, children, count_active_items_by_box(db, warehouse_id))
+
+    # Keys mirror BoxTreeNode and BoxResponse.
+    ordered_nodes: list[dict] = []
 
     def visit(node_id: str, level: int) -> None:
-        box = boxes[node_id]
         ordered_nodes.append(
-            BoxTreeNode(
-                box=BoxResponse.model_validate(box),
-                level=level,
-                total_items_recursive=item_counts.get(node_id, 0),
-                total_boxes_recursive=box_counts.get(node_id, 0),
-            )
+            {
+                "box": boxes[node_id]._asdict(),
+                "level": level,
+                "total_items_recursive": item_counts.get(node_id, 0),
+                "total_boxes_recursive": box_counts.get(node_id, 0),
+            }
         )
         for child_id in sorted(children.get(node_id, []), key=lambda cid: boxes[cid].name.lower()):
             visit(child_id, level + 1)
@@ -352,6 +415,7 @@ def get_box(
     warehouse_id: str,
     box_id: str,
     _membership=Depends(require_warehouse_membership),
+    _etag=Depends(warehouse_version()),
     db: Session = Depends(get_db),
 ) -> BoxResponse:
     box = _get_box(db, warehouse_id, box_id)
@@ -359,6 +423,18 @@ def get_box(
     return BoxResponse.model_validate(box)
 
 
+def _subtree_items_query(warehouse_id: str, subtree_ids: set[str], q: str | None) -> Select:
+    query = select_columns(Item, ItemRow).where(
+        Item.warehouse_id == warehouse_id,
+        Item.box_id.in_(subtree_ids),
+        Item.deleted_at.is_(None),
+    )
+    if q:
+        needle = f"%{q.strip().lower()}%"
+        query = query.where(func.lower(Item.name).like(needle))
+    return query.order_by(Item.name.asc())
+
+
 @router.get("/{box_id}/items", response_model=list[BoxItemResponse])
 def get_box_items_recursive(
     warehouse_id: str,
@@ -367,45 +443,38 @@ def get_box_items_recursive(
     _membership=Depends(require_warehouse_membership),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> list[BoxItemResponse]:
+) -> Response:
     _get_box(db, warehouse_id, box_id)
-    boxes, children = _build_box_maps(db, warehouse_id)
-    subtree_ids = _collect_descendant_ids(box_id, children)
+    boxes = load_box_nodes(db, warehouse_id)
+    subtree_ids = _collect_descendant_ids(box_id, children_by_parent(boxes))
 
-    query = select(Item).where(
-        Item.warehouse_id == warehouse_id,
-        Item.box_id.in_(subtree_ids),
-        Item.deleted_at.is_(None),
-    )
-    if q:
-        needle = f"%{q.strip().lower()}%"
-        query = query.where(func.lower(Item.name).like(needle))
-    items = db.scalars(query.order_by(Item.name.asc())).all()
+    items = fetch_rows(db, ItemRow, _subtree_items_query(warehouse_id, subtree_ids, q))
     item_ids = [item.id for item in items]
     stocks = _stock_map(db, item_ids)
     favorites = _favorite_set(db, current_user.id, item_ids)
 
-    response = [
-        BoxItemResponse(
-            id=item.id,
-            warehouse_id=item.warehouse_id,
-            box_id=item.box_id,
-            name=item.name,
-            description=item.description,
-            photo_url=item.photo_url,
-            physical_location=item.physical_location,
-            tags=item.tags or [],
-            aliases=item.aliases or [],
-            version=item.version,
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-            deleted_at=item.deleted_at,
-            stock=stocks.get(item.id, 0),
-            is_favorite=item.id in favorites,
-            box_path=_box_path(boxes, item.box_id),
-            box_path_ids=_box_path_ids(boxes, item.box_id),
-            box_is_inbound=bool(boxes.get(item.box_id).is_inbound) if boxes.get(item.box_id) else False,
-        )
+    # Keys mirror BoxItemResponse; encoded directly without building one model per item.
+    rows = [
+        {
+            "id": item.id,
+            "warehouse_id": item.warehouse_id,
+            "box_id": item.box_id,
+            "name": item.name,
+            "description": item.description,
+            "photo_url": sign_media_url(item.photo_url),
+            "physical_location": item.physical_location,
+            "tags": item.tags or [],
+            "aliases": item.aliases or [],
+            "version": item.version,
+            "created_at": item.created_at,
+            "updated_at": item.updated_at,
+            "deleted_at": item.deleted_at,
+            "stock": stocks.get(item.id, 0),
+            "is_favorite": item.id in favorites,
+            "box_path": _box_path(boxes, item.box_id),
+            "box_path_ids": _box_path_ids(boxes, item.box_id),
+            "box_is_inbound": bool(boxes[item.box_id].is_inbound) if item.box_id in boxes else False,
+        }
         for item in items
     ]
     logger.debug(
@@ -414,9 +483,9 @@ def get_box_items_recursive(
         box_id,
         q,
         len(subtree_ids),
-        len(response),
+        len(rows),
     )
-    return response
+    return FastJSONResponse(rows)
 
 
 @router.patch("/{box_id}", response_model=BoxResponse)
@@ -491,8 +560,7 @@ def move_box(
     if payload.new_parent_box_id:
         _get_box(db, warehouse_id, payload.new_parent_box_id)
 
-    boxes, children = _build_box_maps(db, warehouse_id)
-    descendants = _collect_descendant_ids(box_id, children)
+    descendants = _collect_descendant_ids(box_id, children_by_parent(load_box_nodes(db, warehouse_id)))
     if payload.new_parent_box_id and payload.new_parent_box_id in descendants:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot move box into a descendant")
 
@@ -653,26 +721,33 @@ def restore_box(
 
 
 @qr_router.get("/by-qr/{qr_token}", response_model=BoxByQrResponse)
-def get_box_by_qr(
+async def get_box_by_qr(
     qr_token: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: HotPathSession = Depends(get_hot_path_db),
 ) -> BoxByQrResponse:
-    box = _resolve_box_by_qr_token(db, current_user, qr_token)
-    return _build_box_lookup_response(box)
+    return await db.run(_lookup_box_by_qr, current_user, qr_token)
 
 
 @qr_router.get("/resolve/{identifier}", response_model=BoxByQrResponse)
-def resolve_box_identifier(
+async def resolve_box_identifier(
     identifier: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: HotPathSession = Depends(get_hot_path_db),
 ) -> BoxByQrResponse:
+    return await db.run(_lookup_box_by_identifier, current_user, identifier)
+
+
+def _lookup_box_by_qr(db: Session, current_user: User, qr_token: str) -> BoxByQrResponse:
+    entry = _resolve_box_by_qr_token(db, current_user, qr_token)
+    return _build_box_lookup_response(entry)
+
+
+def _lookup_box_by_identifier(db: Session, current_user: User, identifier: str) -> BoxByQrResponse:
     normalized_identifier = identifier.strip()
-    qr_match = db.scalar(select(Box.id).where(Box.qr_token == normalized_identifier, Box.deleted_at.is_(None)))
-    if qr_match is not None:
-        box = _resolve_box_by_qr_token(db, current_user, normalized_identifier)
-        return _build_box_lookup_response(box)
+    if _find_qr_lookup(db, normalized_identifier) is not None:
+        entry = _resolve_box_by_qr_token(db, current_user, normalized_identifier)
+        return _build_box_lookup_response(entry)
 
-    box = _resolve_box_by_short_code(db, current_user, normalized_identifier)
-    return _build_box_lookup_response(box)
+    entry = _resolve_box_by_short_code(db, current_user, normalized_identifier)
+    return _build_box_lookup_response(entry)
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
+import json
 import logging
 from pathlib import Path
 import shutil
+import time
+from urllib.parse import unquote, urlsplit
 import uuid
-from urllib.parse import unquote, urlsplit, urlunsplit
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
-from sqlalchemy import func, select
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func, insert, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_warehouse_membership
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.media import sign_media_url
+from app.db.session import SessionLocal, get_db
 from app.models.box import Box
+from app.models.change_log import ChangeLog
 from app.models.intake_batch import IntakeBatch
 from app.models.intake_draft import IntakeDraft
 from app.models.item import Item
@@ -30,8 +36,9 @@ from app.schemas.intake import (
     IntakeBatchResponse,
     IntakeBatchStartRequest,
     IntakeBatchStartResponse,
-    IntakeBatchUploadResponse,
     IntakeBatchStatus,
+    IntakeBatchUploadResponse,
+    IntakeDraftEventResponse,
     IntakeDraftReprocessMode,
     IntakeDraftReprocessRequest,
     IntakeDraftResponse,
@@ -39,13 +46,16 @@ from app.schemas.intake import (
     IntakeDraftUpdateRequest,
 )
 from app.services.activity import record_activity
+from app.services.intake_events import subscribe_batch_events, unsubscribe_batch_events
 from app.services.intake_processing import (
-    refresh_batch_rollup,
+    adjust_batch_status_counters,
+    batch_status_counts,
     resolve_intake_parallelism_for_warehouse,
-    resolve_batch_status_counts,
+    set_draft_status,
+    set_draft_statuses,
 )
 from app.services.intake_workers import ensure_batch_worker
-from app.services.stock import ensure_initial_stock_movement
+from app.services.stock import initial_stock_command_id
 from app.services.sync_log import append_change_log
 
 router = APIRouter(prefix="/warehouses/{warehouse_id}/intake", tags=["intake"])
@@ -61,6 +71,8 @@ _ALLOWED_CONTENT_TYPES = {
 }
 _MAX_UPLOAD_BYTES = 10 * 1024 * 1024
 _MAX_FILES_PER_UPLOAD = 40
+_SSE_POLL_SECONDS = 5.0
+_SSE_MAX_STREAM_SECONDS = 300.0
 
 
 def utcnow() -> datetime:
@@ -135,7 +147,7 @@ def _serialize_draft(draft: IntakeDraft, *, resolved_quantity: int | None = None
         id=draft.id,
         warehouse_id=draft.warehouse_id,
         batch_id=draft.batch_id,
-        photo_url=draft.photo_url,
+        photo_url=sign_media_url(draft.photo_url),
         status=IntakeDraftStatus(draft.status),
         position=draft.position,
         name=draft.name,
@@ -175,24 +187,73 @@ def _serialize_batch(batch: IntakeBatch, status_counts: dict[str, int]) -> Intak
     )
 
 
-def _resolve_status_counts_for_batches(db: Session, batch_ids: list[str]) -> dict[str, dict[str, int]]:
-    if not batch_ids:
-        return {}
-
-    counts_by_batch: dict[str, dict[str, int]] = {batch_id: {} for batch_id in batch_ids}
-    rows = db.execute(
-        select(IntakeDraft.batch_id, IntakeDraft.status, func.count(IntakeDraft.id))
-        .where(IntakeDraft.batch_id.in_(batch_ids))
-        .group_by(IntakeDraft.batch_id, IntakeDraft.status)
+def _build_batch_detail(db: Session, warehouse_id: str, batch_id: str) -> IntakeBatchDetailResponse:
+    batch = _get_batch(db, warehouse_id, batch_id)
+    drafts = db.scalars(
+        select(IntakeDraft)
+        .where(IntakeDraft.batch_id == batch_id, IntakeDraft.warehouse_id == warehouse_id)
+        .order_by(IntakeDraft.position.asc(), IntakeDraft.created_at.asc())
     ).all()
+    stock_by_item = _stock_map(
+        db,
+        [draft.created_item_id for draft in drafts if draft.status == IntakeDraftStatus.committed.value and draft.created_item_id],
+    )
+    status_counts = batch_status_counts(batch)
+    return IntakeBatchDetailResponse(
+        batch=_serialize_batch(batch, status_counts),
+        drafts=[
+            _serialize_draft(
+                draft,
+                resolved_quantity=(
+                    stock_by_item.get(draft.created_item_id, int(draft.quantity or 1))
+                    if draft.status == IntakeDraftStatus.committed.value and draft.created_item_id
+                    else int(draft.quantity or 1)
+                ),
+            )
+            for draft in drafts
+        ],
+    )
 
-    for batch_id, status_value, total in rows:
-        counts_by_batch[str(batch_id)][str(status_value)] = int(total)
 
-    return counts_by_batch
+def _load_batch_summary(warehouse_id: str, batch_id: str) -> IntakeBatchResponse | None:
+    with SessionLocal() as db:
+        batch = db.scalar(
+            select(IntakeBatch).where(IntakeBatch.id == batch_id, IntakeBatch.warehouse_id == warehouse_id)
+        )
+        if batch is None:
+            return None
+        return _serialize_batch(batch, batch_status_counts(batch))
 
 
-def _store_batch_photo(request: Request, *, warehouse_id: str, batch_id: str, file: UploadFile) -> str:
+def _load_draft_event(warehouse_id: str, batch_id: str, draft_id: str) -> IntakeDraftEventResponse | None:
+    with SessionLocal() as db:
+        batch = db.scalar(
+            select(IntakeBatch).where(IntakeBatch.id == batch_id, IntakeBatch.warehouse_id == warehouse_id)
+        )
+        draft = db.scalar(
+            select(IntakeDraft).where(
+                IntakeDraft.id == draft_id,
+                IntakeDraft.batch_id == batch_id,
+                IntakeDraft.warehouse_id == warehouse_id,
+            )
+        )
+        if batch is None or draft is None:
+            return None
+        return IntakeDraftEventResponse(
+            batch=_serialize_batch(batch, batch_status_counts(batch)),
+            draft=_serialize_draft(draft),
+        )
+
+
+def _batch_marker(batch: IntakeBatchResponse) -> tuple[object, ...]:
+    return (batch.status, batch.total_count, batch.processed_count, batch.committed_count, batch.updated_at)
+
+
+def _format_sse_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def _store_batch_photo(*, warehouse_id: str, batch_id: str, file: UploadFile) -> str:
     content_type = (file.content_type or "").lower()
     ext = _ALLOWED_CONTENT_TYPES.get(content_type)
     if not ext:
@@ -218,7 +279,7 @@ def _store_batch_photo(request: Request, *, warehouse_id: str, batch_id: str, fi
         filename,
         len(payload),
     )
-    return f"{str(request.base_url).rstrip('/')}{relative_url}"
+    return relative_url
 
 
 def _resolve_media_file_from_url(photo_url: str, *, warehouse_id: str) -> Path:
@@ -242,20 +303,47 @@ def _resolve_media_file_from_url(photo_url: str, *, warehouse_id: str) -> Path:
     return file_path
 
 
-def _move_draft_photo_to_items_storage(*, warehouse_id: str, photo_url: str) -> str:
-    src_file = _resolve_media_file_from_url(photo_url, warehouse_id=warehouse_id)
+def _move_draft_photos_to_items_storage(
+    *,
+    warehouse_id: str,
+    drafts: list[IntakeDraft],
+) -> tuple[dict[str, str], list[tuple[Path, Path]], list[IntakeDraft]]:
     items_root = Path(settings.media_root) / warehouse_id / "items"
     items_root.mkdir(parents=True, exist_ok=True)
 
-    suffix = src_file.suffix.lower()
-    filename = f"{uuid.uuid4()}{suffix}" if suffix else str(uuid.uuid4())
-    target = items_root / filename
-    shutil.move(str(src_file), str(target))
+    moved_urls: dict[str, str] = {}
+    moves: list[tuple[Path, Path]] = []
+    failed: list[IntakeDraft] = []
+    for draft in drafts:
+        try:
+            src_file = _resolve_media_file_from_url(draft.photo_url, warehouse_id=warehouse_id)
+            suffix = src_file.suffix.lower()
+            filename = f"{uuid.uuid4()}{suffix}" if suffix else str(uuid.uuid4())
+            target = items_root / filename
+            shutil.move(str(src_file), str(target))
+        except (HTTPException, OSError):
+            failed.append(draft)
+            continue
 
-    parsed = urlsplit(photo_url)
-    new_relative = f"{settings.media_url_path.rstrip('/')}/{warehouse_id}/items/{filename}"
-    logger.debug("Moved intake photo to item storage warehouse_id=%s filename=%s", warehouse_id, filename)
-    return urlunsplit((parsed.scheme, parsed.netloc, new_relative, "", ""))
+        moves.append((src_file, target))
+        moved_urls[draft.id] = f"{settings.media_url_path.rstrip('/')}/{warehouse_id}/items/{filename}"
+
+    logger.debug(
+        "Moved intake photos to item storage warehouse_id=%s moved=%s failed=%s",
+        warehouse_id,
+        len(moves),
+        len(failed),
+    )
+    return moved_urls, moves, failed
+
+
+def _restore_moved_photos(moves: list[tuple[Path, Path]]) -> None:
+    for src_file, target in reversed(moves):
+        try:
+            src_file.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(target), str(src_file))
+        except OSError:
+            logger.warning("Could not restore intake photo after failed commit target=%s", target)
 
 
 def _cleanup_batch_media_dir(*, warehouse_id: str, batch_id: str) -> None:
@@ -320,6 +408,15 @@ def _normalize_optional_text(raw: object, *, max_len: int) -> str | None:
     return normalized[:max_len]
 
 
+def _batches_list_query(warehouse_id: str, *, user_id: str | None, include_committed: bool, limit: int) -> Select:
+    query = select(IntakeBatch).where(IntakeBatch.warehouse_id == warehouse_id)
+    if user_id is not None:
+        query = query.where(IntakeBatch.created_by == user_id)
+    if not include_committed:
+        query = query.where(IntakeBatch.status != IntakeBatchStatus.committed.value)
+    return query.order_by(IntakeBatch.updated_at.desc()).limit(limit)
+
+
 @router.get("/batches", response_model=list[IntakeBatchResponse])
 def list_batches(
     warehouse_id: str,
@@ -338,18 +435,14 @@ def list_batches(
         only_mine,
         limit,
     )
-    query = select(IntakeBatch).where(IntakeBatch.warehouse_id == warehouse_id)
-
-    if only_mine:
-        query = query.where(IntakeBatch.created_by == current_user.id)
-    if not include_committed:
-        query = query.where(IntakeBatch.status != IntakeBatchStatus.committed.value)
-
-    batches = db.scalars(query.order_by(IntakeBatch.updated_at.desc()).limit(limit)).all()
-    batch_ids = [batch.id for batch in batches]
-    counts_by_batch = _resolve_status_counts_for_batches(db, batch_ids)
-
-    response = [_serialize_batch(batch, counts_by_batch.get(batch.id, {})) for batch in batches]
+    query = _batches_list_query(
+        warehouse_id,
+        user_id=current_user.id if only_mine else None,
+        include_committed=include_committed,
+        limit=limit,
+    )
+    batches = db.scalars(query).all()
+    response = [_serialize_batch(batch, batch_status_counts(batch)) for batch in batches]
     logger.debug(
         "List intake batches completed warehouse_id=%s user_id=%s count=%s",
         warehouse_id,
@@ -384,10 +477,9 @@ def create_batch(
         status=IntakeBatchStatus.drafting.value,
     )
     db.add(batch)
-    db.flush()
-    status_counts = refresh_batch_rollup(db, batch)
     db.commit()
     db.refresh(batch)
+    status_counts = batch_status_counts(batch)
     logger.info(
         "Intake batch created warehouse_id=%s batch_id=%s target_box_id=%s created_by=%s",
         warehouse_id,
@@ -409,42 +501,81 @@ def get_batch(
     _membership=Depends(require_warehouse_membership),
     db: Session = Depends(get_db),
 ) -> IntakeBatchDetailResponse:
-    batch = _get_batch(db, warehouse_id, batch_id)
-    drafts = db.scalars(
-        select(IntakeDraft)
-        .where(IntakeDraft.batch_id == batch_id, IntakeDraft.warehouse_id == warehouse_id)
-        .order_by(IntakeDraft.position.asc(), IntakeDraft.created_at.asc())
-    ).all()
-    stock_by_item = _stock_map(
-        db,
-        [draft.created_item_id for draft in drafts if draft.status == IntakeDraftStatus.committed.value and draft.created_item_id],
-    )
-    status_counts = resolve_batch_status_counts(db, batch.id)
+    detail = _build_batch_detail(db, warehouse_id, batch_id)
     logger.debug(
         "Get intake batch requested warehouse_id=%s batch_id=%s drafts=%s",
         warehouse_id,
         batch_id,
-        len(drafts),
+        len(detail.drafts),
     )
-    return IntakeBatchDetailResponse(
-        batch=_serialize_batch(batch, status_counts),
-        drafts=[
-            _serialize_draft(
-                draft,
-                resolved_quantity=(
-                    stock_by_item.get(draft.created_item_id, int(draft.quantity or 1))
-                    if draft.status == IntakeDraftStatus.committed.value and draft.created_item_id
-                    else int(draft.quantity or 1)
-                ),
-            )
-            for draft in drafts
-        ],
+    return detail
+
+
+@router.get("/batches/{batch_id}/events")
+async def stream_batch_events(
+    request: Request,
+    warehouse_id: str,
+    batch_id: str,
+    _membership=Depends(require_warehouse_membership),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    subscription = subscribe_batch_events(warehouse_id, batch_id)
+    try:
+        snapshot = await run_in_threadpool(_build_batch_detail, db, warehouse_id, batch_id)
+    except Exception:
+        unsubscribe_batch_events(subscription)
+        raise
+    finally:
+        # The stream may stay open for minutes; do not keep the request session checked out meanwhile.
+        await run_in_threadpool(db.close)
+    logger.debug(
+        "Intake batch event stream opened warehouse_id=%s batch_id=%s drafts=%s",
+        warehouse_id,
+        batch_id,
+        len(snapshot.drafts),
+    )
+
+    async def event_stream():
+        last_marker = _batch_marker(snapshot.batch)
+        deadline = time.monotonic() + _SSE_MAX_STREAM_SECONDS
+        try:
+            yield _format_sse_event("snapshot", snapshot.model_dump_json())
+            while time.monotonic() < deadline:
+                if await request.is_disconnected():
+                    break
+                event = await subscription.next_event(timeout_seconds=_SSE_POLL_SECONDS)
+                if event is not None and event.kind == "draft" and event.draft_id:
+                    payload = await run_in_threadpool(_load_draft_event, warehouse_id, batch_id, event.draft_id)
+                    if payload is None:
+                        continue
+                    last_marker = _batch_marker(payload.batch)
+                    yield _format_sse_event("draft", payload.model_dump_json())
+                    continue
+
+                # Explicit batch events and idle polls both re-read the rollup, which also covers
+                # progress made by workers running in another replica.
+                batch_payload = await run_in_threadpool(_load_batch_summary, warehouse_id, batch_id)
+                if batch_payload is None:
+                    yield _format_sse_event("deleted", json.dumps({"batch_id": batch_id}))
+                    break
+                marker = _batch_marker(batch_payload)
+                if marker != last_marker:
+                    last_marker = marker
+                    yield _format_sse_event("batch", json.dumps({"batch": batch_payload.model_dump(mode="json")}))
+                elif event is None:
+                    yield ": keepalive\n\n"
+        finally:
+            unsubscribe_batch_events(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @router.post("/batches/{batch_id}/photos", response_model=IntakeBatchUploadResponse, status_code=status.HTTP_201_CREATED)
 def upload_batch_photos(
-    request: Request,
     warehouse_id: str,
     batch_id: str,
     files: list[UploadFile] = File(...),
@@ -477,7 +608,7 @@ def upload_batch_photos(
 
     created: list[IntakeDraft] = []
     for file in files:
-        photo_url = _store_batch_photo(request, warehouse_id=warehouse_id, batch_id=batch_id, file=file)
+        photo_url = _store_batch_photo(warehouse_id=warehouse_id, batch_id=batch_id, file=file)
         draft = IntakeDraft(
             warehouse_id=warehouse_id,
             batch_id=batch_id,
@@ -491,8 +622,9 @@ def upload_batch_photos(
         created.append(draft)
 
     db.flush()
-    status_counts = refresh_batch_rollup(db, batch)
+    adjust_batch_status_counters(db, batch.id, {IntakeDraftStatus.uploaded.value: len(created)})
     db.commit()
+    status_counts = batch_status_counts(batch)
 
     llm_setting = db.scalar(select(LLMSetting).where(LLMSetting.warehouse_id == warehouse_id))
     if llm_setting is not None and llm_setting.api_key_encrypted:
@@ -550,8 +682,8 @@ def start_batch_processing(
             .order_by(IntakeDraft.position.asc(), IntakeDraft.created_at.asc())
         ).all()
         draft_ids_to_process = [draft.id for draft in error_drafts]
+        set_draft_statuses(db, list(error_drafts), IntakeDraftStatus.uploaded.value)
         for draft in error_drafts:
-            draft.status = IntakeDraftStatus.uploaded.value
             draft.error_message = None
         db.flush()
         max_parallel_workers = 1
@@ -567,8 +699,7 @@ def start_batch_processing(
     pending_count = db.scalar(pending_query)
 
     if payload.retry_errors and not draft_ids_to_process:
-        status_counts = refresh_batch_rollup(db, batch)
-        db.commit()
+        status_counts = batch_status_counts(batch)
         logger.debug(
             "Start intake processing skipped: no drafts in error warehouse_id=%s batch_id=%s",
             warehouse_id,
@@ -580,8 +711,8 @@ def start_batch_processing(
         )
 
     if not pending_count:
-        status_counts = refresh_batch_rollup(db, batch)
         db.commit()
+        status_counts = batch_status_counts(batch)
         logger.debug(
             "Start intake processing skipped: no pending drafts warehouse_id=%s batch_id=%s",
             warehouse_id,
@@ -605,7 +736,7 @@ def start_batch_processing(
         draft_ids=draft_ids_to_process,
     )
 
-    status_counts = resolve_batch_status_counts(db, batch.id)
+    status_counts = batch_status_counts(batch)
     if payload.retry_errors:
         success_message = (
             "Reprocesado secuencial de errores iniciado."
@@ -706,7 +837,7 @@ def update_draft(
     if payload.status is not None:
         if payload.status in {IntakeDraftStatus.processing, IntakeDraftStatus.committed}:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported manual status change")
-        draft.status = payload.status.value
+        set_draft_status(db, draft, payload.status.value)
         if payload.status == IntakeDraftStatus.uploaded:
             draft.error_message = None
             draft.warnings = []
@@ -768,7 +899,7 @@ def reprocess_draft(
             draft.suggested_name = normalized_name
         context_override = None
 
-    draft.status = IntakeDraftStatus.uploaded.value
+    set_draft_status(db, draft, IntakeDraftStatus.uploaded.value)
     draft.error_message = None
     draft.warnings = []
     draft.confidence = 0.0
@@ -789,7 +920,7 @@ def reprocess_draft(
         context_name_overrides={draft.id: context_override},
     )
 
-    status_counts = resolve_batch_status_counts(db, batch.id)
+    status_counts = batch_status_counts(batch)
     message = (
         "Reprocesado del articulo iniciado (contexto por titulo)."
         if payload.mode == IntakeDraftReprocessMode.name
@@ -822,8 +953,8 @@ def delete_draft(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot delete draft while batch is processing")
     draft_photo_url = draft.photo_url
 
+    adjust_batch_status_counters(db, batch.id, {draft.status: -1})
     db.delete(draft)
-    refresh_batch_rollup(db, batch)
     db.commit()
     _cleanup_draft_temp_photo_file(
         warehouse_id=warehouse_id,
@@ -871,91 +1002,128 @@ def commit_batch(
         .order_by(IntakeDraft.position.asc())
     ).all()
 
-    created = 0
     skipped = 0
-    errors = 0
+    committed_drafts: list[IntakeDraft] = []
+    new_drafts: list[IntakeDraft] = []
 
     for draft in candidates:
         if draft.created_item_id:
             skipped += 1
             draft.committed_quantity = max(1, int(draft.quantity or 1))
-            draft.status = IntakeDraftStatus.committed.value
+            committed_drafts.append(draft)
             continue
+        new_drafts.append(draft)
 
-        name = (draft.name or "").strip()[:160] or "Articulo sin identificar"
-        initial_quantity = max(1, int(draft.quantity or 1))
-        try:
-            item_photo_url = _move_draft_photo_to_items_storage(warehouse_id=warehouse_id, photo_url=draft.photo_url)
-        except HTTPException:
-            draft.status = IntakeDraftStatus.error.value
-            draft.error_message = "No se pudo mover la imagen temporal al storage definitivo."
-            errors += 1
+    moved_urls, moves, failed_drafts = _move_draft_photos_to_items_storage(
+        warehouse_id=warehouse_id,
+        drafts=new_drafts,
+    )
+    for draft in failed_drafts:
+        draft.error_message = "No se pudo mover la imagen temporal al storage definitivo."
+
+    item_rows: list[dict] = []
+    stock_rows: list[dict] = []
+    change_log_rows: list[dict] = []
+    for draft in new_drafts:
+        item_photo_url = moved_urls.get(draft.id)
+        if item_photo_url is None:
             continue
 
-        item = Item(
-            warehouse_id=warehouse_id,
-            box_id=batch.target_box_id,
-            name=name,
-            description=(draft.description or None),
-            photo_url=item_photo_url,
-            physical_location=None,
-            tags=draft.tags or [],
-            aliases=draft.aliases or [],
+        item_id = str(uuid.uuid4())
+        name = (draft.name or "").strip()[:160] or "Articulo sin identificar"
+        initial_quantity = max(1, int(draft.quantity or 1))
+        command_id = initial_stock_command_id(item_id)
+        item_rows.append(
+            {
+                "id": item_id,
+                "warehouse_id": warehouse_id,
+                "box_id": batch.target_box_id,
+                "name": name,
+                "description": draft.description or None,
+                "photo_url": item_photo_url,
+                "physical_location": None,
+                "tags": draft.tags or [],
+                "aliases": draft.aliases or [],
+                "version": 1,
+            }
         )
-        db.add(item)
-        db.flush()
-
-        append_change_log(
-            db,
-            warehouse_id=warehouse_id,
-            entity_type="item",
-            entity_id=item.id,
-            action="create",
-            entity_version=item.version,
-            payload={"name": item.name, "box_id": item.box_id},
+        stock_rows.append(
+            {
+                "warehouse_id": warehouse_id,
+                "item_id": item_id,
+                "delta": initial_quantity,
+                "command_id": command_id,
+                "note": "Initial stock on item creation",
+            }
         )
-        initial_stock_command_id, created_initial_stock = ensure_initial_stock_movement(
-            db,
-            warehouse_id=warehouse_id,
-            item_id=item.id,
-            initial_delta=initial_quantity,
+        change_log_rows.append(
+            {
+                "warehouse_id": warehouse_id,
+                "entity_type": "item",
+                "entity_id": item_id,
+                "action": "create",
+                "entity_version": 1,
+                "payload_json": {"name": name, "box_id": batch.target_box_id},
+            }
+        )
+        change_log_rows.append(
+            {
+                "warehouse_id": warehouse_id,
+                "entity_type": "stock",
+                "entity_id": item_id,
+                "action": "adjust",
+                "entity_version": None,
+                "payload_json": {"delta": initial_quantity, "command_id": command_id},
+            }
         )
-        if created_initial_stock:
-            append_change_log(
-                db,
-                warehouse_id=warehouse_id,
-                entity_type="stock",
-                entity_id=item.id,
-                action="adjust",
-                payload={"delta": initial_quantity, "command_id": initial_stock_command_id},
-            )
 
-        draft.created_item_id = item.id
+        draft.created_item_id = item_id
         draft.photo_url = item_photo_url
         draft.quantity = initial_quantity
         draft.committed_quantity = initial_quantity
-        draft.status = IntakeDraftStatus.committed.value
         draft.error_message = None
-        created += 1
+        committed_drafts.append(draft)
 
-    status_counts = refresh_batch_rollup(db, batch)
+    created = len(item_rows)
+    errors = len(failed_drafts)
 
-    if created > 0:
-        record_activity(
-            db,
-            warehouse_id=warehouse_id,
-            actor_user_id=current_user.id,
-            event_type="intake.batch.committed",
-            entity_type="intake_batch",
-            entity_id=batch.id,
-            metadata={
-                "created": created,
-                "target_box_id": batch.target_box_id,
-            },
+    try:
+        if item_rows:
+            db.execute(insert(Item), item_rows)
+            db.execute(insert(StockMovement), stock_rows)
+            db.execute(insert(ChangeLog), change_log_rows)
+
+        set_draft_statuses(db, committed_drafts, IntakeDraftStatus.committed.value)
+        set_draft_statuses(db, failed_drafts, IntakeDraftStatus.error.value)
+
+        if created > 0:
+            record_activity(
+                db,
+                warehouse_id=warehouse_id,
+                actor_user_id=current_user.id,
+                event_type="intake.batch.committed",
+                entity_type="intake_batch",
+                entity_id=batch.id,
+                metadata={
+                    "created": created,
+                    "target_box_id": batch.target_box_id,
+                },
+            )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        _restore_moved_photos(moves)
+        logger.exception(
+            "Commit intake batch failed warehouse_id=%s batch_id=%s restored_photos=%s",
+            warehouse_id,
+            batch_id,
+            len(moves),
         )
+        raise
 
-    db.commit()
     db.refresh(batch)
+    status_counts = batch_status_counts(batch)
     if batch.status == IntakeBatchStatus.committed.value:
         _cleanup_batch_media_dir(warehouse_id=warehouse_id, batch_id=batch.id)
 
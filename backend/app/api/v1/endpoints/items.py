@@ -1,13 +1,17 @@
 from datetime import UTC, datetime
 import logging
+from typing import NamedTuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, func, select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic_core import to_json
+from sqlalchemy import Select, delete, func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_warehouse_membership
+from app.api.deps import get_current_user, require_warehouse_membership, warehouse_version
 from app.core.llm import normalize_model_priority
+from app.core.media import sign_media_url, to_media_path
+from app.db.async_session import HotPathSession, get_hot_path_db
 from app.db.session import get_db
 from app.models.box import Box
 from app.models.item import Item
@@ -28,7 +32,14 @@ from app.schemas.item import (
     StockAdjustRequest,
 )
 from app.services.activity import record_activity
+from app.services.conditional_get import WarehouseVersion
 from app.services.llm_enrichment import generate_item_draft_from_photo, generate_tags_and_aliases
+from app.services.read_models import BoxNode, ItemRow, fetch_rows, load_box_nodes, select_columns
+from app.services.response_cache import (
+    cached_json_response,
+    get_cached_body_async,
+    store_body_async,
+)
 from app.services.secret_store import decrypt_secret
 from app.services.stock import ensure_initial_stock_movement
 from app.services.sync_log import append_change_log
@@ -87,12 +98,11 @@ def _favorite_set(db: Session, user_id: str, item_ids: list[str]) -> set[str]:
     return set(rows)
 
 
-def _active_boxes_map(db: Session, warehouse_id: str) -> dict[str, Box]:
-    boxes = db.scalars(select(Box).where(Box.warehouse_id == warehouse_id, Box.deleted_at.is_(None))).all()
-    return {box.id: box for box in boxes}
+def _active_boxes_map(db: Session, warehouse_id: str) -> dict[str, BoxNode]:
+    return load_box_nodes(db, warehouse_id)
 
 
-def _box_path_from_map(boxes_by_id: dict[str, Box], box_id: str) -> list[str]:
+def _box_path_from_map(boxes_by_id: dict[str, BoxNode], box_id: str) -> list[str]:
     path: list[str] = []
     cursor = box_id
     safe_guard = 0
@@ -107,7 +117,7 @@ def _box_path_from_map(boxes_by_id: dict[str, Box], box_id: str) -> list[str]:
     return path
 
 
-def _search_relevance_score(item: Item, normalized_q: str, path_text: str) -> int:
+def _search_relevance_score(item: Item | ItemRow, normalized_q: str, path_text: str) -> int:
     name = item.name.lower()
     aliases = [alias.lower() for alias in (item.aliases or [])]
     tags = [tag.lower() for tag in (item.tags or [])]
@@ -129,31 +139,42 @@ def _search_relevance_score(item: Item, normalized_q: str, path_text: str) -> in
     return 0
 
 
+def _item_row(
+    boxes_by_id: dict[str, BoxNode],
+    item: Item | ItemRow,
+    stock: int,
+    favorite: bool,
+) -> dict:
+    # Keys mirror ItemResponse; list endpoints encode these dicts directly without building models.
+    box = boxes_by_id.get(item.box_id)
+    return {
+        "id": item.id,
+        "warehouse_id": item.warehouse_id,
+        "box_id": item.box_id,
+        "name": item.name,
+        "description": item.description,
+        "photo_url": sign_media_url(item.photo_url),
+        "physical_location": item.physical_location,
+        "tags": item.tags or [],
+        "aliases": item.aliases or [],
+        "version": item.version,
+        "created_at": item.created_at,
+        "updated_at": item.updated_at,
+        "deleted_at": item.deleted_at,
+        "stock": stock,
+        "is_favorite": favorite,
+        "box_path": _box_path_from_map(boxes_by_id, item.box_id),
+        "box_is_inbound": bool(box.is_inbound) if box else False,
+    }
+
+
 def _serialize_item(
-    boxes_by_id: dict[str, Box],
+    boxes_by_id: dict[str, BoxNode],
     item: Item,
     stock: int,
     favorite: bool,
 ) -> ItemResponse:
-    return ItemResponse(
-        id=item.id,
-        warehouse_id=item.warehouse_id,
-        box_id=item.box_id,
-        name=item.name,
-        description=item.description,
-        photo_url=item.photo_url,
-        physical_location=item.physical_location,
-        tags=item.tags or [],
-        aliases=item.aliases or [],
-        version=item.version,
-        created_at=item.created_at,
-        updated_at=item.updated_at,
-        deleted_at=item.deleted_at,
-        stock=stock,
-        is_favorite=favorite,
-        box_path=_box_path_from_map(boxes_by_id, item.box_id),
-        box_is_inbound=bool(boxes_by_id.get(item.box_id).is_inbound) if boxes_by_id.get(item.box_id) else False,
-    )
+    return ItemResponse(**_item_row(boxes_by_id, item, stock=stock, favorite=favorite))
 
 
 def _apply_llm_autogen_if_enabled(db: Session, warehouse_id: str, item: Item, *, changed_text: bool) -> None:
@@ -175,7 +196,7 @@ def _apply_llm_autogen_if_enabled(db: Session, warehouse_id: str, item: Item, *,
 
     try:
         api_key = decrypt_secret(llm_setting.api_key_encrypted)
-    except Exception:  # noqa: BLE001
+    except Exception:
         logger.error(
             "LLM autogen skipped warehouse_id=%s item_id=%s reason=api_key_decrypt_failed",
             warehouse_id,
@@ -210,7 +231,7 @@ def _apply_llm_autogen_if_enabled(db: Session, warehouse_id: str, item: Item, *,
 
 
 @router.get("", response_model=list[ItemResponse])
-def list_items(
+async def list_items(
     warehouse_id: str,
     q: str | None = None,
     tag: str | None = None,
@@ -219,14 +240,86 @@ def list_items(
     with_photo: bool | None = None,
     include_deleted: bool = False,
     _membership=Depends(require_warehouse_membership),
+    version: WarehouseVersion = Depends(warehouse_version(per_user=True, signed_media=True)),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> list[ItemResponse]:
+    db: HotPathSession = Depends(get_hot_path_db),
+) -> Response:
+    filters = {
+        "warehouse_id": warehouse_id,
+        "user_id": current_user.id,
+        "q": q,
+        "tag": tag,
+        "favorites_only": favorites_only,
+        "stock_zero": stock_zero,
+        "with_photo": with_photo,
+        "include_deleted": include_deleted,
+    }
+    # Free-text searches are too varied to be worth caching.
+    cacheable = not (q and q.strip())
+    body = await get_cached_body_async("items", version) if cacheable else None
+    if body is None:
+        body = await db.run_and_render(_load_items, _render_items_json, **filters)
+        if cacheable:
+            await store_body_async("items", version, body)
+    return cached_json_response(body, version)
+
+
+class _LoadedItems(NamedTuple):
+    items: list[ItemRow]
+    boxes_by_id: dict[str, BoxNode]
+    stocks: dict[str, int]
+    favorites: set[str]
+    favorites_only: bool
+    stock_zero: bool
+
+
+def _render_items_json(loaded: _LoadedItems) -> bytes:
+    serialized = [
+        _item_row(
+            loaded.boxes_by_id,
+            item,
+            stock=loaded.stocks.get(item.id, 0),
+            favorite=item.id in loaded.favorites,
+        )
+        for item in loaded.items
+    ]
+    if loaded.favorites_only:
+        serialized = [row for row in serialized if row["is_favorite"]]
+    if loaded.stock_zero:
+        serialized = [row for row in serialized if row["stock"] == 0]
+    logger.debug("List items rendered returned=%s", len(serialized))
+    return to_json(serialized)
+
+
+def _items_list_query(*, warehouse_id: str, include_deleted: bool, with_photo: bool | None) -> Select:
+    # Newest first straight from ix_items_warehouse_active_created; searches re-rank in Python.
+    query = select_columns(Item, ItemRow).where(Item.warehouse_id == warehouse_id)
+    if not include_deleted:
+        query = query.where(Item.deleted_at.is_(None))
+    if with_photo is True:
+        query = query.where(Item.photo_url.is_not(None))
+    if with_photo is False:
+        query = query.where(Item.photo_url.is_(None))
+    return query.order_by(Item.created_at.desc())
+
+
+def _load_items(
+    db: Session,
+    *,
+    warehouse_id: str,
+    user_id: str,
+    q: str | None,
+    tag: str | None,
+    favorites_only: bool,
+    stock_zero: bool,
+    with_photo: bool | None,
+    include_deleted: bool,
+) -> _LoadedItems:
     logger.debug(
         "List items requested warehouse_id=%s user_id=%s q=%s tag=%s favorites_only=%s "
         "stock_zero=%s with_photo=%s include_deleted=%s",
         warehouse_id,
-        current_user.id,
+        user_id,
         q,
         tag,
         favorites_only,
@@ -234,18 +327,12 @@ def list_items(
         with_photo,
         include_deleted,
     )
-    query = select(Item).where(Item.warehouse_id == warehouse_id)
-    if not include_deleted:
-        query = query.where(Item.deleted_at.is_(None))
-
-    if with_photo is True:
-        query = query.where(Item.photo_url.is_not(None))
-    if with_photo is False:
-        query = query.where(Item.photo_url.is_(None))
-
-    items = db.scalars(query).all()
+    items = fetch_rows(
+        db,
+        ItemRow,
+        _items_list_query(warehouse_id=warehouse_id, include_deleted=include_deleted, with_photo=with_photo),
+    )
     boxes_by_id = _active_boxes_map(db, warehouse_id)
-    path_cache = {item.id: _box_path_from_map(boxes_by_id, item.box_id) for item in items}
 
     if tag and tag.strip():
         normalized_tag = tag.strip().lower()
@@ -257,43 +344,24 @@ def list_items(
 
     if q and q.strip():
         normalized_q = q.strip().lower()
-        ranked: list[tuple[int, Item]] = []
+        ranked: list[tuple[int, ItemRow]] = []
         for item in items:
-            path_text = " > ".join(path_cache[item.id]).lower()
+            path_text = " > ".join(_box_path_from_map(boxes_by_id, item.box_id)).lower()
             score = _search_relevance_score(item, normalized_q, path_text)
             if score > 0:
                 ranked.append((score, item))
         ranked.sort(key=lambda row: (-row[0], row[1].name.lower(), -row[1].created_at.timestamp()))
         items = [item for _, item in ranked]
-    else:
-        items = sorted(items, key=lambda item: item.created_at, reverse=True)
 
     item_ids = [item.id for item in items]
-    stocks = _stock_map(db, item_ids)
-    favorites = _favorite_set(db, current_user.id, item_ids)
-
-    serialized = [
-        _serialize_item(
-            boxes_by_id,
-            item,
-            stock=stocks.get(item.id, 0),
-            favorite=item.id in favorites,
-        )
-        for item in items
-    ]
-
-    if favorites_only:
-        serialized = [item for item in serialized if item.is_favorite]
-    if stock_zero:
-        serialized = [item for item in serialized if item.stock == 0]
-
-    logger.debug(
-        "List items completed warehouse_id=%s user_id=%s returned=%s",
-        warehouse_id,
-        current_user.id,
-        len(serialized),
+    return _LoadedItems(
+        items=items,
+        boxes_by_id=boxes_by_id,
+        stocks=_stock_map(db, item_ids),
+        favorites=_favorite_set(db, user_id, item_ids),
+        favorites_only=favorites_only,
+        stock_zero=stock_zero,
     )
-    return serialized
 
 
 @router.post("", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
@@ -317,7 +385,7 @@ def create_item(
         box_id=payload.box_id,
         name=payload.name.strip(),
         description=payload.description,
-        photo_url=payload.photo_url,
+        photo_url=to_media_path(payload.photo_url, warehouse_id=warehouse_id),
         physical_location=payload.physical_location,
         tags=payload.tags,
         aliases=payload.aliases,
@@ -388,7 +456,7 @@ def draft_item_from_photo(
     else:
         try:
             api_key = decrypt_secret(llm_setting.api_key_encrypted)
-        except Exception:  # noqa: BLE001
+        except Exception:
             pre_warnings.append("No se pudo leer la API key LLM; se usa fallback local.")
 
     output_language = llm_setting.language if llm_setting is not None else "es"
@@ -478,7 +546,7 @@ def update_item(
         changed = True
         changed_text = True
     if payload.photo_url is not None:
-        item.photo_url = payload.photo_url
+        item.photo_url = to_media_path(payload.photo_url, warehouse_id=warehouse_id)
         changed = True
     if payload.physical_location is not None:
         item.physical_location = payload.physical_location
@@ -1,10 +1,11 @@
 from pathlib import Path
 import uuid
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 
 from app.api.deps import require_warehouse_membership
 from app.core.config import settings
+from app.core.media import sign_media_url
 from app.schemas.photo import PhotoUploadResponse
 
 router = APIRouter(prefix="/photos", tags=["photos"])
@@ -21,7 +22,6 @@ _MAX_UPLOAD_BYTES = 10 * 1024 * 1024
 
 @router.post("/upload", response_model=PhotoUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_photo(
-    request: Request,
     warehouse_id: str,
     file: UploadFile = File(...),
     _membership=Depends(require_warehouse_membership),
@@ -44,9 +44,8 @@ async def upload_photo(
     target.write_bytes(payload)
 
     relative_url = f"{settings.media_url_path.rstrip('/')}/{warehouse_id}/{filename}"
-    photo_url = f"{str(request.base_url).rstrip('/')}{relative_url}"
     return PhotoUploadResponse(
-        photo_url=photo_url,
+        photo_url=sign_media_url(relative_url),
         content_type=content_type,
         size_bytes=len(payload),
     )
@@ -21,6 +21,7 @@ from app.schemas.setting import (
     SMTPTestRequest,
 )
 from app.services.activity import record_activity
+from app.services.auth_cache import get_cached_membership, remember_membership
 from app.services.llm_enrichment import generate_tags_and_aliases
 from app.services.secret_store import decrypt_secret, encrypt_secret, mask_secret
 
@@ -28,6 +29,8 @@ router = APIRouter(prefix="/settings", tags=["settings"])
 
 
 def _ensure_membership(db: Session, warehouse_id: str, user_id: str) -> None:
+    if get_cached_membership(db, user_id=user_id, warehouse_id=warehouse_id) is not None:
+        return
     membership = db.scalar(
         select(Membership).where(
             Membership.warehouse_id == warehouse_id,
@@ -36,6 +39,7 @@ def _ensure_membership(db: Session, warehouse_id: str, user_id: str) -> None:
     )
     if membership is None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to warehouse")
+    remember_membership(db, membership)
 
 
 @router.get("/smtp", response_model=SMTPSettingsResponse)
@@ -53,7 +57,7 @@ def get_smtp_settings(
     if setting.password_encrypted:
         try:
             password_masked = mask_secret(decrypt_secret(setting.password_encrypted))
-        except Exception:  # noqa: BLE001
+        except Exception:
             password_masked = "***"
 
     return SMTPSettingsResponse(
@@ -157,7 +161,7 @@ def get_llm_settings(
     if setting.api_key_encrypted:
         try:
             api_key_value = decrypt_secret(setting.api_key_encrypted)
-        except Exception:  # noqa: BLE001
+        except Exception:
             api_key_value = None
 
     return LLMSettingsResponse(
@@ -247,7 +251,7 @@ def reprocess_llm_item(
 
     try:
         api_key = decrypt_secret(llm_setting.api_key_encrypted)
-    except Exception as exc:  # noqa: BLE001
+    except Exception as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid LLM API key") from exc
 
     tags, aliases = generate_tags_and_aliases(
@@ -3,11 +3,15 @@ import logging
 import secrets
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic_core import to_json
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_warehouse_membership
+from app.core.json_response import FastJSONResponse
+from app.core.media import to_media_path
+from app.db.async_session import HotPathSession, get_hot_path_db
 from app.db.session import get_db
 from app.models.box import Box
 from app.models.change_log import ChangeLog
@@ -18,7 +22,6 @@ from app.models.stock_movement import StockMovement
 from app.models.sync_conflict import SyncConflict
 from app.models.user import User
 from app.schemas.sync import (
-    SyncChangeEntry,
     SyncConflictResolution,
     SyncConflictResponse,
     SyncPullResponse,
@@ -29,7 +32,7 @@ from app.schemas.sync import (
 )
 from app.services.box_codes import coerce_unique_short_code
 from app.services.stock import ensure_initial_stock_movement
-from app.services.sync_log import append_change_log
+from app.services.sync_log import append_change_log, latest_change_seq
 
 router = APIRouter(prefix="/sync", tags=["sync"])
 logger = logging.getLogger(__name__)
@@ -311,7 +314,7 @@ def _apply_sync_command(
                 box_id=box_id,
                 name=(payload.get("name") or "Item Sync").strip(),
                 description=payload.get("description"),
-                photo_url=payload.get("photo_url"),
+                photo_url=to_media_path(payload.get("photo_url"), warehouse_id=warehouse_id),
                 physical_location=payload.get("physical_location"),
                 tags=payload.get("tags") or [],
                 aliases=payload.get("aliases") or [],
@@ -374,7 +377,7 @@ def _apply_sync_command(
             if "description" in payload:
                 item.description = payload["description"]
             if "photo_url" in payload:
-                item.photo_url = payload["photo_url"]
+                item.photo_url = to_media_path(payload["photo_url"], warehouse_id=warehouse_id)
             if "physical_location" in payload:
                 item.physical_location = payload["physical_location"]
             if "tags" in payload and payload["tags"] is not None:
@@ -476,11 +479,15 @@ def _apply_sync_command(
 
 
 @router.post("/push", response_model=SyncPushResponse)
-def push_commands(
+async def push_commands(
     payload: SyncPushRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: HotPathSession = Depends(get_hot_path_db),
 ) -> SyncPushResponse:
+    return await db.run(_push_commands, payload=payload, current_user=current_user)
+
+
+def _push_commands(db: Session, *, payload: SyncPushRequest, current_user: User) -> SyncPushResponse:
     logger.info(
         "Sync push requested warehouse_id=%s user_id=%s device_id=%s commands=%s",
         payload.warehouse_id,
@@ -542,10 +549,7 @@ def push_commands(
         applied_command_ids.append(command.command_id)
 
     db.commit()
-    last_seq = (
-        db.scalar(select(func.coalesce(func.max(ChangeLog.seq), 0)).where(ChangeLog.warehouse_id == payload.warehouse_id))
-        or 0
-    )
+    last_seq = latest_change_seq(db, payload.warehouse_id)
     logger.info(
         "Sync push completed warehouse_id=%s applied=%s skipped=%s conflicts=%s last_seq=%s",
         payload.warehouse_id,
@@ -563,27 +567,50 @@ def push_commands(
 
 
 @router.get("/pull", response_model=SyncPullResponse)
-def pull_changes(
+async def pull_changes(
     warehouse_id: str,
     since_seq: int = 0,
     _membership=Depends(require_warehouse_membership),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> SyncPullResponse:
+    db: HotPathSession = Depends(get_hot_path_db),
+) -> Response:
+    body = await db.run_and_render(
+        _pull_changes,
+        _render_pull_json,
+        warehouse_id=warehouse_id,
+        since_seq=since_seq,
+        user_id=current_user.id,
+    )
+    return FastJSONResponse(body)
+
+
+def _changes_since_query(warehouse_id: str, since_seq: int) -> Select:
+    return (
+        select(
+            ChangeLog.seq,
+            ChangeLog.warehouse_id,
+            ChangeLog.entity_type,
+            ChangeLog.entity_id,
+            ChangeLog.action,
+            ChangeLog.entity_version,
+            ChangeLog.payload_json.label("payload"),
+            ChangeLog.created_at,
+        )
+        .where(ChangeLog.warehouse_id == warehouse_id, ChangeLog.seq > since_seq)
+        .order_by(ChangeLog.seq.asc())
+        .limit(500)
+    )
+
+
+def _pull_changes(db: Session, *, warehouse_id: str, since_seq: int, user_id: str) -> dict:
     logger.debug(
         "Sync pull requested warehouse_id=%s user_id=%s since_seq=%s",
         warehouse_id,
-        current_user.id,
+        user_id,
         since_seq,
     )
-    require_warehouse_membership(warehouse_id, current_user=current_user, db=db)
 
-    change_rows = db.scalars(
-        select(ChangeLog)
-        .where(ChangeLog.warehouse_id == warehouse_id, ChangeLog.seq > since_seq)
-        .order_by(ChangeLog.seq.asc())
-        .limit(500)
-    ).all()
+    changes = db.execute(_changes_since_query(warehouse_id, since_seq)).mappings().all()
 
     conflict_rows = db.scalars(
         select(SyncConflict)
@@ -591,39 +618,28 @@ def pull_changes(
         .order_by(SyncConflict.created_at.asc())
     ).all()
 
-    last_seq = (
-        db.scalar(select(func.coalesce(func.max(ChangeLog.seq), 0)).where(ChangeLog.warehouse_id == warehouse_id))
-        or 0
-    )
-
-    changes = [
-        SyncChangeEntry(
-            seq=row.seq,
-            warehouse_id=row.warehouse_id,
-            entity_type=row.entity_type,
-            entity_id=row.entity_id,
-            action=row.action,
-            entity_version=row.entity_version,
-            payload=row.payload_json or {},
-            created_at=row.created_at,
-        )
-        for row in change_rows
-    ]
-
-    response = SyncPullResponse(
-        changes=changes,
-        conflicts=[_serialize_conflict(row) for row in conflict_rows],
-        last_seq=int(last_seq),
-    )
+    last_seq = latest_change_seq(db, warehouse_id)
     logger.info(
         "Sync pull completed warehouse_id=%s user_id=%s changes=%s conflicts=%s last_seq=%s",
         warehouse_id,
-        current_user.id,
-        len(response.changes),
-        len(response.conflicts),
-        response.last_seq,
+        user_id,
+        len(changes),
+        len(conflict_rows),
+        last_seq,
     )
-    return response
+    return {
+        "changes": changes,
+        "conflicts": [_serialize_conflict(row) for row in conflict_rows],
+        "last_seq": last_seq,
+    }
+
+
+def _render_pull_json(pulled: dict) -> bytes:
+    # Keys mirror SyncChangeEntry; rows are encoded directly without building one model per change.
+    changes = [dict(row) for row in pulled["changes"]]
+    for change in changes:
+        change["payload"] = change["payload"] or {}
+    return to_json({**pulled, "changes": changes})
 
 
 @router.post("/resolve", response_model=SyncResolveResponse)
@@ -705,7 +721,7 @@ def resolve_conflict(
         if "description" in source_payload:
             item.description = source_payload["description"]
         if "photo_url" in source_payload:
-            item.photo_url = source_payload["photo_url"]
+            item.photo_url = to_media_path(source_payload["photo_url"], warehouse_id=payload.warehouse_id)
         if "physical_location" in source_payload:
             item.physical_location = source_payload["physical_location"]
         if "tags" in source_payload and source_payload["tags"] is not None:
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Response
+from pydantic_core import to_json
 from sqlalchemy.orm import Session
 
-from app.api.deps import require_warehouse_membership
+from app.api.deps import require_warehouse_membership, warehouse_version
 from app.db.session import get_db
-from app.models.item import Item
 from app.schemas.tag import TagCloudEntry, TagResponse
+from app.services.conditional_get import WarehouseVersion
+from app.services.read_models import load_active_item_tags
+from app.services.response_cache import render_cached_json
 
 router = APIRouter(prefix="/warehouses/{warehouse_id}/tags", tags=["tags"])
 
@@ -14,13 +16,12 @@ router = APIRouter(prefix="/warehouses/{warehouse_id}/tags", tags=["tags"])
 def list_tags(
     warehouse_id: str,
     _membership=Depends(require_warehouse_membership),
+    _etag=Depends(warehouse_version()),
     db: Session = Depends(get_db),
 ) -> list[TagResponse]:
-    items = db.scalars(
-        select(Item).where(Item.warehouse_id == warehouse_id, Item.deleted_at.is_(None))
-    ).all()
+    item_tags = load_active_item_tags(db, warehouse_id)
 
-    tags = sorted({tag.strip() for item in items for tag in (item.tags or []) if tag and tag.strip()})
+    tags = sorted({tag.strip() for tags in item_tags for tag in tags if tag and tag.strip()})
     return [TagResponse(name=tag) for tag in tags]
 
 
@@ -28,20 +29,22 @@ def list_tags(
 def tag_cloud(
     warehouse_id: str,
     _membership=Depends(require_warehouse_membership),
+    version: WarehouseVersion = Depends(warehouse_version()),
     db: Session = Depends(get_db),
-) -> list[TagCloudEntry]:
-    items = db.scalars(
-        select(Item).where(Item.warehouse_id == warehouse_id, Item.deleted_at.is_(None))
-    ).all()
+) -> Response:
+    return render_cached_json("tag_cloud", version, lambda: to_json(_tag_cloud_entries(db, warehouse_id)))
 
+
+def _tag_cloud_entries(db: Session, warehouse_id: str) -> list[dict]:
     counts: dict[str, int] = {}
-    for item in items:
-        for tag in item.tags or []:
+    for tags in load_active_item_tags(db, warehouse_id):
+        for tag in tags:
             normalized = tag.strip()
             if not normalized:
                 continue
             counts[normalized] = counts.get(normalized, 0) + 1
 
-    entries = [TagCloudEntry(tag=tag, count=count) for tag, count in counts.items()]
-    entries.sort(key=lambda entry: (-entry.count, entry.tag.lower()))
+    # Keys mirror TagCloudEntry.
+    entries = [{"tag": tag, "count": count} for tag, count in counts.items()]
+    entries.sort(key=lambda entry: (-entry["count"], entry["tag"].lower()))
     return entries
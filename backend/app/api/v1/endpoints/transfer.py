@@ -2,11 +2,14 @@ from datetime import UTC, datetime
 import secrets
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_warehouse_membership
+from app.core.json_response import FastJSONResponse
+from app.core.media import to_media_path
 from app.db.session import get_db
 from app.models.box import Box
 from app.models.item import Item
@@ -17,7 +20,6 @@ from app.schemas.transfer import (
     ExportBox,
     ExportItem,
     ExportStockMovement,
-    ExportWarehouse,
     WarehouseExportResponse,
     WarehouseImportRequest,
     WarehouseImportResponse,
@@ -39,65 +41,38 @@ def _get_warehouse(db: Session, warehouse_id: str) -> Warehouse:
     return warehouse
 
 
+def _export_rows(db: Session, model, schema: type[BaseModel], warehouse_id: str) -> list[dict]:
+    # Selects exactly the schema's columns and encodes the rows as dicts, so no ORM entity or model is built.
+    columns = [getattr(model, name) for name in schema.model_fields]
+    rows = db.execute(
+        select(*columns).where(model.warehouse_id == warehouse_id).order_by(model.created_at.asc())
+    ).mappings()
+    return [dict(row) for row in rows]
+
+
 @router.get("/export", response_model=WarehouseExportResponse)
 def export_warehouse(
     warehouse_id: str,
     _membership=Depends(require_warehouse_membership),
     _current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> WarehouseExportResponse:
+) -> Response:
     warehouse = _get_warehouse(db, warehouse_id)
 
-    boxes = db.scalars(select(Box).where(Box.warehouse_id == warehouse_id).order_by(Box.created_at.asc())).all()
-    items = db.scalars(select(Item).where(Item.warehouse_id == warehouse_id).order_by(Item.created_at.asc())).all()
-    stock_movements = db.scalars(
-        select(StockMovement).where(StockMovement.warehouse_id == warehouse_id).order_by(StockMovement.created_at.asc())
-    ).all()
-
-    return WarehouseExportResponse(
-        exported_at=utcnow(),
-        warehouse=ExportWarehouse(id=warehouse.id, name=warehouse.name),
-        boxes=[
-            ExportBox(
-                id=box.id,
-                parent_box_id=box.parent_box_id,
-                name=box.name,
-                description=box.description,
-                physical_location=box.physical_location,
-                short_code=box.short_code,
-                qr_token=box.qr_token,
-                is_inbound=box.is_inbound,
-                version=box.version,
-                deleted_at=box.deleted_at,
-            )
-            for box in boxes
-        ],
-        items=[
-            ExportItem(
-                id=item.id,
-                box_id=item.box_id,
-                name=item.name,
-                description=item.description,
-                photo_url=item.photo_url,
-                physical_location=item.physical_location,
-                tags=item.tags or [],
-                aliases=item.aliases or [],
-                version=item.version,
-                deleted_at=item.deleted_at,
-            )
-            for item in items
-        ],
-        stock_movements=[
-            ExportStockMovement(
-                id=movement.id,
-                item_id=movement.item_id,
-                delta=movement.delta,
-                command_id=movement.command_id,
-                note=movement.note,
-                created_at=movement.created_at,
-            )
-            for movement in stock_movements
-        ],
+    items = _export_rows(db, Item, ExportItem, warehouse_id)
+    for item in items:
+        item["tags"] = item["tags"] or []
+        item["aliases"] = item["aliases"] or []
+
+    return FastJSONResponse(
+        {
+            "schema_version": 1,
+            "exported_at": utcnow(),
+            "warehouse": {"id": warehouse.id, "name": warehouse.name},
+            "boxes": _export_rows(db, Box, ExportBox, warehouse_id),
+            "items": items,
+            "stock_movements": _export_rows(db, StockMovement, ExportStockMovement, warehouse_id),
+        }
     )
 
 
@@ -251,7 +226,7 @@ def import_warehouse(
                     box_id=mapped_box_id,
                     name=item_payload.name,
                     description=item_payload.description,
-                    photo_url=item_payload.photo_url,
+                    photo_url=to_media_path(item_payload.photo_url, warehouse_id=warehouse_id),
                     physical_location=item_payload.physical_location,
                     tags=item_payload.tags,
                     aliases=item_payload.aliases,
@@ -263,7 +238,7 @@ def import_warehouse(
             existing_item.box_id = mapped_box_id
             existing_item.name = item_payload.name
             existing_item.description = item_payload.description
-            existing_item.photo_url = item_payload.photo_url
+            existing_item.photo_url = to_media_path(item_payload.photo_url, warehouse_id=warehouse_id)
             existing_item.physical_location = item_payload.physical_location
             existing_item.tags = item_payload.tags
             existing_item.aliases = item_payload.aliases
@@ -1,14 +1,15 @@
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 import logging
 import secrets
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import Select, and_, or_, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_warehouse_membership
 from app.core.config import settings
 from app.db.session import get_db
+from app.models.activity_daily_rollup import ActivityDailyRollup
 from app.models.activity_event import ActivityEvent
 from app.models.box import Box
 from app.models.membership import Membership
@@ -16,6 +17,7 @@ from app.models.user import User
 from app.models.warehouse import Warehouse
 from app.models.warehouse_invite import WarehouseInvite
 from app.schemas.warehouse import (
+    ActivityDailyRollupResponse,
     ActivityEventResponse,
     InviteAcceptResponse,
     MemberResponse,
@@ -24,7 +26,8 @@ from app.schemas.warehouse import (
     WarehouseInviteResponse,
     WarehouseResponse,
 )
-from app.services.activity import record_activity
+from app.services.activity import decode_activity_cursor, encode_activity_cursor, record_activity
+from app.services.auth_cache import invalidate_membership
 from app.services.box_codes import generate_unique_short_code
 from app.services.security import hash_token
 from app.services.sync_log import append_change_log
@@ -244,6 +247,7 @@ def accept_invite(
         metadata={"invitee_email": current_user.email},
     )
     db.commit()
+    invalidate_membership(user_id=current_user.id, warehouse_id=invite.warehouse_id)
     logger.info(
         "Invite accepted invite_id=%s warehouse_id=%s user_id=%s",
         invite.id,
@@ -253,26 +257,79 @@ def accept_invite(
     return InviteAcceptResponse(message="Invite accepted", warehouse_id=invite.warehouse_id)
 
 
+def _activity_feed_query(
+    warehouse_id: str,
+    *,
+    after: tuple[datetime, str] | None = None,
+    event_type: str | None = None,
+    actor_user_id: str | None = None,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    limit: int,
+) -> Select:
+    query = select(ActivityEvent).where(ActivityEvent.warehouse_id == warehouse_id)
+    if after is not None:
+        after_created_at, after_id = after
+        # Keyset on (created_at, id): pages stay stable while new events are inserted at the head.
+        query = query.where(
+            or_(
+                ActivityEvent.created_at < after_created_at,
+                and_(ActivityEvent.created_at == after_created_at, ActivityEvent.id < after_id),
+            )
+        )
+    if event_type:
+        query = query.where(ActivityEvent.event_type == event_type)
+    if actor_user_id:
+        query = query.where(ActivityEvent.actor_user_id == actor_user_id)
+    if entity_type:
+        query = query.where(ActivityEvent.entity_type == entity_type)
+    if entity_id:
+        query = query.where(ActivityEvent.entity_id == entity_id)
+    return query.order_by(ActivityEvent.created_at.desc(), ActivityEvent.id.desc()).limit(limit)
+
+
 @router.get("/{warehouse_id}/activity", response_model=list[ActivityEventResponse])
 def get_activity(
     warehouse_id: str,
+    response: Response,
     limit: int = 50,
+    cursor: str | None = None,
+    event_type: str | None = None,
+    actor_user_id: str | None = None,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
     _membership: Membership = Depends(require_warehouse_membership),
     db: Session = Depends(get_db),
 ) -> list[ActivityEventResponse]:
     safe_limit = max(1, min(limit, 200))
-    events = db.scalars(
-        select(ActivityEvent)
-        .where(ActivityEvent.warehouse_id == warehouse_id)
-        .order_by(ActivityEvent.created_at.desc())
-        .limit(safe_limit)
-    ).all()
+    after: tuple[datetime, str] | None = None
+    if cursor:
+        try:
+            after = decode_activity_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid activity cursor")
+    query = _activity_feed_query(
+        warehouse_id,
+        after=after,
+        event_type=event_type,
+        actor_user_id=actor_user_id,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        limit=safe_limit + 1,
+    )
+    events = db.scalars(query).all()
+    if len(events) > safe_limit:
+        events = events[:safe_limit]
+        response.headers["X-Next-Cursor"] = encode_activity_cursor(events[-1].created_at, events[-1].id)
     logger.debug(
-        "Warehouse activity listed warehouse_id=%s requested_limit=%s resolved_limit=%s count=%s",
+        "Warehouse activity listed warehouse_id=%s requested_limit=%s resolved_limit=%s count=%s "
+        "cursor=%s has_more=%s",
         warehouse_id,
         limit,
         safe_limit,
         len(events),
+        bool(cursor),
+        "X-Next-Cursor" in response.headers,
     )
     return [
         ActivityEventResponse(
@@ -287,3 +344,39 @@ def get_activity(
         )
         for event in events
     ]
+
+
+@router.get("/{warehouse_id}/activity/daily", response_model=list[ActivityDailyRollupResponse])
+def get_activity_daily(
+    warehouse_id: str,
+    since: date | None = None,
+    until: date | None = None,
+    event_type: str | None = None,
+    limit: int = 366,
+    _membership: Membership = Depends(require_warehouse_membership),
+    db: Session = Depends(get_db),
+) -> list[ActivityDailyRollupResponse]:
+    safe_limit = max(1, min(limit, 2000))
+    query = select(ActivityDailyRollup).where(ActivityDailyRollup.warehouse_id == warehouse_id)
+    if since is not None:
+        query = query.where(ActivityDailyRollup.day >= since)
+    if until is not None:
+        query = query.where(ActivityDailyRollup.day <= until)
+    if event_type:
+        query = query.where(ActivityDailyRollup.event_type == event_type)
+    rollups = db.scalars(
+        query.order_by(
+            ActivityDailyRollup.day.desc(),
+            ActivityDailyRollup.event_type.asc(),
+            ActivityDailyRollup.actor_user_id.asc(),
+        ).limit(safe_limit)
+    ).all()
+    return [
+        ActivityDailyRollupResponse(
+            day=rollup.day,
+            event_type=rollup.event_type,
+            actor_user_id=rollup.actor_user_id,
+            event_count=rollup.event_count,
+        )
+        for rollup in rollups
+    ]
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+from typing import Protocol
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+ENCODING_BROTLI = "br"
+ENCODING_GZIP = "gzip"
+
+COMPRESSED_RESPONSES = counter(
+    "mw_http_compressed_responses_total",
+    "Responses compressed by the API, by content encoding.",
+    ("encoding",),
+)
+COMPRESSION_BYTES_SAVED = counter(
+    "mw_http_compression_bytes_saved_total",
+    "Bytes saved by API response compression, by content encoding.",
+    ("encoding",),
+)
+
+# JPEG/PNG/WebP/HEIC photos and archives are already compressed: recompressing only burns CPU.
+_COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/javascript",
+        "application/json",
+        "application/manifest+json",
+        "application/x-ndjson",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+# SSE progress streams must reach the client event by event.
+_NEVER_COMPRESSED_TYPES = frozenset({"text/event-stream"})
+_UNCOMPRESSED_STATUSES = frozenset({204, 206, 304})
+
+
+class _Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type or media_type in _NEVER_COMPRESSED_TYPES:
+        return False
+    if media_type.startswith("text/") or media_type in _COMPRESSIBLE_TYPES:
+        return True
+    return media_type.endswith(("+json", "+xml"))
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[token] = weight
+
+    best: str | None = None
+    best_weight = 0.0
+    # `available` is in server preference order, so ties keep the earlier (smaller) encoding.
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def available_encodings() -> tuple[str, ...]:
+    if settings.compression_brotli_enabled and importlib.util.find_spec("brotli") is not None:
+        return (ENCODING_BROTLI, ENCODING_GZIP)
+    return (ENCODING_GZIP,)
+
+
+def _weak_etag(etag: str) -> str:
+    # The compressed body is a different byte sequence, so its validator can only be weak. Weak
+    # If-None-Match comparison still matches it against the identity ETag.
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, *, minimum_size: int | None = None) -> None:
+        self.app = app
+        self.minimum_size = settings.compression_min_bytes if minimum_size is None else minimum_size
+        self.encodings = available_encodings()
+        logger.info(
+            "Response compression enabled encodings=%s minimum_size=%s",
+            ",".join(self.encodings),
+            self.minimum_size,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        pending_start: Message | None = None
+        encoder: _Encoder | None = None
+        raw_size = 0
+        compressed_size = 0
+
+        def new_encoder() -> _Encoder:
+            if encoding == ENCODING_BROTLI:
+                return _BrotliEncoder(settings.compression_brotli_quality)
+            return _GzipEncoder(settings.compression_gzip_level)
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal pending_start, encoder, raw_size, compressed_size
+            if message["type"] == "http.response.start":
+                pending_start = message
+                return
+            if pending_start is None:
+                if encoder is not None and message["type"] == "http.response.body":
+                    body = message.get("body", b"")
+                    more_body = message.get("more_body", False)
+                    chunk = encoder.compress(body) + (b"" if more_body else encoder.finish())
+                    raw_size += len(body)
+                    compressed_size += len(chunk)
+                    if not more_body:
+                        COMPRESSION_BYTES_SAVED.inc(max(0, raw_size - compressed_size), encoding=encoding)
+                    message = {"type": "http.response.body", "body": chunk, "more_body": more_body}
+                await send(message)
+                return
+
+            start, pending_start = pending_start, None
+            headers = MutableHeaders(scope=start)
+            if (
+                message["type"] != "http.response.body"
+                or start["status"] in _UNCOMPRESSED_STATUSES
+                or "content-encoding" in headers
+                or "content-range" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            # The representation depends on Accept-Encoding even when this one goes out as-is, so
+            # the service worker and shared caches must key on it.
+            headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoding is None or (not more_body and len(body) < self.minimum_size):
+                await send(start)
+                await send(message)
+                return
+
+            encoder = new_encoder()
+            headers["Content-Encoding"] = encoding
+            etag = headers.get("etag")
+            if etag:
+                headers["ETag"] = _weak_etag(etag)
+            COMPRESSED_RESPONSES.inc(encoding=encoding)
+            raw_size = len(body)
+            if more_body:
+                del headers["Content-Length"]
+                chunk = encoder.compress(body)
+                compressed_size = len(chunk)
+                await send(start)
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                return
+
+            chunk = encoder.compress(body) + encoder.finish()
+            COMPRESSION_BYTES_SAVED.inc(max(0, raw_size - len(chunk)), encoding=encoding)
+            headers["Content-Length"] = str(len(chunk))
+            await send(start)
+            await send({"type": "http.response.body", "body": chunk})
+
+        await self.app(scope, receive, send_compressed)
@@ -7,6 +7,9 @@ class Settings(BaseSettings):
     app_name: str = "my-warehouse-api"
     api_v1_prefix: str = "/api/v1"
     database_url: str = "sqlite:///./my_warehouse.db"
+    database_replica_url: str = ""
+    replica_read_your_writes_seconds: float = 5.0
+    replica_pin_cookie_name: str = "mw_primary_pin"
     jwt_secret: str = "change-me"
     jwt_algorithm: str = "HS256"
     access_token_minutes: int = 30
@@ -20,7 +23,69 @@ class Settings(BaseSettings):
     secret_encryption_key: str = "change-me-secret-key"
     media_root: str = "./media"
     media_url_path: str = "/media"
+    media_cache_max_age_seconds: int = 31536000
+    media_offload: str = ""
+    media_offload_internal_prefix: str = "/_media_internal"
+    media_signed_urls_enabled: bool = True
+    media_url_secret: str = ""
+    media_url_ttl_seconds: int = 86400
+    media_public_base_url: str = ""
     log_level: str = "INFO"
+    debug: bool = False
+    gemini_base_url: str = "https://generativelanguage.googleapis.com"
+    llm_rate_limit_backend: str = "memory"
+    llm_requests_per_minute: int = 60
+    llm_rate_limit_burst: int = 10
+    llm_max_concurrency: int = 8
+    llm_min_concurrency: int = 1
+    llm_max_retries: int = 2
+    llm_retry_base_seconds: float = 1.0
+    llm_retry_max_seconds: float = 30.0
+    llm_rate_limit_max_wait_seconds: float = 120.0
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+    db_worker_statement_timeout_ms: int = 300000
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size_bytes: int = 268435456
+    async_db_enabled: bool = False
+    auth_cache_ttl_seconds: float = 30.0
+    token_revocation_refresh_seconds: float = 10.0
+    token_revocation_overlap_seconds: float = 120.0
+    box_lookup_cache_ttl_seconds: float = 300.0
+    box_lookup_cache_max_entries: int = 4096
+    box_short_code_block_size: int = 256
+    response_cache_enabled: bool = True
+    response_cache_backend: str = "memory"
+    response_cache_redis_url: str = ""
+    response_cache_max_entries: int = 1024
+    response_cache_max_bytes: int = 67108864
+    response_cache_max_entry_bytes: int = 8388608
+    response_cache_shared_ttl_seconds: float = 600.0
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_enabled: bool = True
+    compression_brotli_quality: int = 4
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65536
+    argon2_parallelism: int = 4
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 32
+    metrics_enabled: bool = True
+    metrics_bearer_token: str = ""
+    query_count_warning_threshold: int = 50
+    query_time_warning_ms: float = 1000.0
+    query_repeated_statement_threshold: int = 10
+    maintenance_enabled: bool = True
+    intake_counter_reconcile_interval_seconds: int = 900
+    activity_retention_days: int = 90
+    activity_rollup_interval_seconds: int = 3600
+    activity_rollup_batch_size: int = 2000
+    activity_rollup_max_batches: int = 50
 
 
 settings = Settings()
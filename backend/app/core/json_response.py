@@ -0,0 +1,14 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    # Large list endpoints build plain dicts whose keys mirror their response schema and return this
+    # directly: pydantic-core encodes them in one pass, skipping model construction and FastAPI's
+    # response_model validation. Output bytes match JSONResponse (compact, UTF-8, ISO datetimes).
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
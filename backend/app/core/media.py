@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import logging
+import mimetypes
+import os
+from pathlib import Path
+import time
+from urllib.parse import quote, urlencode, urlsplit
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MEDIA_OFFLOAD_X_ACCEL = "x-accel-redirect"
+MEDIA_OFFLOAD_X_SENDFILE = "x-sendfile"
+
+MEDIA_EXPIRES_PARAM = "exp"
+MEDIA_SIGNATURE_PARAM = "sig"
+
+
+def _media_prefix() -> str:
+    return f"{settings.media_url_path.rstrip('/')}/"
+
+
+def _signing_key() -> bytes:
+    secret = settings.media_url_secret or settings.jwt_secret
+    return hashlib.sha256(f"media-url:{secret}".encode()).digest()
+
+
+def _window_seconds() -> int:
+    return max(60, settings.media_url_ttl_seconds)
+
+
+def _signature(path: str, expires_at: int) -> str:
+    digest = hmac.new(_signing_key(), f"{path}\n{expires_at}".encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:18]).decode()
+
+
+def signing_epoch(now: float | None = None) -> int:
+    return int(time.time() if now is None else now) // _window_seconds()
+
+
+def to_media_path(url: str | None, *, warehouse_id: str) -> str | None:
+    # Stored photo URLs are host-relative paths without query; clients may echo back the signed
+    # (or legacy absolute) URL they were given.
+    if not url:
+        return url
+    path = urlsplit(url).path
+    if path.startswith(f"{_media_prefix()}{warehouse_id}/"):
+        return path
+    return url
+
+
+def sign_media_url(url: str | None, *, now: float | None = None) -> str | None:
+    if not url or not url.startswith(_media_prefix()):
+        return url
+    base_url = settings.media_public_base_url.rstrip("/")
+    if not settings.media_signed_urls_enabled:
+        return f"{base_url}{url}"
+    # Signatures are issued per time window rather than per request so every response in a window
+    # carries the same URL and browser, service worker and CDN caches keep hitting. A URL issued in
+    # window N stays valid until the end of window N + 1.
+    expires_at = (signing_epoch(now) + 2) * _window_seconds()
+    query = urlencode({MEDIA_EXPIRES_PARAM: expires_at, MEDIA_SIGNATURE_PARAM: _signature(url, expires_at)})
+    return f"{base_url}{url}?{query}"
+
+
+def verify_media_signature(
+    path: str,
+    expires: str | None,
+    signature: str | None,
+    *,
+    now: float | None = None,
+) -> bool:
+    if not expires or not signature:
+        return False
+    try:
+        expires_at = int(expires)
+    except ValueError:
+        return False
+    if expires_at <= (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(_signature(path, expires_at), signature)
+
+
+def media_cache_control() -> str:
+    # Photo filenames are random UUIDs written once, so a URL always names the same bytes.
+    return f"public, max-age={settings.media_cache_max_age_seconds}, immutable"
+
+
+class MediaFiles(StaticFiles):
+    # FileResponse already answers Range/If-Range with 206 and StaticFiles answers
+    # If-None-Match/If-Modified-Since with 304; this adds long-lived caching and optional offload.
+    def __init__(self, *, directory: str | os.PathLike[str], offload: str | None = None) -> None:
+        super().__init__(directory=directory)
+        self.root = Path(directory).resolve()
+        self.offload = (settings.media_offload if offload is None else offload).strip().lower()
+        if self.offload not in ("", MEDIA_OFFLOAD_X_ACCEL, MEDIA_OFFLOAD_X_SENDFILE):
+            logger.warning("Unknown MEDIA_OFFLOAD=%s; serving media from Python", self.offload)
+            self.offload = ""
+        logger.info("Media files configured root=%s offload=%s", self.root, self.offload or "none")
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405, headers={"Allow": "GET, HEAD"})
+        if settings.media_signed_urls_enabled:
+            # Pure HMAC check: the signed URL itself is the grant, no membership lookup per photo.
+            query = QueryParams(scope.get("query_string", b""))
+            media_path = f"{_media_prefix()}{Path(path).as_posix()}"
+            if not verify_media_signature(
+                media_path, query.get(MEDIA_EXPIRES_PARAM), query.get(MEDIA_SIGNATURE_PARAM)
+            ):
+                raise HTTPException(status_code=403, detail="Invalid or expired media signature")
+        if not self.offload:
+            return await super().get_response(path, scope)
+        return self._offload_response(path)
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["Cache-Control"] = media_cache_control()
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _offload_response(self, path: str) -> Response:
+        # The proxy does the stat, range and conditional handling, so the NFS volume is never
+        # touched from Python; only reject paths that would leave the media root.
+        relative = Path(path)
+        if path in ("", ".") or relative.is_absolute() or ".." in relative.parts or "\x00" in path:
+            raise HTTPException(status_code=404)
+        headers = {"Cache-Control": media_cache_control()}
+        if self.offload == MEDIA_OFFLOAD_X_ACCEL:
+            prefix = settings.media_offload_internal_prefix.rstrip("/")
+            headers["X-Accel-Redirect"] = quote(f"{prefix}/{relative.as_posix()}")
+        else:
+            headers["X-Sendfile"] = str(self.root / relative)
+        media_type = mimetypes.guess_type(relative.name)[0] or "application/octet-stream"
+        return Response(status_code=200, headers=headers, media_type=media_type)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import math
+import threading
+import time
+from typing import Generic, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+
+class MemoryCache(Generic[KeyT, ValueT]):
+    # Thread-safe in-process LRU with optional per-entry expiry and byte budget; the one cache
+    # primitive behind the auth, box lookup and response caches.
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+        on_evict: Callable[[int], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._max_bytes = None if max_bytes is None else max(0, max_bytes)
+        self._ttl_seconds = ttl_seconds
+        self._on_evict = on_evict
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[KeyT, tuple[float, ValueT, int]] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: KeyT) -> ValueT | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(
+        self,
+        key: KeyT,
+        value: ValueT,
+        *,
+        ttl_seconds: float | None = None,
+        size: int = 0,
+        replace_if: Callable[[ValueT], bool] | None = None,
+    ) -> bool:
+        # replace_if runs under the lock against a live previous value and may veto the write.
+        ttl_seconds = self._ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            return False
+        if self._max_bytes is not None and size > self._max_bytes:
+            return False
+        expires_at = math.inf if ttl_seconds is None else self._clock() + ttl_seconds
+        evicted = 0
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and replace_if is not None and previous[0] > self._clock():
+                if not replace_if(previous[1]):
+                    return False
+            self._pop(key)
+            self._entries[key] = (expires_at, value, size)
+            self._bytes += size
+            while len(self._entries) > self._max_entries or (
+                self._max_bytes is not None and self._bytes > self._max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+                evicted += 1
+        if evicted and self._on_evict is not None:
+            self._on_evict(evicted)
+        return True
+
+    def discard(self, key: KeyT) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def discard_where(self, predicate: Callable[[KeyT, ValueT], bool]) -> int:
+        with self._lock:
+            keys = [key for key, (_expires_at, value, _size) in self._entries.items() if predicate(key, value)]
+            for key in keys:
+                self._pop(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> tuple[int, int]:
+        with self._lock:
+            return len(self._entries), self._bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _pop(self, key: KeyT) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
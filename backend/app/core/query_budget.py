@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import threading
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+from app.db.query_stats import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_PREVIEW_CHARS = 160
+
+
+@dataclass(frozen=True)
+class RequestQueryReport:
+    method: str
+    route: str
+    path: str
+    status_code: int
+    query_count: int
+    query_seconds: float
+    elapsed_seconds: float
+    repeated_statements: tuple[tuple[str, int], ...]
+
+
+QueryReportListener = Callable[[RequestQueryReport], None]
+
+_LISTENERS_LOCK = threading.Lock()
+_LISTENERS: list[QueryReportListener] = []
+
+
+def add_query_report_listener(listener: QueryReportListener) -> None:
+    with _LISTENERS_LOCK:
+        _LISTENERS.append(listener)
+
+
+def remove_query_report_listener(listener: QueryReportListener) -> None:
+    with _LISTENERS_LOCK:
+        if listener in _LISTENERS:
+            _LISTENERS.remove(listener)
+
+
+def _statement_preview(statement: str) -> str:
+    compact = " ".join(statement.split())
+    if len(compact) <= _STATEMENT_PREVIEW_CHARS:
+        return compact
+    return compact[: _STATEMENT_PREVIEW_CHARS - 3] + "..."
+
+
+def server_timing_value(stats: QueryStats, elapsed_seconds: float) -> str:
+    return (
+        f'db;dur={stats.duration_seconds * 1000:.1f};desc="{stats.count} queries", '
+        f"app;dur={elapsed_seconds * 1000:.1f}"
+    )
+
+
+def _build_report(scope: Scope, status_code: int, stats: QueryStats, elapsed_seconds: float) -> RequestQueryReport:
+    repeated_threshold = settings.query_repeated_statement_threshold
+    repeated = stats.repeated_statements(repeated_threshold) if repeated_threshold > 0 else []
+    return RequestQueryReport(
+        method=scope["method"],
+        route=route_template(scope),
+        path=scope.get("path", ""),
+        status_code=status_code,
+        query_count=stats.count,
+        query_seconds=stats.duration_seconds,
+        elapsed_seconds=elapsed_seconds,
+        repeated_statements=tuple((_statement_preview(statement), count) for statement, count in repeated),
+    )
+
+
+def _log_report(report: RequestQueryReport) -> None:
+    count_threshold = settings.query_count_warning_threshold
+    time_threshold_ms = settings.query_time_warning_ms
+    over_count = count_threshold > 0 and report.query_count > count_threshold
+    over_time = time_threshold_ms > 0 and report.query_seconds * 1000 > time_threshold_ms
+    if over_count or over_time:
+        logger.warning(
+            "Request query budget exceeded method=%s route=%s status=%s queries=%s query_ms=%.1f "
+            "max_queries=%s max_query_ms=%s",
+            report.method,
+            report.route,
+            report.status_code,
+            report.query_count,
+            report.query_seconds * 1000,
+            count_threshold,
+            time_threshold_ms,
+        )
+    for statement, count in report.repeated_statements:
+        logger.warning(
+            "Possible N+1 query method=%s route=%s repeats=%s statement=%s",
+            report.method,
+            report.route,
+            count,
+            statement,
+        )
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app: ASGIApp, *, server_timing: bool | None = None) -> None:
+        self.app = app
+        self.server_timing = settings.debug if server_timing is None else server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started_at = time.perf_counter()
+
+        with track_queries() as query_stats:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if self.server_timing:
+                        # Streaming bodies may query after this point; the header covers the work done so far.
+                        headers = MutableHeaders(scope=message)
+                        headers.append("Server-Timing", server_timing_value(query_stats, time.perf_counter() - started_at))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                report = _build_report(scope, status_code, query_stats, time.perf_counter() - started_at)
+                _log_report(report)
+                with _LISTENERS_LOCK:
+                    listeners = list(_LISTENERS)
+                for listener in listeners:
+                    listener(report)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable
+import importlib.util
+import logging
+import threading
+from typing import Any, TypeVar
+
+from fastapi import Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+try:
+    from sqlalchemy.ext.asyncio import (
+        AsyncEngine,
+        AsyncSession,
+        async_sessionmaker,
+        create_async_engine,
+    )
+except ImportError:  # sqlalchemy[asyncio] extra (greenlet) not installed
+    AsyncEngine = AsyncSession = async_sessionmaker = create_async_engine = None
+
+from app.core.config import settings
+from app.db.replica import should_use_replica
+from app.db.session import (
+    ENGINE_ROLE_API,
+    ENGINE_ROLE_REPLICA,
+    application_name,
+    get_db,
+    pool_options,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_ASYNC_DRIVERS = {
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+}
+_ENGINE_LOCK = threading.Lock()
+_ASYNC_ENGINES: dict[str, AsyncEngine] = {}
+_ASYNC_SESSION_FACTORIES: dict[str, async_sessionmaker[AsyncSession]] = {}
+_ASYNC_UNAVAILABLE_LOGGED = False
+
+
+def resolve_async_database_url(database_url: str) -> str | None:
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return None
+    drivername, _module_name = driver
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _async_support_missing(database_url: str) -> str | None:
+    # SQLAlchemy's asyncio bridge runs sync ORM code inside greenlets.
+    if create_async_engine is None or importlib.util.find_spec("greenlet") is None:
+        return "greenlet"
+    driver = _ASYNC_DRIVERS.get(make_url(database_url).get_backend_name())
+    if driver is None:
+        return "async driver"
+    if importlib.util.find_spec(driver[1]) is None:
+        return driver[1]
+    return None
+
+
+def async_db_active() -> bool:
+    global _ASYNC_UNAVAILABLE_LOGGED
+    if not settings.async_db_enabled:
+        return False
+    missing = _async_support_missing(settings.database_url)
+    if missing is None:
+        return True
+    if not _ASYNC_UNAVAILABLE_LOGGED:
+        logger.warning("Async database engine disabled: missing=%s; falling back to threadpool sessions", missing)
+        _ASYNC_UNAVAILABLE_LOGGED = True
+    return False
+
+
+def _build_async_engine(database_url: str, *, role: str) -> AsyncEngine:
+    async_url = resolve_async_database_url(database_url)
+    if async_url is None:
+        raise RuntimeError("Database URL has no async driver mapping")
+    engine_kwargs: dict[str, Any] = {"future": True, "echo": False}
+    if make_url(async_url).get_backend_name() == "sqlite":
+        # aiosqlite connections are bound to the event loop that opened them.
+        engine_kwargs["poolclass"] = NullPool
+    else:
+        engine_kwargs.update(pool_options(async_url))
+        server_settings = {"application_name": application_name(role)}
+        if settings.db_statement_timeout_ms > 0:
+            server_settings["statement_timeout"] = str(int(settings.db_statement_timeout_ms))
+        engine_kwargs["connect_args"] = {"server_settings": server_settings}
+    built = create_async_engine(async_url, **engine_kwargs)
+    logger.info("Async database engine initialized role=%s driver=%s", role, make_url(async_url).drivername)
+    return built
+
+
+def get_async_session_factory(*, replica: bool = False) -> async_sessionmaker[AsyncSession]:
+    role = ENGINE_ROLE_REPLICA if replica else ENGINE_ROLE_API
+    with _ENGINE_LOCK:
+        factory = _ASYNC_SESSION_FACTORIES.get(role)
+        if factory is None:
+            database_url = settings.database_replica_url if replica else settings.database_url
+            _ASYNC_ENGINES[role] = _build_async_engine(database_url, role=role)
+            factory = async_sessionmaker(bind=_ASYNC_ENGINES[role], expire_on_commit=False)
+            _ASYNC_SESSION_FACTORIES[role] = factory
+        return factory
+
+
+async def dispose_async_engine() -> None:
+    with _ENGINE_LOCK:
+        engines = list(_ASYNC_ENGINES.values())
+        _ASYNC_ENGINES.clear()
+        _ASYNC_SESSION_FACTORIES.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+class HotPathSession:
+    def __init__(self, *, sync_session: Session | None = None, async_session: AsyncSession | None = None) -> None:
+        if (sync_session is None) == (async_session is None):
+            raise ValueError("HotPathSession needs exactly one of sync_session or async_session")
+        self._sync_session = sync_session
+        self._async_session = async_session
+
+    @property
+    def is_async(self) -> bool:
+        return self._async_session is not None
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # With the async engine, run_sync executes fn on the event-loop thread (greenlet), so every
+        # line of Python in fn blocks other requests; only its queries are awaited. Keep fn to
+        # queries and use run_and_render for CPU-heavy shaping.
+        if self._async_session is not None:
+            return await self._async_session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self._sync_session, *args, **kwargs)
+
+    async def run_and_render(
+        self,
+        load: Callable[..., T],
+        render: Callable[[T], R],
+        *args: Any,
+        **kwargs: Any,
+    ) -> R:
+        # load runs the queries; render shapes and encodes the loaded rows in the threadpool and
+        # must not touch the session. The sync fallback does both in one threadpool hop.
+        if self._async_session is not None:
+            loaded = await self._async_session.run_sync(load, *args, **kwargs)
+            return await run_in_threadpool(render, loaded)
+        return await run_in_threadpool(_load_and_render, self._sync_session, load, render, args, kwargs)
+
+
+def _load_and_render(
+    db: Session,
+    load: Callable[..., T],
+    render: Callable[[T], R],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> R:
+    return render(load(db, *args, **kwargs))
+
+
+async def get_hot_path_db(request: Request, db: Session = Depends(get_db)) -> AsyncIterator[HotPathSession]:
+    if not async_db_active():
+        yield HotPathSession(sync_session=db)
+        return
+
+    replica = should_use_replica(request.method, request.cookies)
+    async with get_async_session_factory(replica=replica)() as async_db:
+        yield HotPathSession(async_session=async_db)
@@ -1,13 +1,15 @@
+from app.models.activity_daily_rollup import ActivityDailyRollup
 from app.models.activity_event import ActivityEvent
 from app.models.box import Box
+from app.models.box_code_sequence import BoxCodeSequence
 from app.models.intake_batch import IntakeBatch
 from app.models.intake_draft import IntakeDraft
 from app.models.item import Item
 from app.models.item_favorite import ItemFavorite
+from app.models.llm_setting import LLMSetting
 from app.models.membership import Membership
 from app.models.password_reset_token import PasswordResetToken
 from app.models.refresh_token import RefreshToken
-from app.models.llm_setting import LLMSetting
 from app.models.smtp_setting import SMTPSetting
 from app.models.stock_movement import StockMovement
 from app.models.user import User
@@ -21,6 +23,7 @@ __all__ = [
     "RefreshToken",
     "PasswordResetToken",
     "Box",
+    "BoxCodeSequence",
     "IntakeBatch",
     "IntakeDraft",
     "Item",
@@ -28,6 +31,7 @@ __all__ = [
     "StockMovement",
     "WarehouseInvite",
     "ActivityEvent",
+    "ActivityDailyRollup",
     "SMTPSetting",
     "LLMSetting",
 ]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_QUERY_STARTED_AT_KEY = "query_stats_started_at"
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration_seconds: float = 0.0
+    statements: dict[str, int] = field(default_factory=dict)
+    parent: QueryStats | None = field(default=None, repr=False)
+
+    def repeated_statements(self, min_count: int) -> list[tuple[str, int]]:
+        repeated = [(statement, count) for statement, count in self.statements.items() if count >= min_count]
+        return sorted(repeated, key=lambda entry: entry[1], reverse=True)
+
+
+_CURRENT: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    # Threadpool calls copy the context, so sync endpoints add to the same QueryStats object.
+    # Nested trackers also feed every enclosing tracker, so middlewares can measure independently.
+    stats = QueryStats(parent=_CURRENT.get())
+    token = _CURRENT.set(stats)
+    try:
+        yield stats
+    finally:
+        _CURRENT.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _CURRENT.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+    conn.info.setdefault(_QUERY_STARTED_AT_KEY, []).append(time.perf_counter())
+
+
+def _finish_query(conn, statement: str | None) -> None:
+    started = conn.info.get(_QUERY_STARTED_AT_KEY)
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _CURRENT.get()
+    while stats is not None:
+        stats.count += 1
+        stats.duration_seconds += elapsed
+        if statement is not None:
+            # Parameters are bound separately, so a query issued in a loop repeats the same text.
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
+        stats = stats.parent
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+    _finish_query(conn, statement)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    if exception_context.connection is not None:
+        _finish_query(exception_context.connection, exception_context.statement)
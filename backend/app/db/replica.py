@@ -0,0 +1,73 @@
+from collections.abc import Mapping
+from http.cookies import SimpleCookie
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+
+def replica_configured() -> bool:
+    return bool(settings.database_replica_url.strip())
+
+
+def primary_pinned(cookies: Mapping[str, str], *, now: float | None = None) -> bool:
+    raw = cookies.get(settings.replica_pin_cookie_name)
+    if not raw:
+        return False
+    try:
+        pinned_until = float(raw)
+    except ValueError:
+        return False
+    return pinned_until > (time.time() if now is None else now)
+
+
+def should_use_replica(method: str, cookies: Mapping[str, str]) -> bool:
+    if not replica_configured() or method.upper() not in READ_ONLY_METHODS:
+        return False
+    # Read-your-writes: a client that just wrote keeps reading from the primary until the pin expires.
+    return not primary_pinned(cookies)
+
+
+def _pin_cookie_header(pinned_until: float) -> bytes:
+    cookie = SimpleCookie()
+    name = settings.replica_pin_cookie_name
+    cookie[name] = f"{pinned_until:.3f}"
+    cookie[name]["max-age"] = str(max(1, int(settings.replica_read_your_writes_seconds)))
+    cookie[name]["path"] = "/"
+    cookie[name]["httponly"] = True
+    cookie[name]["samesite"] = settings.auth_cookie_samesite
+    if settings.auth_cookie_secure:
+        cookie[name]["secure"] = True
+    return cookie.output(header="").strip().encode("latin-1")
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in READ_ONLY_METHODS
+            or scope["method"] == "OPTIONS"
+            or not replica_configured()
+            or settings.replica_read_your_writes_seconds <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                pinned_until = time.time() + settings.replica_read_your_writes_seconds
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", _pin_cookie_header(pinned_until)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
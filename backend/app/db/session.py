@@ -1,14 +1,112 @@
-from sqlalchemy import create_engine
+import logging
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.replica import replica_configured, should_use_replica
+
+logger = logging.getLogger(__name__)
+
+ENGINE_ROLE_API = "api"
+ENGINE_ROLE_WORKER = "worker"
+ENGINE_ROLE_REPLICA = "replica"
+
+
+def _is_sqlite(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def _is_sqlite_memory(database_url: str) -> bool:
+    return _is_sqlite(database_url) and make_url(database_url).database in {None, "", ":memory:"}
+
+
+def statement_timeout_ms(role: str) -> int:
+    if role == ENGINE_ROLE_WORKER:
+        return settings.db_worker_statement_timeout_ms
+    return settings.db_statement_timeout_ms
+
+
+def application_name(role: str) -> str:
+    return f"{settings.app_name}:{role}"[:63]
+
 
-engine = create_engine(settings.database_url, future=True, echo=False)
+def pool_options(database_url: str) -> dict[str, Any]:
+    if _is_sqlite_memory(database_url):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        # WAL lets API reads proceed while intake workers write; busy_timeout waits instead of failing.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_bytes)}")
+    finally:
+        cursor.close()
+
+
+def build_engine(database_url: str, *, role: str) -> Engine:
+    connect_args: dict[str, Any] = {}
+    if make_url(database_url).get_backend_name() == "postgresql":
+        connect_args["application_name"] = application_name(role)
+        timeout_ms = statement_timeout_ms(role)
+        if timeout_ms > 0:
+            connect_args["options"] = f"-c statement_timeout={int(timeout_ms)}"
+
+    built = create_engine(
+        database_url,
+        future=True,
+        echo=False,
+        connect_args=connect_args,
+        **pool_options(database_url),
+    )
+    if _is_sqlite(database_url) and not _is_sqlite_memory(database_url):
+        event.listen(built, "connect", apply_sqlite_pragmas)
+    logger.debug("Database engine created role=%s backend=%s", role, built.dialect.name)
+    return built
+
+
+engine = build_engine(settings.database_url, role=ENGINE_ROLE_API)
+# SQLite has no per-connection role settings, so workers share the API engine there.
+worker_engine = (
+    engine if _is_sqlite(settings.database_url) else build_engine(settings.database_url, role=ENGINE_ROLE_WORKER)
+)
+replica_engine = (
+    build_engine(settings.database_replica_url, role=ENGINE_ROLE_REPLICA) if replica_configured() else None
+)
 SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
+WorkerSessionLocal = sessionmaker(bind=worker_engine, class_=Session, expire_on_commit=False)
+ReplicaSessionLocal = (
+    sessionmaker(bind=replica_engine, class_=Session, expire_on_commit=False) if replica_engine is not None else None
+)
+
+
+def dispose_engines() -> None:
+    engine.dispose()
+    if worker_engine is not engine:
+        worker_engine.dispose()
+    if replica_engine is not None:
+        replica_engine.dispose()
 
 
-def get_db() -> Session:
-    db = SessionLocal()
+def get_db(request: Request) -> Session:
+    if ReplicaSessionLocal is not None and should_use_replica(request.method, request.cookies):
+        db = ReplicaSessionLocal()
+    else:
+        db = SessionLocal()
     try:
         yield db
     finally:
@@ -1,12 +1,23 @@
-from pathlib import Path
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 import logging
+from pathlib import Path
+import secrets
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.api import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.media import MediaFiles
+from app.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, render_metrics
+from app.core.query_budget import QueryBudgetMiddleware
+from app.db.async_session import dispose_async_engine
+from app.db.replica import ReadYourWritesMiddleware
+from app.services.intake_workers import shutdown_batch_workers
+from app.services.maintenance import start_maintenance_scheduler, stop_maintenance_scheduler
+from app.services.password_hashing import shutdown_password_hashing_pool
 
 _LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
 
@@ -28,19 +39,39 @@ if not cors_origins:
     cors_origins = [settings.frontend_url]
 logger.debug("CORS origins configured: %s", cors_origins)
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    start_maintenance_scheduler()
+    try:
+        yield
+    finally:
+        stop_maintenance_scheduler()
+        shutdown_batch_workers()
+        shutdown_password_hashing_pool()
+        await dispose_async_engine()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryBudgetMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
 media_root = Path(settings.media_root)
 media_root.mkdir(parents=True, exist_ok=True)
-app.mount(settings.media_url_path, StaticFiles(directory=str(media_root)), name="media")
+app.mount(settings.media_url_path, MediaFiles(directory=str(media_root)), name="media")
 logger.info("API started app=%s api_prefix=%s log_level=%s", settings.app_name, settings.api_v1_prefix, settings.log_level)
 logger.debug("Media mount configured at path=%s root=%s", settings.media_url_path, media_root)
 
@@ -48,3 +79,15 @@ logger.debug("Media mount configured at path=%s root=%s", settings.media_url_pat
 @app.get("/healthz")
 def healthz() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> Response:
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected_token = settings.metrics_bearer_token.strip()
+    if expected_token:
+        provided = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        if not secrets.compare_digest(provided, expected_token):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -1,15 +1,18 @@
+from app.models.activity_daily_rollup import ActivityDailyRollup
 from app.models.activity_event import ActivityEvent
 from app.models.box import Box
+from app.models.box_code_sequence import BoxCodeSequence
 from app.models.change_log import ChangeLog
 from app.models.intake_batch import IntakeBatch
 from app.models.intake_draft import IntakeDraft
 from app.models.item import Item
 from app.models.item_favorite import ItemFavorite
-from app.models.processed_command import ProcessedCommand
+from app.models.llm_rate_limit_bucket import LLMRateLimitBucket
+from app.models.llm_setting import LLMSetting
 from app.models.membership import Membership
 from app.models.password_reset_token import PasswordResetToken
+from app.models.processed_command import ProcessedCommand
 from app.models.refresh_token import RefreshToken
-from app.models.llm_setting import LLMSetting
 from app.models.smtp_setting import SMTPSetting
 from app.models.stock_movement import StockMovement
 from app.models.sync_conflict import SyncConflict
@@ -24,11 +27,13 @@ __all__ = [
     "RefreshToken",
     "PasswordResetToken",
     "Box",
+    "BoxCodeSequence",
     "Item",
     "ItemFavorite",
     "StockMovement",
     "WarehouseInvite",
     "ActivityEvent",
+    "ActivityDailyRollup",
     "IntakeBatch",
     "IntakeDraft",
     "ChangeLog",
@@ -36,4 +41,5 @@ __all__ = [
     "SyncConflict",
     "SMTPSetting",
     "LLMSetting",
+    "LLMRateLimitBucket",
 ]
@@ -0,0 +1,25 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class ActivityDailyRollup(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    __tablename__ = "activity_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "warehouse_id",
+            "day",
+            "event_type",
+            "actor_user_id",
+            name="uq_activity_daily_rollups_key",
+        ),
+    )
+
+    warehouse_id: Mapped[str] = mapped_column(String(36), ForeignKey("warehouses.id"), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    actor_user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
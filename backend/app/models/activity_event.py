@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, ForeignKey, String
+from sqlalchemy import JSON, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -6,6 +6,17 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 class ActivityEvent(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "activity_events"
+    __table_args__ = (
+        Index("ix_activity_events_warehouse_created_id", "warehouse_id", "created_at", "id"),
+        Index(
+            "ix_activity_events_warehouse_entity",
+            "warehouse_id",
+            "entity_type",
+            "entity_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     warehouse_id: Mapped[str] = mapped_column(String(36), ForeignKey("warehouses.id"), index=True)
     actor_user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True)
@@ -1,13 +1,14 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 
 class Box(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "boxes"
+    __table_args__ = (Index("ix_boxes_warehouse_deleted", "warehouse_id", "deleted_at"),)
 
     warehouse_id: Mapped[str] = mapped_column(String(36), ForeignKey("warehouses.id"), index=True)
     parent_box_id: Mapped[str | None] = mapped_column(
@@ -30,3 +31,8 @@ class Box(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     children = relationship("Box", back_populates="parent")
     items = relationship("Item", back_populates="box")
     intake_batches = relationship("IntakeBatch", back_populates="target_box")
+
+    @validates("short_code")
+    def _normalize_short_code(self, _key: str, value: str) -> str:
+        # Stored upper-cased and trimmed so lookups can use ix_boxes_short_code with plain equality.
+        return value.strip().upper() if value else value
@@ -0,0 +1,12 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class BoxCodeSequence(Base):
+    __tablename__ = "box_code_sequences"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    next_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    scramble_key: Mapped[int] = mapped_column(Integer, nullable=False)
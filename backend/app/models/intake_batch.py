@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -8,6 +8,7 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 class IntakeBatch(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "intake_batches"
+    __table_args__ = (Index("ix_intake_batches_warehouse_updated", "warehouse_id", "updated_at"),)
 
     warehouse_id: Mapped[str] = mapped_column(String(36), ForeignKey("warehouses.id"), index=True)
     target_box_id: Mapped[str] = mapped_column(String(36), ForeignKey("boxes.id"), index=True)
@@ -17,6 +18,12 @@ class IntakeBatch(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     total_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     processed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     committed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    uploaded_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    processing_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    ready_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    review_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rejected_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
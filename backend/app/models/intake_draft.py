@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, JSON, String
+from sqlalchemy import JSON, Boolean, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -6,6 +6,7 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 class IntakeDraft(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "intake_drafts"
+    __table_args__ = (Index("ix_intake_drafts_batch_status_position", "batch_id", "status", "position"),)
 
     warehouse_id: Mapped[str] = mapped_column(String(36), ForeignKey("warehouses.id"), index=True)
     batch_id: Mapped[str] = mapped_column(String(36), ForeignKey("intake_batches.id"), index=True)
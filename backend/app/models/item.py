@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Integer, JSON, String
+from sqlalchemy import JSON, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -8,6 +8,22 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 class Item(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "items"
+    __table_args__ = (
+        Index(
+            "ix_items_warehouse_active_created",
+            "warehouse_id",
+            "created_at",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_items_warehouse_box_active",
+            "warehouse_id",
+            "box_id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     warehouse_id: Mapped[str] = mapped_column(String(36), ForeignKey("warehouses.id"), index=True)
     box_id: Mapped[str] = mapped_column(String(36), ForeignKey("boxes.id"), index=True)
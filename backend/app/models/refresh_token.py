@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -8,6 +8,14 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 class RefreshToken(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index(
+            "ix_refresh_tokens_revoked_updated",
+            "updated_at",
+            postgresql_where=text("revoked"),
+            sqlite_where=text("revoked"),
+        ),
+    )
 
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True)
     token_hash: Mapped[str] = mapped_column(String(255), unique=True, index=True)
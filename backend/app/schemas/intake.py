@@ -102,6 +102,11 @@ class IntakeBatchDetailResponse(BaseModel):
     drafts: list[IntakeDraftResponse] = Field(default_factory=list)
 
 
+class IntakeDraftEventResponse(BaseModel):
+    batch: IntakeBatchResponse
+    draft: IntakeDraftResponse
+
+
 class IntakeBatchUploadResponse(BaseModel):
     batch: IntakeBatchResponse
     drafts: list[IntakeDraftResponse] = Field(default_factory=list)
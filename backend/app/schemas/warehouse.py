@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -48,3 +48,10 @@ class ActivityEventResponse(BaseModel):
     entity_id: str | None
     metadata: dict
     created_at: datetime
+
+
+class ActivityDailyRollupResponse(BaseModel):
+    day: date
+    event_type: str
+    actor_user_id: str
+    event_count: int
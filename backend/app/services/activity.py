@@ -1,5 +1,13 @@
+from __future__ import annotations
+
+import base64
+from collections import Counter
+from datetime import UTC, date, datetime
+
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.models.activity_daily_rollup import ActivityDailyRollup
 from app.models.activity_event import ActivityEvent
 
 
@@ -23,3 +31,79 @@ def record_activity(
             metadata_json=metadata or {},
         )
     )
+
+
+def encode_activity_cursor(created_at: datetime, event_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{event_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_activity_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, event_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), event_id
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid activity cursor") from exc
+
+
+def _event_day(created_at: datetime) -> date:
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(UTC)
+    return created_at.date()
+
+
+def roll_up_activity_before(db: Session, *, cutoff: datetime, batch_size: int) -> int:
+    # Folds the oldest events into per-day counts and deletes them; the caller commits.
+    events = db.execute(
+        select(
+            ActivityEvent.id,
+            ActivityEvent.warehouse_id,
+            ActivityEvent.actor_user_id,
+            ActivityEvent.event_type,
+            ActivityEvent.created_at,
+        )
+        .where(ActivityEvent.created_at < cutoff)
+        .order_by(ActivityEvent.created_at.asc())
+        .limit(max(1, batch_size))
+    ).all()
+    if not events:
+        return 0
+
+    deleted = db.execute(
+        delete(ActivityEvent).where(ActivityEvent.id.in_([event.id for event in events]))
+    ).rowcount
+    if deleted != len(events):
+        # Another replica's scheduler took part of this batch; its transaction owns those counts.
+        db.rollback()
+        return 0
+
+    counts = Counter(
+        (event.warehouse_id, _event_day(event.created_at), event.event_type, event.actor_user_id)
+        for event in events
+    )
+    existing = {
+        (rollup.warehouse_id, rollup.day, rollup.event_type, rollup.actor_user_id): rollup
+        for rollup in db.scalars(
+            select(ActivityDailyRollup).where(
+                ActivityDailyRollup.warehouse_id.in_({key[0] for key in counts}),
+                ActivityDailyRollup.day.in_({key[1] for key in counts}),
+            )
+        )
+    }
+    for key, count in counts.items():
+        rollup = existing.get(key)
+        if rollup is not None:
+            rollup.event_count += count
+            continue
+        warehouse_id, day, event_type, actor_user_id = key
+        db.add(
+            ActivityDailyRollup(
+                warehouse_id=warehouse_id,
+                day=day,
+                event_type=event_type,
+                actor_user_id=actor_user_id,
+                event_count=count,
+            )
+        )
+    return len(events)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+import logging
+from typing import TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.core.memory_cache import MemoryCache
+from app.models.membership import Membership
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", User, Membership)
+
+_REQUEST_MEMO_KEY = "auth_memo"
+
+
+_USERS: MemoryCache[str, dict[str, object]] = MemoryCache(max_entries=10_000)
+_MEMBERSHIPS: MemoryCache[tuple[str, str], dict[str, object]] = MemoryCache(max_entries=10_000)
+
+
+def _request_memo(db: Session) -> dict[Hashable, object]:
+    return db.info.setdefault(_REQUEST_MEMO_KEY, {})
+
+
+def _snapshot(instance: User | Membership) -> dict[str, object]:
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+
+def _attach_snapshot(db: Session, model: type[ModelT], snapshot: dict[str, object]) -> ModelT:
+    instance = model(**snapshot)
+    make_transient_to_detached(instance)
+    # load=False attaches the cached row state without emitting a SELECT.
+    return db.merge(instance, load=False)
+
+
+def get_cached_user(db: Session, user_id: str) -> User | None:
+    memo = _request_memo(db)
+    user = memo.get(("user", user_id))
+    if user is not None:
+        return user
+    snapshot = _USERS.get(user_id)
+    if snapshot is None:
+        return None
+    user = _attach_snapshot(db, User, snapshot)
+    memo[("user", user_id)] = user
+    return user
+
+
+def remember_user(db: Session, user: User) -> None:
+    _request_memo(db)[("user", user.id)] = user
+    _USERS.set(user.id, _snapshot(user), ttl_seconds=settings.auth_cache_ttl_seconds)
+
+
+def get_cached_membership(db: Session, *, user_id: str, warehouse_id: str) -> Membership | None:
+    memo = _request_memo(db)
+    key = ("membership", user_id, warehouse_id)
+    membership = memo.get(key)
+    if membership is not None:
+        return membership
+    snapshot = _MEMBERSHIPS.get((user_id, warehouse_id))
+    if snapshot is None:
+        return None
+    membership = _attach_snapshot(db, Membership, snapshot)
+    memo[key] = membership
+    return membership
+
+
+def remember_membership(db: Session, membership: Membership) -> None:
+    # Only positive lookups are cached so a newly granted membership is visible immediately.
+    _request_memo(db)[("membership", membership.user_id, membership.warehouse_id)] = membership
+    _MEMBERSHIPS.set(
+        (membership.user_id, membership.warehouse_id),
+        _snapshot(membership),
+        ttl_seconds=settings.auth_cache_ttl_seconds,
+    )
+
+
+def invalidate_user(user_id: str) -> None:
+    _USERS.discard(user_id)
+    logger.debug("Auth cache invalidated user_id=%s", user_id)
+
+
+def invalidate_membership(*, user_id: str, warehouse_id: str) -> None:
+    _MEMBERSHIPS.discard((user_id, warehouse_id))
+    logger.debug("Membership cache invalidated user_id=%s warehouse_id=%s", user_id, warehouse_id)
+
+
+def clear_auth_caches() -> None:
+    _USERS.clear()
+    _MEMBERSHIPS.clear()
@@ -1,29 +1,140 @@
+from collections import deque
+import logging
 import secrets
+import threading
 
-from sqlalchemy import func, select
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.session import WorkerSessionLocal
 from app.models.box import Box
+from app.models.box_code_sequence import BoxCodeSequence
+
+logger = logging.getLogger(__name__)
+
+SHORT_CODE_PREFIX = "BX-"
+SHORT_CODE_BITS = 24
+SHORT_CODE_SPACE = 1 << SHORT_CODE_BITS
+_HALF_BITS = SHORT_CODE_BITS // 2
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_FEISTEL_ROUNDS = 4
+_SEQUENCE_NAME = "box_short_code"
+_SESSION_POOL_INFO_KEY = "box_short_code_pool"
+
+_POOL_LOCK = threading.Lock()
+_POOL: deque[str] = deque()
 
 
 def normalize_short_code(value: str) -> str:
     return value.strip().upper()
 
 
+def format_short_code(value: int) -> str:
+    return f"{SHORT_CODE_PREFIX}{value:06X}"
+
+
+def _round_function(half: int, key: int, round_index: int) -> int:
+    mixed = ((half ^ (key >> (round_index * 3))) * 0x5BD1E995 + round_index) & 0xFFFFFFFF
+    return (mixed ^ (mixed >> 15)) & _HALF_MASK
+
+
+def scramble_short_code_value(value: int, key: int) -> int:
+    # A balanced Feistel network is a bijection on 24 bits, so sequential values never collide.
+    left, right = (value >> _HALF_BITS) & _HALF_MASK, value & _HALF_MASK
+    for round_index in range(_FEISTEL_ROUNDS):
+        left, right = right, left ^ _round_function(right, key, round_index)
+    return (left << _HALF_BITS) | right
+
+
 def short_code_in_use(db: Session, short_code: str, *, exclude_box_id: str | None = None) -> bool:
     normalized = normalize_short_code(short_code)
-    query = select(Box.id).where(func.upper(Box.short_code) == normalized)
+    query = select(Box.id).where(Box.short_code == normalized)
     if exclude_box_id:
         query = query.where(Box.id != exclude_box_id)
     return db.scalar(query) is not None
 
 
-def generate_unique_short_code(db: Session, *, exclude_box_id: str | None = None, max_attempts: int = 32) -> str:
-    for _ in range(max_attempts):
-        short_code = f"BX-{secrets.token_hex(3).upper()}"
-        if not short_code_in_use(db, short_code, exclude_box_id=exclude_box_id):
-            return short_code
-    raise RuntimeError("Failed to generate unique box short code")
+def _seed_sequence(db: Session) -> None:
+    # Migrations seed the row; this covers databases built with create_all. A concurrent seed is a no-op.
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    db.execute(
+        insert(BoxCodeSequence)
+        .values(name=_SEQUENCE_NAME, next_value=0, scramble_key=secrets.randbelow(SHORT_CODE_SPACE))
+        .on_conflict_do_nothing(index_elements=[BoxCodeSequence.name])
+    )
+
+
+def _reserve_range(db: Session, size: int) -> tuple[range, int]:
+    # One atomic increment, so concurrent reservations never read the same next_value; SELECT ...
+    # FOR UPDATE is a no-op on SQLite and pysqlite runs plain SELECTs outside a transaction.
+    reserve = (
+        update(BoxCodeSequence)
+        .where(BoxCodeSequence.name == _SEQUENCE_NAME)
+        .values(next_value=BoxCodeSequence.next_value + size)
+        .returning(BoxCodeSequence.next_value, BoxCodeSequence.scramble_key)
+    )
+    row = db.execute(reserve).first()
+    if row is None:
+        _seed_sequence(db)
+        row = db.execute(reserve).first()
+    if row is None:
+        raise RuntimeError("Failed to reserve box short code block")
+    end, key = row
+    start = end - size
+    if start >= SHORT_CODE_SPACE:
+        raise RuntimeError("Box short code space exhausted")
+    return range(start, min(end, SHORT_CODE_SPACE)), key
+
+
+def _reserve_committed_range(size: int) -> tuple[range, int]:
+    with WorkerSessionLocal() as reserve_db:
+        reserved = _reserve_range(reserve_db, size)
+        reserve_db.commit()
+        return reserved
+
+
+def _reserve_block(db: Session) -> list[str]:
+    size = max(1, settings.box_short_code_block_size)
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite has a single writer: a second connection would wait on this session's own write lock.
+        values, key = _reserve_range(db, size)
+    else:
+        values, key = _reserve_committed_range(size)
+    candidates = [format_short_code(scramble_short_code_value(value, key)) for value in values]
+    # Legacy random codes may already occupy some slots; one IN probe filters the whole block.
+    taken = set(db.scalars(select(Box.short_code).where(Box.short_code.in_(candidates))).all())
+    logger.debug("Box short code block reserved start=%s size=%s taken=%s", values.start, len(values), len(taken))
+    return [code for code in candidates if code not in taken]
+
+
+def _pop_process_pool() -> str | None:
+    with _POOL_LOCK:
+        return _POOL.popleft() if _POOL else None
+
+
+def _discard_pooled_code(db: Session, short_code: str) -> None:
+    # A preferred code kept by import or sync may still be waiting in a pool; drop it there so the
+    # allocator never hands it out again. Codes pooled by another worker process are not reachable
+    # from here; that cross-process window is accepted (short_code is not unique).
+    session_pool: deque[str] | None = db.info.get(_SESSION_POOL_INFO_KEY)
+    if session_pool and short_code in session_pool:
+        session_pool.remove(short_code)
+    with _POOL_LOCK:
+        if short_code in _POOL:
+            _POOL.remove(short_code)
+
+
+def generate_unique_short_code(db: Session) -> str:
+    # Blocks are checked against existing boxes once, when reserved, so handing out a code is free.
+    code = _pop_process_pool()
+    if code is not None:
+        return code
+    session_pool: deque[str] = db.info.setdefault(_SESSION_POOL_INFO_KEY, deque())
+    while not session_pool:
+        session_pool.extend(_reserve_block(db))
+    return session_pool.popleft()
 
 
 def coerce_unique_short_code(
@@ -35,5 +146,26 @@ def coerce_unique_short_code(
     if preferred_short_code:
         normalized = normalize_short_code(preferred_short_code)
         if not short_code_in_use(db, normalized, exclude_box_id=exclude_box_id):
+            _discard_pooled_code(db, normalized)
             return normalized
-    return generate_unique_short_code(db, exclude_box_id=exclude_box_id)
+    return generate_unique_short_code(db)
+
+
+def clear_short_code_pool() -> None:
+    with _POOL_LOCK:
+        _POOL.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _share_committed_codes(session: Session) -> None:
+    # Leftover codes come from a committed reservation, so any session may hand them out.
+    leftover = session.info.pop(_SESSION_POOL_INFO_KEY, None)
+    if leftover:
+        with _POOL_LOCK:
+            _POOL.extend(leftover)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_uncommitted_codes(session: Session) -> None:
+    # The sequence bump rolled back with the session, so these values will be reserved again.
+    session.info.pop(_SESSION_POOL_INFO_KEY, None)
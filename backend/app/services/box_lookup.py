@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.memory_cache import MemoryCache
+from app.models.box import Box
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEYS_INFO_KEY = "box_lookup_pending_invalidations"
+
+
+@dataclass(frozen=True)
+class BoxLookupEntry:
+    box_id: str
+    warehouse_id: str
+    short_code: str
+    name: str
+
+
+_LOOKUPS: MemoryCache[tuple[str, str], BoxLookupEntry | tuple[BoxLookupEntry, ...]] = MemoryCache(
+    max_entries=settings.box_lookup_cache_max_entries,
+    ttl_seconds=settings.box_lookup_cache_ttl_seconds,
+)
+
+
+def _entry(box: Box) -> BoxLookupEntry:
+    return BoxLookupEntry(box_id=box.id, warehouse_id=box.warehouse_id, short_code=box.short_code, name=box.name)
+
+
+def get_cached_qr_lookup(qr_token: str) -> BoxLookupEntry | None:
+    return _LOOKUPS.get(("qr", qr_token))
+
+
+def remember_qr_lookup(qr_token: str, box: Box) -> BoxLookupEntry:
+    entry = _entry(box)
+    _LOOKUPS.set(("qr", qr_token), entry)
+    return entry
+
+
+def get_cached_short_code_lookup(short_code: str) -> tuple[BoxLookupEntry, ...] | None:
+    return _LOOKUPS.get(("code", short_code))
+
+
+def remember_short_code_lookup(short_code: str, boxes: list[Box]) -> tuple[BoxLookupEntry, ...]:
+    # Misses are not cached: a box created in another process must resolve immediately.
+    entries = tuple(_entry(box) for box in boxes)
+    if entries:
+        _LOOKUPS.set(("code", short_code), entries)
+    return entries
+
+
+def clear_box_lookup_cache() -> None:
+    _LOOKUPS.clear()
+
+
+def _references_box(value: object, box_ids: set[str]) -> bool:
+    entries = value if isinstance(value, tuple) else (value,)
+    return any(entry.box_id in box_ids for entry in entries)
+
+
+def _invalidate(keys: set[tuple[str, str]], box_ids: set[str]) -> int:
+    for key in keys:
+        _LOOKUPS.discard(key)
+    return len(keys) + _LOOKUPS.discard_where(lambda _key, value: _references_box(value, box_ids))
+
+
+def _lookup_keys(box: Box) -> set[tuple[str, str]]:
+    keys: set[tuple[str, str]] = set()
+    state = inspect(box)
+    for attr_name, kind in (("qr_token", "qr"), ("short_code", "code")):
+        history = state.attrs[attr_name].history
+        for value in (*history.added, *history.unchanged, *history.deleted):
+            if value:
+                keys.add((kind, value))
+    return keys
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_box_changes(session: Session, _flush_context) -> None:
+    keys: set[tuple[str, str]] = set()
+    box_ids: set[str] = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Box):
+            keys |= _lookup_keys(instance)
+            box_ids.add(instance.id)
+    if not box_ids:
+        return
+    _invalidate(keys, box_ids)
+    # Drop again on commit so a concurrent reader cannot re-cache the pre-commit row.
+    pending_keys, pending_box_ids = session.info.setdefault(_PENDING_KEYS_INFO_KEY, (set(), set()))
+    pending_keys.update(keys)
+    pending_box_ids.update(box_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_box_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEYS_INFO_KEY, None)
+    if pending is None:
+        return
+    keys, box_ids = pending
+    dropped = _invalidate(keys, box_ids)
+    logger.debug("Box lookup cache invalidated boxes=%s entries=%s", len(box_ids), dropped)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_box_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEYS_INFO_KEY, None)
@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+import hashlib
+
+from starlette.datastructures import QueryParams
+
+
+@dataclass(frozen=True)
+class WarehouseVersion:
+    warehouse_id: str
+    last_seq: int
+    # Hash of path, query params and, where the body depends on them, user id and media signing epoch.
+    variant: str
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.last_seq}-{self.variant}"'
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+
+
+def build_warehouse_version(
+    *,
+    warehouse_id: str,
+    path: str,
+    query_params: QueryParams,
+    last_seq: int,
+    user_id: str | None = None,
+    media_epoch: int | None = None,
+) -> WarehouseVersion:
+    # Every mutation bumps the warehouse change_log, so (path, params, seq) fully identifies the body.
+    query = "&".join(f"{key}={value}" for key, value in sorted(query_params.multi_items()))
+    key = f"{path}?{query}|{user_id or ''}"
+    if media_epoch is not None:
+        # Signed photo URLs in the body rotate with the epoch even when no row changed.
+        key = f"{key}|media:{media_epoch}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return WarehouseVersion(warehouse_id=warehouse_id, last_seq=last_seq, variant=digest)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison; proxies that compress responses may prefix W/.
+        if candidate.removeprefix("W/") == etag:
+            return True
+    return False
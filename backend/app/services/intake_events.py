@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_MAX_PENDING_EVENTS = 256
+_SUBSCRIBERS_LOCK = threading.Lock()
+_SUBSCRIBERS: dict[str, list["IntakeEventSubscription"]] = {}
+
+
+@dataclass(frozen=True)
+class IntakeBatchEvent:
+    warehouse_id: str
+    batch_id: str
+    kind: str
+    draft_id: str | None = None
+
+
+@dataclass(eq=False)
+class IntakeEventSubscription:
+    warehouse_id: str
+    batch_id: str
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue[IntakeBatchEvent] = field(default_factory=lambda: asyncio.Queue(maxsize=_MAX_PENDING_EVENTS))
+
+    def _push(self, event: IntakeBatchEvent) -> None:
+        if self.queue.full():
+            # Slow consumers lose the oldest events; the stream re-syncs from the DB on the next poll.
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def next_event(self, *, timeout_seconds: float) -> IntakeBatchEvent | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout_seconds)
+        except TimeoutError:
+            return None
+
+
+def subscribe_batch_events(warehouse_id: str, batch_id: str) -> IntakeEventSubscription:
+    subscription = IntakeEventSubscription(
+        warehouse_id=warehouse_id,
+        batch_id=batch_id,
+        loop=asyncio.get_running_loop(),
+    )
+    with _SUBSCRIBERS_LOCK:
+        _SUBSCRIBERS.setdefault(_batch_key(warehouse_id, batch_id), []).append(subscription)
+    logger.debug("Intake batch events subscribed warehouse_id=%s batch_id=%s", warehouse_id, batch_id)
+    return subscription
+
+
+def unsubscribe_batch_events(subscription: IntakeEventSubscription) -> None:
+    key = _batch_key(subscription.warehouse_id, subscription.batch_id)
+    with _SUBSCRIBERS_LOCK:
+        subscribers = _SUBSCRIBERS.get(key, [])
+        if subscription in subscribers:
+            subscribers.remove(subscription)
+        if not subscribers:
+            _SUBSCRIBERS.pop(key, None)
+    logger.debug(
+        "Intake batch events unsubscribed warehouse_id=%s batch_id=%s",
+        subscription.warehouse_id,
+        subscription.batch_id,
+    )
+
+
+def publish_batch_event(warehouse_id: str, batch_id: str, *, kind: str, draft_id: str | None = None) -> int:
+    event = IntakeBatchEvent(warehouse_id=warehouse_id, batch_id=batch_id, kind=kind, draft_id=draft_id)
+    with _SUBSCRIBERS_LOCK:
+        subscribers = list(_SUBSCRIBERS.get(_batch_key(warehouse_id, batch_id), []))
+
+    delivered = 0
+    for subscription in subscribers:
+        try:
+            subscription.loop.call_soon_threadsafe(subscription._push, event)
+            delivered += 1
+        except RuntimeError:
+            # Event loop already closed: the client went away without unsubscribing.
+            unsubscribe_batch_events(subscription)
+    return delivered
+
+
+def _batch_key(warehouse_id: str, batch_id: str) -> str:
+    return f"{warehouse_id}:{batch_id}"
@@ -7,16 +7,17 @@ import logging
 from pathlib import Path
 from urllib.parse import unquote, urlparse
 
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, Select, and_, case, func, literal, null, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.llm import normalize_model_priority
-from app.db.session import SessionLocal
+from app.db.session import WorkerSessionLocal
 from app.models.intake_batch import IntakeBatch
 from app.models.intake_draft import IntakeDraft
 from app.models.llm_setting import LLMSetting
 from app.schemas.intake import IntakeBatchStatus, IntakeDraftStatus
+from app.services.intake_events import publish_batch_event
 from app.services.llm_enrichment import generate_item_draft_from_photo
 from app.services.secret_store import decrypt_secret
 
@@ -39,6 +40,34 @@ def utcnow() -> datetime:
     return datetime.now(UTC).replace(tzinfo=None)
 
 
+_STATUS_COUNTER_COLUMNS: dict[str, str] = {
+    IntakeDraftStatus.uploaded.value: "uploaded_count",
+    IntakeDraftStatus.processing.value: "processing_count",
+    IntakeDraftStatus.ready.value: "ready_count",
+    IntakeDraftStatus.review.value: "review_count",
+    IntakeDraftStatus.rejected.value: "rejected_count",
+    IntakeDraftStatus.error.value: "error_count",
+    IntakeDraftStatus.committed.value: "committed_count",
+}
+_ROLLUP_ATTRIBUTES = [
+    *_STATUS_COUNTER_COLUMNS.values(),
+    "total_count",
+    "processed_count",
+    "status",
+    "finished_at",
+    "updated_at",
+]
+
+
+def batch_status_counts(batch: IntakeBatch) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for status_value, column_name in _STATUS_COUNTER_COLUMNS.items():
+        value = int(getattr(batch, column_name) or 0)
+        if value:
+            counts[status_value] = value
+    return counts
+
+
 def resolve_batch_status_counts(db: Session, batch_id: str) -> dict[str, int]:
     rows = db.execute(
         select(IntakeDraft.status, func.count())
@@ -48,32 +77,152 @@ def resolve_batch_status_counts(db: Session, batch_id: str) -> dict[str, int]:
     return {status: int(count) for status, count in rows}
 
 
-def refresh_batch_rollup(db: Session, batch: IntakeBatch) -> dict[str, int]:
-    counts = resolve_batch_status_counts(db, batch.id)
-
+def _rollup_values(counters: dict[str, ColumnElement[int]]) -> dict[str, object]:
+    # Mirrors the batch lifecycle: processing > committed > drafting > review.
+    total = sum(counters.values(), literal(0))
+    uploaded = counters[IntakeDraftStatus.uploaded.value]
+    processing = counters[IntakeDraftStatus.processing.value]
+    committed = counters[IntakeDraftStatus.committed.value]
+    now = utcnow()
+    is_processing = processing > 0
+    is_committed = and_(total > 0, committed == total)
+    is_drafting = or_(total == 0, uploaded > 0)
+    return {
+        **{_STATUS_COUNTER_COLUMNS[status_value]: value for status_value, value in counters.items()},
+        "total_count": total,
+        "processed_count": total - uploaded - processing,
+        "status": case(
+            (is_processing, IntakeBatchStatus.processing.value),
+            (is_committed, IntakeBatchStatus.committed.value),
+            (is_drafting, IntakeBatchStatus.drafting.value),
+            else_=IntakeBatchStatus.review.value,
+        ),
+        "finished_at": case(
+            (is_processing, null()),
+            (is_committed, now),
+            (is_drafting, null()),
+            else_=now,
+        ),
+    }
+
+
+def _expire_batch_rollup(db: Session, batch_id: str) -> None:
+    batch = db.identity_map.get(Session.identity_key(IntakeBatch, batch_id))
+    if batch is not None:
+        db.expire(batch, _ROLLUP_ATTRIBUTES)
+
+
+def _implied_batch_status(counts: dict[str, int]) -> str:
+    # Python twin of the status CASE in _rollup_values, used to spot stale stored rollups.
     total = sum(counts.values())
-    uploaded_count = counts.get(IntakeDraftStatus.uploaded.value, 0)
-    processing_count = counts.get(IntakeDraftStatus.processing.value, 0)
-    committed_count = counts.get(IntakeDraftStatus.committed.value, 0)
-
-    batch.total_count = total
-    batch.processed_count = max(total - uploaded_count - processing_count, 0)
-    batch.committed_count = committed_count
-
-    if processing_count > 0:
-        batch.status = IntakeBatchStatus.processing.value
-        batch.finished_at = None
-    elif total > 0 and committed_count == total:
-        batch.status = IntakeBatchStatus.committed.value
-        batch.finished_at = utcnow()
-    elif total == 0 or uploaded_count > 0:
-        batch.status = IntakeBatchStatus.drafting.value
-        batch.finished_at = None
-    else:
-        batch.status = IntakeBatchStatus.review.value
-        batch.finished_at = utcnow()
+    if counts.get(IntakeDraftStatus.processing.value, 0) > 0:
+        return IntakeBatchStatus.processing.value
+    if total > 0 and counts.get(IntakeDraftStatus.committed.value, 0) == total:
+        return IntakeBatchStatus.committed.value
+    if total == 0 or counts.get(IntakeDraftStatus.uploaded.value, 0) > 0:
+        return IntakeBatchStatus.drafting.value
+    return IntakeBatchStatus.review.value
+
+
+def _rollup_is_current(batch: IntakeBatch, counts: dict[str, int]) -> bool:
+    implied_status = _implied_batch_status(counts)
+    expects_finished = implied_status in (IntakeBatchStatus.committed.value, IntakeBatchStatus.review.value)
+    return (
+        batch_status_counts(batch) == counts
+        and batch.status == implied_status
+        and (batch.finished_at is not None) == expects_finished
+    )
 
-    return counts
+
+def _write_batch_rollup(db: Session, batch_id: str, counters: dict[str, ColumnElement[int]]) -> None:
+    table = IntakeBatch.__table__
+    db.execute(update(table).where(table.c.id == batch_id).values(**_rollup_values(counters)))
+    _expire_batch_rollup(db, batch_id)
+
+
+def refresh_batch_rollup(db: Session, batch_id: str) -> None:
+    # Re-derives status and finished_at from the stored counters, e.g. after an endpoint set
+    # status=processing for drafts another worker has already drained.
+    table = IntakeBatch.__table__
+    _write_batch_rollup(
+        db,
+        batch_id,
+        {status_value: table.c[column_name] for status_value, column_name in _STATUS_COUNTER_COLUMNS.items()},
+    )
+
+
+def adjust_batch_status_counters(db: Session, batch_id: str, deltas: dict[str, int]) -> None:
+    deltas = {status_value: delta for status_value, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = IntakeBatch.__table__
+    # SET expressions read the pre-update row, so counters and derived status move in one atomic statement.
+    counters = {
+        status_value: table.c[column_name] + deltas.get(status_value, 0)
+        for status_value, column_name in _STATUS_COUNTER_COLUMNS.items()
+    }
+    _write_batch_rollup(db, batch_id, counters)
+
+
+def set_draft_statuses(db: Session, drafts: list[IntakeDraft], status_value: str) -> None:
+    deltas_by_batch: dict[str, dict[str, int]] = {}
+    for draft in drafts:
+        previous = draft.status
+        draft.status = status_value
+        if previous == status_value:
+            continue
+        deltas = deltas_by_batch.setdefault(draft.batch_id, {})
+        deltas[previous] = deltas.get(previous, 0) - 1
+        deltas[status_value] = deltas.get(status_value, 0) + 1
+    for batch_id, deltas in deltas_by_batch.items():
+        adjust_batch_status_counters(db, batch_id, deltas)
+
+
+def set_draft_status(db: Session, draft: IntakeDraft, status_value: str) -> None:
+    set_draft_statuses(db, [draft], status_value)
+
+
+def reconcile_batch_counters(db: Session, *, batch_ids: list[str] | None = None, only_open: bool = False) -> int:
+    query = select(IntakeBatch)
+    if batch_ids is not None:
+        if not batch_ids:
+            return 0
+        query = query.where(IntakeBatch.id.in_(batch_ids))
+    if only_open:
+        query = query.where(IntakeBatch.status != IntakeBatchStatus.committed.value)
+    batches = db.scalars(query).all()
+    if not batches:
+        return 0
+
+    actual_by_batch: dict[str, dict[str, int]] = {batch.id: {} for batch in batches}
+    rows = db.execute(
+        select(IntakeDraft.batch_id, IntakeDraft.status, func.count(IntakeDraft.id))
+        .where(IntakeDraft.batch_id.in_(list(actual_by_batch.keys())))
+        .group_by(IntakeDraft.batch_id, IntakeDraft.status)
+    ).all()
+    for batch_id, status_value, total in rows:
+        actual_by_batch[str(batch_id)][str(status_value)] = int(total)
+
+    repaired = 0
+    for batch in batches:
+        actual = actual_by_batch[batch.id]
+        if _rollup_is_current(batch, actual):
+            continue
+        logger.warning(
+            "Intake batch rollup drifted warehouse_id=%s batch_id=%s stored=%s stored_status=%s actual=%s",
+            batch.warehouse_id,
+            batch.id,
+            batch_status_counts(batch),
+            batch.status,
+            actual,
+        )
+        counters = {
+            status_value: literal(actual.get(status_value, 0))
+            for status_value in _STATUS_COUNTER_COLUMNS
+        }
+        _write_batch_rollup(db, batch.id, counters)
+        repaired += 1
+    return repaired
 
 
 def resolve_parallel_worker_count(requested_workers: int | None) -> int:
@@ -89,6 +238,21 @@ def resolve_intake_parallelism_for_warehouse(db: Session, warehouse_id: str) ->
     return resolve_parallel_worker_count(getattr(setting, "intake_parallelism", DEFAULT_PARALLEL_WORKERS))
 
 
+def pending_drafts_query(warehouse_id: str, batch_id: str, *, draft_ids: list[str] | None = None) -> Select:
+    query = (
+        select(IntakeDraft)
+        .where(
+            IntakeDraft.batch_id == batch_id,
+            IntakeDraft.warehouse_id == warehouse_id,
+            IntakeDraft.status == IntakeDraftStatus.uploaded.value,
+        )
+        .order_by(IntakeDraft.position.asc(), IntakeDraft.created_at.asc())
+    )
+    if draft_ids:
+        query = query.where(IntakeDraft.id.in_(draft_ids))
+    return query
+
+
 def process_intake_batch(
     warehouse_id: str,
     batch_id: str,
@@ -105,7 +269,7 @@ def process_intake_batch(
         workers_limit,
         len(draft_ids) if draft_ids else 0,
     )
-    db = SessionLocal()
+    db = WorkerSessionLocal()
     try:
         batch = db.scalar(
             select(IntakeBatch).where(IntakeBatch.id == batch_id, IntakeBatch.warehouse_id == warehouse_id)
@@ -114,37 +278,24 @@ def process_intake_batch(
             logger.error("Intake worker aborted: batch not found warehouse_id=%s batch_id=%s", warehouse_id, batch_id)
             return 0
 
-        query = (
-            select(IntakeDraft)
-            .where(
-                IntakeDraft.batch_id == batch_id,
-                IntakeDraft.warehouse_id == warehouse_id,
-                IntakeDraft.status == IntakeDraftStatus.uploaded.value,
-            )
-            .order_by(IntakeDraft.position.asc(), IntakeDraft.created_at.asc())
-        )
-        if draft_ids:
-            query = query.where(IntakeDraft.id.in_(draft_ids))
-        pending = db.scalars(query).all()
+        pending = db.scalars(pending_drafts_query(warehouse_id, batch_id, draft_ids=draft_ids)).all()
 
         if not pending:
-            refresh_batch_rollup(db, batch)
-            db.commit()
             logger.debug(
                 "Intake worker no pending drafts warehouse_id=%s batch_id=%s",
                 warehouse_id,
                 batch_id,
             )
+            refresh_batch_rollup(db, batch_id)
+            db.commit()
             return 0
 
+        set_draft_statuses(db, list(pending), IntakeDraftStatus.processing.value)
         for draft in pending:
-            draft.status = IntakeDraftStatus.processing.value
             draft.processing_attempts += 1
             draft.error_message = None
         if batch.started_at is None:
             batch.started_at = utcnow()
-        batch.status = IntakeBatchStatus.processing.value
-        batch.finished_at = None
         db.commit()
 
         llm_setting = db.scalar(select(LLMSetting).where(LLMSetting.warehouse_id == warehouse_id))
@@ -157,7 +308,7 @@ def process_intake_batch(
             if llm_setting.api_key_encrypted:
                 try:
                     api_key = decrypt_secret(llm_setting.api_key_encrypted)
-                except Exception:  # noqa: BLE001
+                except Exception:
                     logger.error("Could not decrypt LLM API key for warehouse %s", warehouse_id)
         logger.debug(
             "Intake worker config warehouse_id=%s batch_id=%s pending=%s workers=%s language=%s",
@@ -190,8 +341,11 @@ def process_intake_batch(
             context_by_draft_id[draft_id] = {"name_context": name_context}
 
         workers = max(1, min(workers_limit, len(jobs), MAX_PARALLEL_WORKERS))
-        results: dict[str, dict[str, object]] = {}
+        publish_batch_event(warehouse_id, batch_id, kind="batch")
 
+        success_count = 0
+        error_count = 0
+        applied_count = 0
         with ThreadPoolExecutor(max_workers=workers) as executor:
             future_map = {
                 executor.submit(
@@ -207,75 +361,97 @@ def process_intake_batch(
                 for job in jobs
             }
 
+            # Each result is committed as soon as it lands so clients see drafts appear one by one
+            # and a crash mid-batch only loses the drafts still in flight.
             for future in as_completed(future_map):
                 draft_id = future_map[future]
                 try:
-                    results[draft_id] = future.result()
-                except Exception as exc:  # noqa: BLE001
+                    payload = future.result()
+                except Exception as exc:
                     logger.exception("Unexpected processing failure for draft %s", draft_id)
-                    results[draft_id] = {
-                        "error": f"Error inesperado de procesamiento: {str(exc)[:220]}"
-                    }
-
-        processed_drafts = db.scalars(
-            select(IntakeDraft).where(
-                IntakeDraft.id.in_(list(results.keys())),
-                IntakeDraft.batch_id == batch_id,
-                IntakeDraft.warehouse_id == warehouse_id,
-            )
-        ).all()
-
-        success_count = 0
-        error_count = 0
-        for draft in processed_drafts:
-            payload = results.get(draft.id, {})
-            context = context_by_draft_id.get(draft.id, {})
-            context_name = context.get("name_context")
-            error_text = str(payload.get("error") or "").strip()
-            if error_text:
-                draft.status = IntakeDraftStatus.error.value
-                draft.error_message = error_text[:500]
-                draft.warnings = []
-                draft.llm_used = False
-                draft.confidence = 0.0
-                error_count += 1
-                continue
-
-            payload_name = _normalize_optional_text(payload.get("name"), max_len=160)
-            # In manual retry, user-edited title is authoritative and should not be replaced by model output.
-            draft.name = context_name or payload_name or "Articulo sin identificar"
-            if payload_name:
-                if not context_name:
-                    draft.suggested_name = payload_name
-                elif not draft.suggested_name:
-                    draft.suggested_name = payload_name
-            raw_description = payload.get("description")
-            payload_description = _normalize_optional_text(raw_description, max_len=1000)
-            draft.description = payload_description or draft.description
-            draft.tags = [str(tag) for tag in (payload.get("tags") or [])][:10]
-            draft.aliases = [str(alias) for alias in (payload.get("aliases") or [])][:5]
-            draft.confidence = float(payload.get("confidence") or 0.0)
-            draft.warnings = [str(w) for w in (payload.get("warnings") or [])][:5]
-            draft.llm_used = bool(payload.get("llm_used"))
-            draft.error_message = None
-            draft.status = _resolve_draft_result_status()
-            success_count += 1
-
-        refresh_batch_rollup(db, batch)
+                    payload = {"error": f"Error inesperado de procesamiento: {str(exc)[:220]}"}
+
+                draft = db.scalar(
+                    select(IntakeDraft)
+                    .where(
+                        IntakeDraft.id == draft_id,
+                        IntakeDraft.batch_id == batch_id,
+                        IntakeDraft.warehouse_id == warehouse_id,
+                    )
+                    .execution_options(populate_existing=True)
+                )
+                if draft is None:
+                    logger.debug(
+                        "Intake worker skipped removed draft warehouse_id=%s batch_id=%s draft_id=%s",
+                        warehouse_id,
+                        batch_id,
+                        draft_id,
+                    )
+                    continue
+
+                context_name = context_by_draft_id.get(draft.id, {}).get("name_context")
+                if _apply_draft_result(db, draft, payload, context_name=context_name):
+                    success_count += 1
+                else:
+                    error_count += 1
+                applied_count += 1
+                db.commit()
+                publish_batch_event(warehouse_id, batch_id, kind="draft", draft_id=draft.id)
+
+        # Cheap single-batch drift check; the periodic job covers batches nobody is working on.
+        reconcile_batch_counters(db, batch_ids=[batch_id])
         db.commit()
+        publish_batch_event(warehouse_id, batch_id, kind="batch")
         logger.info(
             "Intake worker completed warehouse_id=%s batch_id=%s success=%s errors=%s total=%s",
             warehouse_id,
             batch_id,
             success_count,
             error_count,
-            len(processed_drafts),
+            applied_count,
         )
-        return len(processed_drafts)
+        return applied_count
     finally:
         db.close()
 
 
+def _apply_draft_result(
+    db: Session,
+    draft: IntakeDraft,
+    payload: dict[str, object],
+    *,
+    context_name: str | None,
+) -> bool:
+    error_text = str(payload.get("error") or "").strip()
+    if error_text:
+        set_draft_status(db, draft, IntakeDraftStatus.error.value)
+        draft.error_message = error_text[:500]
+        draft.warnings = []
+        draft.llm_used = False
+        draft.confidence = 0.0
+        return False
+
+    payload_name = _normalize_optional_text(payload.get("name"), max_len=160)
+    # In manual retry, user-edited title is authoritative and should not be replaced by model output.
+    draft.name = context_name or payload_name or "Articulo sin identificar"
+    if payload_name:
+        if not context_name:
+            draft.suggested_name = payload_name
+        elif not draft.suggested_name:
+            draft.suggested_name = payload_name
+    raw_description = payload.get("description")
+    payload_description = _normalize_optional_text(raw_description, max_len=1000)
+    draft.description = payload_description or draft.description
+    draft.tags = [str(tag) for tag in (payload.get("tags") or [])][:10]
+    draft.aliases = [str(alias) for alias in (payload.get("aliases") or [])][:5]
+    draft.confidence = float(payload.get("confidence") or 0.0)
+    draft.warnings = [str(w) for w in (payload.get("warnings") or [])][:5]
+    draft.llm_used = bool(payload.get("llm_used"))
+    draft.error_message = None
+    set_draft_status(db, draft, _resolve_draft_result_status())
+    return True
+
+
 def _resolve_draft_result_status() -> str:
     return IntakeDraftStatus.ready.value
 
@@ -338,7 +514,7 @@ def _process_photo_url(
         return draft
     except ValueError as exc:
         return {"error": str(exc)}
-    except Exception as exc:  # noqa: BLE001
+    except Exception as exc:
         logger.error("LLM processing failed for %s: %s", photo_url, exc)
         return {"error": "No se pudo completar el analisis de la imagen."}
 
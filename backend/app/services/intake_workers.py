@@ -7,7 +7,8 @@ import time
 
 from sqlalchemy import select
 
-from app.db.session import SessionLocal
+from app.core.metrics import REGISTRY, gauge
+from app.db.session import WorkerSessionLocal
 from app.models.intake_draft import IntakeDraft
 from app.schemas.intake import IntakeDraftStatus
 from app.services.intake_processing import process_intake_batch, resolve_parallel_worker_count
@@ -18,6 +19,12 @@ _BATCH_IDLE_WAIT_SECONDS = 1.0
 _WORKERS_LOCK = threading.Lock()
 _ACTIVE_WORKERS: dict[str, "BatchWorkerHandle"] = {}
 
+INTAKE_ACTIVE_BATCH_WORKERS = gauge("mw_intake_batch_workers_active", "Intake batches with a live worker thread.")
+INTAKE_BATCH_WORKER_PARALLELISM = gauge(
+    "mw_intake_batch_worker_parallelism",
+    "Draft processing slots requested by live intake batch workers.",
+)
+
 
 @dataclass
 class BatchWorkerHandle:
@@ -147,7 +154,7 @@ def _run_worker_loop(worker_key: str, handle: BatchWorkerHandle) -> None:
 
 
 def _batch_has_uploaded_drafts(warehouse_id: str, batch_id: str) -> bool:
-    db = SessionLocal()
+    db = WorkerSessionLocal()
     try:
         draft = db.scalar(
             select(IntakeDraft.id).where(
@@ -163,3 +170,13 @@ def _batch_has_uploaded_drafts(warehouse_id: str, batch_id: str) -> bool:
 
 def _worker_key(*, warehouse_id: str, batch_id: str) -> str:
     return f"{warehouse_id}:{batch_id}"
+
+
+def _collect_worker_metrics() -> None:
+    with _WORKERS_LOCK:
+        live = [handle for handle in _ACTIVE_WORKERS.values() if handle.thread is not None and handle.thread.is_alive()]
+    INTAKE_ACTIVE_BATCH_WORKERS.set(len(live))
+    INTAKE_BATCH_WORKER_PARALLELISM.set(sum(handle.max_parallel_workers for handle in live))
+
+
+REGISTRY.register_collector(_collect_worker_metrics)
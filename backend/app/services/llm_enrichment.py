@@ -1,21 +1,51 @@
+from base64 import b64decode
+from binascii import Error as BinasciiError
+from collections.abc import Sequence
 import json
 import logging
 import re
+import time
 import unicodedata
-from base64 import b64decode
-from binascii import Error as BinasciiError
-from collections.abc import Sequence
-from uuid import uuid4
 from urllib import error, request
+from uuid import uuid4
 
-from app.core.llm import DEFAULT_GEMINI_MODEL_PRIORITY, SUPPORTED_GEMINI_MODELS, GeminiModelId, normalize_model_priority
-
+from app.core.config import settings
+from app.core.llm import (
+    DEFAULT_GEMINI_MODEL_PRIORITY,
+    SUPPORTED_GEMINI_MODELS,
+    GeminiModelId,
+    normalize_model_priority,
+)
+from app.core.metrics import counter, histogram
+from app.services.llm_rate_limit import (
+    RETRYABLE_STATUS_CODES,
+    SHARED_BACKOFF_STATUS_CODES,
+    get_llm_rate_limiter,
+    parse_retry_after,
+)
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_GEMINI_MODEL = DEFAULT_GEMINI_MODEL_PRIORITY[0]
-GEMINI_GENERATE_CONTENT_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+GEMINI_GENERATE_CONTENT_PATH = "/v1beta/models/{model}:generateContent"
 DEFAULT_OUTPUT_LANGUAGE = "es"
+HEURISTIC_RESOLUTION = "heuristic"
+
+LLM_REQUESTS = counter(
+    "mw_llm_requests_total",
+    "Gemini generateContent HTTP calls by runtime model and outcome.",
+    ("model", "outcome"),
+)
+LLM_REQUEST_DURATION = histogram(
+    "mw_llm_request_duration_seconds",
+    "Gemini generateContent HTTP call latency by runtime model.",
+    ("model",),
+)
+LLM_OPERATIONS = counter(
+    "mw_llm_operations_total",
+    "LLM enrichment operations by kind and the model (or heuristic fallback) that resolved them.",
+    ("operation", "resolved_by"),
+)
 
 
 _STOPWORDS = {
@@ -292,6 +322,77 @@ def _heuristic_photo_draft(
     }
 
 
+def _generate_content_url(model: str) -> str:
+    return settings.gemini_base_url.rstrip("/") + GEMINI_GENERATE_CONTENT_PATH.format(model=model)
+
+
+def _post_gemini_generate_content(
+    *,
+    api_key: str,
+    model: str,
+    body: dict[str, object],
+    timeout_seconds: float,
+) -> dict[str, object]:
+    limiter = get_llm_rate_limiter()
+    req = request.Request(
+        _generate_content_url(model),
+        data=json.dumps(body).encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "x-goog-api-key": api_key,
+        },
+        method="POST",
+    )
+    attempt = 0
+    while True:
+        with limiter.slot(api_key=api_key):
+            started_at = time.perf_counter()
+            try:
+                with request.urlopen(req, timeout=timeout_seconds) as res:
+                    raw = res.read()
+            except error.HTTPError as exc:
+                LLM_REQUEST_DURATION.observe(time.perf_counter() - started_at, model=model)
+                if exc.code not in RETRYABLE_STATUS_CODES:
+                    LLM_REQUESTS.inc(model=model, outcome=f"http_{exc.code}")
+                    raise
+                LLM_REQUESTS.inc(model=model, outcome="throttled")
+                retry_after = parse_retry_after(exc.headers.get("Retry-After") if exc.headers is not None else None)
+                backoff_seconds = limiter.record_throttle(
+                    api_key=api_key,
+                    status_code=exc.code,
+                    retry_after=retry_after,
+                    attempt=attempt,
+                )
+                if attempt >= settings.llm_max_retries:
+                    raise
+                attempt += 1
+                throttled_status = exc.code
+                logger.warning(
+                    "LLM request throttled model=%s status=%s retry_after=%s backoff_seconds=%.2f retry=%s/%s "
+                    "concurrency_limit=%s",
+                    model,
+                    exc.code,
+                    retry_after,
+                    backoff_seconds,
+                    attempt,
+                    settings.llm_max_retries,
+                    limiter.concurrency.limit,
+                )
+            except (error.URLError, TimeoutError):
+                LLM_REQUEST_DURATION.observe(time.perf_counter() - started_at, model=model)
+                LLM_REQUESTS.inc(model=model, outcome="network_error")
+                limiter.record_congestion()
+                raise
+            else:
+                LLM_REQUEST_DURATION.observe(time.perf_counter() - started_at, model=model)
+                LLM_REQUESTS.inc(model=model, outcome="success")
+                limiter.record_success()
+                return json.loads(raw.decode("utf-8"))
+        if throttled_status not in SHARED_BACKOFF_STATUS_CODES:
+            # 429/503 already paused the shared bucket; other 5xx only delay this caller.
+            limiter.pause(backoff_seconds)
+
+
 def _gemini_tags_and_aliases(
     *,
     api_key: str,
@@ -313,7 +414,6 @@ def _gemini_tags_and_aliases(
         f"{name}\n"
         f"Item description: {description or ''}"
     )
-    url = GEMINI_GENERATE_CONTENT_URL.format(model=model)
     body = {
         "contents": [{"role": "user", "parts": [{"text": prompt}]}],
         "generationConfig": {
@@ -321,18 +421,7 @@ def _gemini_tags_and_aliases(
             "responseMimeType": "application/json",
         },
     }
-    req = request.Request(
-        url,
-        data=json.dumps(body).encode("utf-8"),
-        headers={
-            "Content-Type": "application/json",
-            "x-goog-api-key": api_key,
-        },
-        method="POST",
-    )
-
-    with request.urlopen(req, timeout=timeout_seconds) as res:  # noqa: S310
-        payload = json.loads(res.read().decode("utf-8"))
+    payload = _post_gemini_generate_content(api_key=api_key, model=model, body=body, timeout_seconds=timeout_seconds)
 
     text = ""
     candidates = payload.get("candidates") or []
@@ -395,7 +484,6 @@ def _gemini_photo_draft(
         prompt += "\nIf a context name is provided, use that exact value for the output field `name`."
     elif context_description:
         prompt += "\nUse context hints only if consistent with the photo."
-    url = GEMINI_GENERATE_CONTENT_URL.format(model=model)
     body = {
         "contents": [
             {
@@ -412,17 +500,7 @@ def _gemini_photo_draft(
         },
     }
 
-    req = request.Request(
-        url,
-        data=json.dumps(body).encode("utf-8"),
-        headers={
-            "Content-Type": "application/json",
-            "x-goog-api-key": api_key,
-        },
-        method="POST",
-    )
-    with request.urlopen(req, timeout=timeout_seconds) as res:  # noqa: S310
-        payload = json.loads(res.read().decode("utf-8"))
+    payload = _post_gemini_generate_content(api_key=api_key, model=model, body=body, timeout_seconds=timeout_seconds)
 
     text = ""
     candidates = payload.get("candidates") or []
@@ -539,6 +617,7 @@ def generate_tags_and_aliases(
                             len(tags),
                             len(aliases),
                         )
+                        LLM_OPERATIONS.inc(operation="tags", resolved_by=runtime_model)
                         return tags, aliases
                     raise ValueError("Gemini returned empty tags")
                 except (error.URLError, TimeoutError, ValueError, json.JSONDecodeError) as exc:
@@ -573,6 +652,7 @@ def generate_tags_and_aliases(
                     break
 
     tags, aliases = _heuristic_tags_and_aliases(name, description)
+    LLM_OPERATIONS.inc(operation="tags", resolved_by=HEURISTIC_RESOLUTION)
     logger.error(
         "LLM tags request resolved via heuristic fallback op=%s tags=%s aliases=%s",
         operation_id,
@@ -661,6 +741,7 @@ def generate_item_draft_from_photo(
                             len(draft.get("tags") or []),
                             float(draft.get("confidence") or 0.0),
                         )
+                        LLM_OPERATIONS.inc(operation="photo_draft", resolved_by=runtime_model)
                         return draft
                     raise ValueError("Gemini photo draft did not include required fields")
                 except (error.URLError, TimeoutError, ValueError, json.JSONDecodeError) as exc:
@@ -694,5 +775,6 @@ def generate_item_draft_from_photo(
                     )
                     break
 
+    LLM_OPERATIONS.inc(operation="photo_draft", resolved_by=HEURISTIC_RESOLUTION)
     logger.error("LLM photo draft request resolved via heuristic fallback op=%s", operation_id)
     return fallback
@@ -0,0 +1,350 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+import hashlib
+import logging
+import random
+import threading
+import time
+from typing import Protocol
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import WorkerSessionLocal
+from app.models.llm_rate_limit_bucket import LLMRateLimitBucket
+from app.utils.datetime import ensure_utc, utcnow
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKEND_MEMORY = "memory"
+RATE_LIMIT_BACKEND_DATABASE = "database"
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+SHARED_BACKOFF_STATUS_CODES = frozenset({429, 503})
+CONGESTION_DECREASE_WINDOW_SECONDS = 1.0
+
+
+class RateLimitWaitTimeout(TimeoutError):
+    pass
+
+
+class TokenBucket(Protocol):
+    def reserve(self) -> float: ...
+
+    def block_for(self, seconds: float) -> None: ...
+
+
+def parse_retry_after(raw: str | None) -> float | None:
+    value = (raw or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, (ensure_utc(retry_at) - utcnow()).total_seconds())
+
+
+def compute_backoff_seconds(attempt: int, *, retry_after: float | None) -> float:
+    max_seconds = max(0.0, settings.llm_retry_max_seconds)
+    if retry_after is not None:
+        return min(retry_after, max_seconds)
+    ceiling = min(max_seconds, max(0.0, settings.llm_retry_base_seconds) * (2 ** max(0, attempt)))
+    # Jitter keeps parallel workers from retrying in lockstep.
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class MemoryTokenBucket:
+    def __init__(
+        self,
+        *,
+        rate_per_second: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate_per_second = max(0.0, rate_per_second)
+        self._capacity = max(1.0, capacity)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self._capacity
+        self._refilled_at = clock()
+        self._blocked_until = 0.0
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._rate_per_second <= 0:
+                return 0.0
+            elapsed = max(0.0, now - self._refilled_at)
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._rate_per_second)
+            self._refilled_at = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self._rate_per_second
+
+    def block_for(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+
+class DatabaseTokenBucket:
+    def __init__(
+        self,
+        *,
+        bucket_key: str,
+        rate_per_second: float,
+        capacity: float,
+        session_factory: Callable[[], Session] = WorkerSessionLocal,
+    ) -> None:
+        self._bucket_key = bucket_key
+        self._rate_per_second = max(0.0, rate_per_second)
+        self._capacity = max(1.0, capacity)
+        self._session_factory = session_factory
+
+    def _load_for_update(self, db: Session) -> LLMRateLimitBucket:
+        row = db.scalar(
+            select(LLMRateLimitBucket)
+            .where(LLMRateLimitBucket.bucket_key == self._bucket_key)
+            .with_for_update()
+        )
+        if row is None:
+            row = LLMRateLimitBucket(bucket_key=self._bucket_key, tokens=self._capacity, refilled_at=utcnow())
+            db.add(row)
+        return row
+
+    def reserve(self) -> float:
+        with self._session_factory() as db:
+            row = self._load_for_update(db)
+            now = utcnow()
+            wait_seconds = 0.0
+            if row.blocked_until is not None and ensure_utc(row.blocked_until) > now:
+                wait_seconds = (ensure_utc(row.blocked_until) - now).total_seconds()
+            elif self._rate_per_second > 0:
+                elapsed = max(0.0, (now - ensure_utc(row.refilled_at)).total_seconds())
+                tokens = min(self._capacity, row.tokens + elapsed * self._rate_per_second)
+                if tokens >= 1.0:
+                    tokens -= 1.0
+                else:
+                    wait_seconds = (1.0 - tokens) / self._rate_per_second
+                row.tokens = tokens
+                row.refilled_at = now
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker created the bucket row concurrently; retry shortly.
+                db.rollback()
+                return 0.05
+            return wait_seconds
+
+    def block_for(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._session_factory() as db:
+            row = self._load_for_update(db)
+            blocked_until = utcnow() + timedelta(seconds=seconds)
+            if row.blocked_until is None or ensure_utc(row.blocked_until) < blocked_until:
+                row.blocked_until = blocked_until
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        *,
+        minimum: int,
+        maximum: int,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._minimum = max(1, minimum)
+        self._maximum = max(self._minimum, maximum)
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._limit = float(self._maximum)
+        self._in_flight = 0
+        self._last_decrease_at: float | None = None
+
+    @property
+    def limit(self) -> int:
+        return max(self._minimum, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, *, timeout_seconds: float) -> bool:
+        deadline = self._clock() + max(0.0, timeout_seconds)
+        with self._condition:
+            while self._in_flight >= self.limit:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._condition.notify()
+
+    def on_success(self) -> None:
+        with self._condition:
+            previous = self.limit
+            # Additive increase: roughly +increase_step per window of `limit` successes.
+            self._limit = min(float(self._maximum), self._limit + self._increase_step / max(1.0, self._limit))
+            if self.limit > previous:
+                self._condition.notify_all()
+
+    def on_congestion(self) -> None:
+        with self._condition:
+            now = self._clock()
+            if (
+                self._last_decrease_at is not None
+                and now - self._last_decrease_at < CONGESTION_DECREASE_WINDOW_SECONDS
+            ):
+                # Calls already in flight when the provider pushed back must not collapse the limit repeatedly.
+                return
+            self._last_decrease_at = now
+            self._limit = max(float(self._minimum), self._limit * self._decrease_factor)
+
+
+class LLMRateLimiter:
+    def __init__(
+        self,
+        *,
+        backend: str,
+        requests_per_minute: int,
+        burst: int,
+        min_concurrency: int,
+        max_concurrency: int,
+        max_wait_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.backend = backend if backend in {RATE_LIMIT_BACKEND_MEMORY, RATE_LIMIT_BACKEND_DATABASE} else RATE_LIMIT_BACKEND_MEMORY
+        self._rate_per_second = max(0, requests_per_minute) / 60.0
+        self._capacity = float(max(1, burst))
+        self._max_wait_seconds = max(0.0, max_wait_seconds)
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets_lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self.concurrency = AdaptiveConcurrencyLimiter(minimum=min_concurrency, maximum=max_concurrency, clock=clock)
+
+    def _bucket_for(self, api_key: str) -> TokenBucket:
+        bucket_key = f"gemini:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:32]}"
+        with self._buckets_lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                if self.backend == RATE_LIMIT_BACKEND_DATABASE:
+                    bucket = DatabaseTokenBucket(
+                        bucket_key=bucket_key,
+                        rate_per_second=self._rate_per_second,
+                        capacity=self._capacity,
+                    )
+                else:
+                    bucket = MemoryTokenBucket(
+                        rate_per_second=self._rate_per_second,
+                        capacity=self._capacity,
+                        clock=self._clock,
+                    )
+                self._buckets[bucket_key] = bucket
+            return bucket
+
+    @contextmanager
+    def slot(self, *, api_key: str) -> Iterator[None]:
+        deadline = self._clock() + self._max_wait_seconds
+        if not self.concurrency.acquire(timeout_seconds=self._max_wait_seconds):
+            raise RateLimitWaitTimeout("Timed out waiting for an LLM concurrency slot")
+        try:
+            bucket = self._bucket_for(api_key)
+            while True:
+                wait_seconds = bucket.reserve()
+                if wait_seconds <= 0:
+                    break
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    raise RateLimitWaitTimeout("Timed out waiting for an LLM rate limit token")
+                self._sleep(min(wait_seconds, remaining))
+            yield
+        finally:
+            self.concurrency.release()
+
+    def record_success(self) -> None:
+        self.concurrency.on_success()
+
+    def record_congestion(self) -> None:
+        self.concurrency.on_congestion()
+
+    def record_throttle(self, *, api_key: str, status_code: int, retry_after: float | None, attempt: int) -> float:
+        self.concurrency.on_congestion()
+        backoff_seconds = compute_backoff_seconds(attempt, retry_after=retry_after)
+        if status_code in SHARED_BACKOFF_STATUS_CODES:
+            # Quota pushback applies to every worker sharing the key, not only the caller.
+            self._bucket_for(api_key).block_for(backoff_seconds)
+        return backoff_seconds
+
+    def pause(self, seconds: float) -> None:
+        if seconds > 0:
+            self._sleep(seconds)
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "backend": self.backend,
+            "concurrency_limit": self.concurrency.limit,
+            "in_flight": self.concurrency.in_flight,
+        }
+
+
+_LIMITER_LOCK = threading.Lock()
+_LIMITER: LLMRateLimiter | None = None
+
+
+def get_llm_rate_limiter() -> LLMRateLimiter:
+    global _LIMITER
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            _LIMITER = LLMRateLimiter(
+                backend=settings.llm_rate_limit_backend.strip().lower(),
+                requests_per_minute=settings.llm_requests_per_minute,
+                burst=settings.llm_rate_limit_burst,
+                min_concurrency=settings.llm_min_concurrency,
+                max_concurrency=settings.llm_max_concurrency,
+                max_wait_seconds=settings.llm_rate_limit_max_wait_seconds,
+            )
+            logger.info(
+                "LLM rate limiter initialized backend=%s requests_per_minute=%s burst=%s concurrency=%s..%s",
+                _LIMITER.backend,
+                settings.llm_requests_per_minute,
+                settings.llm_rate_limit_burst,
+                settings.llm_min_concurrency,
+                settings.llm_max_concurrency,
+            )
+        return _LIMITER
+
+
+def reset_llm_rate_limiter() -> None:
+    global _LIMITER
+    with _LIMITER_LOCK:
+        _LIMITER = None
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.db.session import WorkerSessionLocal
+from app.services.activity import roll_up_activity_before
+from app.services.intake_processing import reconcile_batch_counters
+from app.services.token_revocation import refresh_token_revocations
+
+logger = logging.getLogger(__name__)
+
+_SCHEDULER_LOCK = threading.Lock()
+_SCHEDULER: "MaintenanceScheduler | None" = None
+
+
+@dataclass
+class MaintenanceJob:
+    name: str
+    interval_seconds: float
+    run: Callable[[], object]
+    next_run_at: float = 0.0
+
+
+@dataclass
+class MaintenanceScheduler:
+    jobs: list[MaintenanceJob]
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        now = time.monotonic()
+        for job in self.jobs:
+            job.next_run_at = now + job.interval_seconds
+        self.thread = threading.Thread(target=self._run_loop, daemon=True, name="maintenance-scheduler")
+        self.thread.start()
+        logger.info("Maintenance scheduler started jobs=%s", [job.name for job in self.jobs])
+
+    def stop(self, *, timeout_seconds: float = 5.0) -> None:
+        self.stop_event.set()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join(timeout=max(timeout_seconds, 0.0))
+
+    def _run_loop(self) -> None:
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            for job in self.jobs:
+                if self.stop_event.is_set():
+                    return
+                if now >= job.next_run_at:
+                    run_maintenance_job(job)
+                    job.next_run_at = time.monotonic() + job.interval_seconds
+            next_run_at = min(job.next_run_at for job in self.jobs)
+            self.stop_event.wait(timeout=max(0.0, next_run_at - time.monotonic()))
+
+
+def run_maintenance_job(job: MaintenanceJob) -> None:
+    started_at = time.monotonic()
+    try:
+        result = job.run()
+    except Exception:
+        logger.exception("Maintenance job failed job=%s", job.name)
+        return
+    logger.debug(
+        "Maintenance job completed job=%s result=%s elapsed_ms=%s",
+        job.name,
+        result,
+        int((time.monotonic() - started_at) * 1000),
+    )
+
+
+def reconcile_open_intake_batches() -> int:
+    with WorkerSessionLocal() as db:
+        repaired = reconcile_batch_counters(db, only_open=True)
+        db.commit()
+    if repaired:
+        logger.info("Intake batch counters reconciled repaired=%s", repaired)
+    return repaired
+
+
+def roll_up_expired_activity() -> int:
+    cutoff = datetime.now(UTC) - timedelta(days=settings.activity_retention_days)
+    rolled_up = 0
+    # Bounded per run so one tick never holds the scheduler thread for long; the next run continues.
+    for _batch in range(max(1, settings.activity_rollup_max_batches)):
+        with WorkerSessionLocal() as db:
+            count = roll_up_activity_before(db, cutoff=cutoff, batch_size=settings.activity_rollup_batch_size)
+            db.commit()
+        rolled_up += count
+        if count < settings.activity_rollup_batch_size:
+            break
+    if rolled_up:
+        logger.info("Activity events rolled up into daily aggregates events=%s cutoff=%s", rolled_up, cutoff.isoformat())
+    return rolled_up
+
+
+def build_maintenance_jobs() -> list[MaintenanceJob]:
+    jobs: list[MaintenanceJob] = []
+    if settings.intake_counter_reconcile_interval_seconds > 0:
+        jobs.append(
+            MaintenanceJob(
+                name="intake_counter_reconcile",
+                interval_seconds=float(settings.intake_counter_reconcile_interval_seconds),
+                run=reconcile_open_intake_batches,
+            )
+        )
+    if settings.token_revocation_refresh_seconds > 0:
+        jobs.append(
+            MaintenanceJob(
+                name="token_revocation_refresh",
+                interval_seconds=settings.token_revocation_refresh_seconds,
+                run=refresh_token_revocations,
+            )
+        )
+    if settings.activity_rollup_interval_seconds > 0 and settings.activity_retention_days > 0:
+        jobs.append(
+            MaintenanceJob(
+                name="activity_rollup",
+                interval_seconds=float(settings.activity_rollup_interval_seconds),
+                run=roll_up_expired_activity,
+            )
+        )
+    return jobs
+
+
+def start_maintenance_scheduler() -> bool:
+    global _SCHEDULER
+    if not settings.maintenance_enabled:
+        return False
+    jobs = build_maintenance_jobs()
+    if not jobs:
+        return False
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is not None:
+            return False
+        _SCHEDULER = MaintenanceScheduler(jobs=jobs)
+        _SCHEDULER.start()
+    return True
+
+
+def stop_maintenance_scheduler(*, timeout_seconds: float = 5.0) -> None:
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        scheduler = _SCHEDULER
+        _SCHEDULER = None
+    if scheduler is not None:
+        scheduler.stop(timeout_seconds=timeout_seconds)
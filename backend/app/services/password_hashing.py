@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import TypeVar
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY, gauge
+from app.services.security import hash_password, verify_and_update_password
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordHashingBusyError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class PasswordHashingStats:
+    workers: int
+    max_queue: int
+    in_flight: int
+    queued: int
+    completed: int
+    rejected: int
+    wait_seconds_total: float
+    run_seconds_total: float
+
+
+class PasswordHashingPool:
+    def __init__(self, *, workers: int, max_queue: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self._workers = max(1, workers)
+        self._max_queue = max(0, max_queue)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # argon2-cffi releases the GIL while hashing, so threads give real parallelism.
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._run_seconds_total = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: object) -> T:
+        with self._lock:
+            if self._pending >= self._workers + self._max_queue:
+                self._rejected += 1
+                raise PasswordHashingBusyError("Password hashing queue is full")
+            self._pending += 1
+        submitted_at = self._clock()
+        try:
+            future = self._executor.submit(self._execute, submitted_at, fn, *args)
+        except RuntimeError:
+            self._release()
+            raise
+        # Released on completion or cancellation, so a disconnected client never leaks a queue slot.
+        future.add_done_callback(lambda _future: self._release())
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _execute(self, submitted_at: float, fn: Callable[..., T], *args: object) -> T:
+        started_at = self._clock()
+        with self._lock:
+            self._in_flight += 1
+            self._wait_seconds_total += started_at - submitted_at
+        try:
+            return fn(*args)
+        finally:
+            finished_at = self._clock()
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._run_seconds_total += finished_at - started_at
+
+    def stats(self) -> PasswordHashingStats:
+        with self._lock:
+            return PasswordHashingStats(
+                workers=self._workers,
+                max_queue=self._max_queue,
+                in_flight=self._in_flight,
+                queued=self._pending - self._in_flight,
+                completed=self._completed,
+                rejected=self._rejected,
+                wait_seconds_total=self._wait_seconds_total,
+                run_seconds_total=self._run_seconds_total,
+            )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_POOL_LOCK = threading.Lock()
+_POOL: PasswordHashingPool | None = None
+
+PASSWORD_HASH_STATS = gauge(
+    "mw_password_hash_pool",
+    "Password hashing pool state (workers, in_flight, queued, completed, rejected).",
+    ("field",),
+)
+
+
+def get_password_hashing_pool() -> PasswordHashingPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = PasswordHashingPool(
+                workers=settings.password_hash_workers,
+                max_queue=settings.password_hash_max_queue,
+            )
+            logger.info(
+                "Password hashing pool started workers=%s max_queue=%s",
+                settings.password_hash_workers,
+                settings.password_hash_max_queue,
+            )
+        return _POOL
+
+
+def shutdown_password_hashing_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def password_hashing_stats() -> PasswordHashingStats | None:
+    with _POOL_LOCK:
+        pool = _POOL
+    return pool.stats() if pool is not None else None
+
+
+async def hash_password_async(password: str) -> str:
+    return await get_password_hashing_pool().run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    # new_hash is set when the stored hash was created with outdated argon2 costs.
+    return await get_password_hashing_pool().run(verify_and_update_password, plain_password, hashed_password)
+
+
+def _collect_password_hashing_metrics() -> None:
+    stats = password_hashing_stats()
+    if stats is None:
+        return
+    for field_name in ("workers", "in_flight", "queued", "completed", "rejected"):
+        PASSWORD_HASH_STATS.set(getattr(stats, field_name), field=field_name)
+
+
+REGISTRY.register_collector(_collect_password_hashing_metrics)
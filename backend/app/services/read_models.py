@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, NamedTuple, TypeVar
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from app.models.box import Box
+from app.models.item import Item
+
+# Read endpoints select only the columns they serialize into these tuples. Column-only selects
+# skip ORM hydration, attribute instrumentation and the session identity map.
+
+
+class BoxNode(NamedTuple):
+    id: str
+    parent_box_id: str | None
+    name: str
+    is_inbound: bool
+
+
+class BoxRow(NamedTuple):
+    id: str
+    warehouse_id: str
+    parent_box_id: str | None
+    name: str
+    description: str | None
+    physical_location: str | None
+    short_code: str
+    qr_token: str
+    is_inbound: bool
+    version: int
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: datetime | None
+
+
+class ItemRow(NamedTuple):
+    id: str
+    warehouse_id: str
+    box_id: str
+    name: str
+    description: str | None
+    photo_url: str | None
+    physical_location: str | None
+    tags: list[str] | None
+    aliases: list[str] | None
+    version: int
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: datetime | None
+
+
+RowT = TypeVar("RowT", bound=tuple)
+
+
+def select_columns(model: Any, read_model: type[tuple]) -> Select:
+    return select(*(getattr(model, name) for name in read_model._fields))
+
+
+def fetch_rows(db: Session, read_model: type[RowT], query: Select) -> list[RowT]:
+    return [read_model._make(row) for row in db.execute(query)]
+
+
+def box_nodes_query(warehouse_id: str, *, include_deleted: bool = False) -> Select:
+    query = select_columns(Box, BoxNode).where(Box.warehouse_id == warehouse_id)
+    if not include_deleted:
+        query = query.where(Box.deleted_at.is_(None))
+    return query
+
+
+def load_box_nodes(db: Session, warehouse_id: str, *, include_deleted: bool = False) -> dict[str, BoxNode]:
+    query = box_nodes_query(warehouse_id, include_deleted=include_deleted)
+    return {node.id: node for node in fetch_rows(db, BoxNode, query)}
+
+
+def children_by_parent(nodes: dict[str, Any]) -> dict[str | None, list[str]]:
+    children: dict[str | None, list[str]] = {}
+    for node in nodes.values():
+        children.setdefault(node.parent_box_id, []).append(node.id)
+    return children
+
+
+def count_active_items_by_box(db: Session, warehouse_id: str) -> dict[str, int]:
+    rows = db.execute(
+        select(Item.box_id, func.count())
+        .where(Item.warehouse_id == warehouse_id, Item.deleted_at.is_(None))
+        .group_by(Item.box_id)
+    )
+    return {box_id: int(count) for box_id, count in rows}
+
+
+def load_active_item_tags(db: Session, warehouse_id: str) -> list[list[str]]:
+    return [
+        tags
+        for tags in db.scalars(select(Item.tags).where(Item.warehouse_id == warehouse_id, Item.deleted_at.is_(None)))
+        if tags
+    ]
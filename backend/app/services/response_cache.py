@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+import importlib.util
+import logging
+import threading
+import time
+from typing import Protocol
+
+from fastapi import Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.json_response import FastJSONResponse
+from app.core.memory_cache import MemoryCache
+from app.core.metrics import REGISTRY, counter, gauge
+from app.services.conditional_get import WarehouseVersion
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_BACKEND_MEMORY = "memory"
+RESPONSE_CACHE_BACKEND_REDIS = "redis"
+
+RESPONSE_CACHE_LOOKUPS = counter(
+    "mw_response_cache_lookups_total",
+    "Response cache lookups by endpoint and result (hit, shared_hit, miss).",
+    ("endpoint", "result"),
+)
+RESPONSE_CACHE_EVICTIONS = counter("mw_response_cache_evictions_total", "Process response cache LRU evictions.")
+RESPONSE_CACHE_BYTES = gauge("mw_response_cache_bytes", "Bytes held by the process response cache.")
+RESPONSE_CACHE_ENTRIES = gauge("mw_response_cache_entries", "Entries held by the process response cache.")
+
+CacheVariant = tuple[str, str, str]
+
+
+class SharedResponseCache(Protocol):
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None: ...
+
+
+class MemoryResponseCache:
+    # One entry per (warehouse, endpoint, variant): a newer seq replaces the old body instead of piling up.
+    def __init__(self, *, max_entries: int, max_bytes: int, max_entry_bytes: int) -> None:
+        self._max_entry_bytes = max(0, min(max_entry_bytes, max_bytes))
+        self._entries: MemoryCache[CacheVariant, tuple[int, bytes]] = MemoryCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            on_evict=RESPONSE_CACHE_EVICTIONS.inc,
+        )
+
+    def get(self, variant: CacheVariant, last_seq: int) -> bytes | None:
+        entry = self._entries.get(variant)
+        if entry is None or entry[0] != last_seq:
+            return None
+        return entry[1]
+
+    def set(self, variant: CacheVariant, last_seq: int, body: bytes) -> bool:
+        if len(body) > self._max_entry_bytes:
+            return False
+        return self._entries.set(
+            variant,
+            (last_seq, body),
+            size=len(body),
+            # A lagging replica may render an older seq; never let it replace a newer body.
+            replace_if=lambda previous: previous[0] <= last_seq,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> tuple[int, int]:
+        return self._entries.stats()
+
+
+class LocalSharedResponseCache:
+    # In-process stand-in for the shared backend, for tests and single-node setups.
+    def __init__(self, *, max_entries: int = 10_000, clock: Callable[[], float] = time.monotonic) -> None:
+        self._values: MemoryCache[str, bytes] = MemoryCache(max_entries=max_entries, clock=clock)
+
+    def get(self, key: str) -> bytes | None:
+        return self._values.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._values.set(key, value, ttl_seconds=ttl_seconds)
+
+
+class RedisResponseCache:
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._client.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+
+
+_CACHE_LOCK = threading.Lock()
+_LOCAL: MemoryResponseCache | None = None
+_SHARED: SharedResponseCache | None = None
+_SHARED_CONFIGURED = False
+
+
+def _local_cache() -> MemoryResponseCache:
+    global _LOCAL
+    with _CACHE_LOCK:
+        if _LOCAL is None:
+            _LOCAL = MemoryResponseCache(
+                max_entries=settings.response_cache_max_entries,
+                max_bytes=settings.response_cache_max_bytes,
+                max_entry_bytes=settings.response_cache_max_entry_bytes,
+            )
+        return _LOCAL
+
+
+def _shared_cache() -> SharedResponseCache | None:
+    global _SHARED, _SHARED_CONFIGURED
+    with _CACHE_LOCK:
+        if _SHARED_CONFIGURED:
+            return _SHARED
+        _SHARED_CONFIGURED = True
+        backend = settings.response_cache_backend.strip().lower()
+        if backend == RESPONSE_CACHE_BACKEND_REDIS:
+            if importlib.util.find_spec("redis") is None or not settings.response_cache_redis_url:
+                logger.warning(
+                    "Response cache backend=redis unavailable (needs the redis package and RESPONSE_CACHE_REDIS_URL); "
+                    "using the process cache only"
+                )
+            else:
+                _SHARED = RedisResponseCache(settings.response_cache_redis_url)
+        logger.info("Response cache initialized backend=%s shared=%s", backend, _SHARED is not None)
+        return _SHARED
+
+
+def set_shared_response_cache(backend: SharedResponseCache | None) -> None:
+    global _SHARED, _SHARED_CONFIGURED
+    with _CACHE_LOCK:
+        _SHARED = backend
+        _SHARED_CONFIGURED = True
+
+
+def reset_response_cache() -> None:
+    global _LOCAL, _SHARED, _SHARED_CONFIGURED
+    with _CACHE_LOCK:
+        _LOCAL = None
+        _SHARED = None
+        _SHARED_CONFIGURED = False
+
+
+def _shared_key(endpoint: str, version: WarehouseVersion) -> str:
+    return f"mw:response:{version.warehouse_id}:{endpoint}:{version.variant}:{version.last_seq}"
+
+
+def _local_body(endpoint: str, version: WarehouseVersion) -> bytes | None:
+    body = _local_cache().get((version.warehouse_id, endpoint, version.variant), version.last_seq)
+    if body is not None:
+        RESPONSE_CACHE_LOOKUPS.inc(endpoint=endpoint, result="hit")
+    return body
+
+
+def _shared_body(endpoint: str, version: WarehouseVersion) -> bytes | None:
+    shared = _shared_cache()
+    body = None
+    if shared is not None:
+        try:
+            body = shared.get(_shared_key(endpoint, version))
+        except Exception:
+            logger.warning("Shared response cache read failed endpoint=%s", endpoint, exc_info=True)
+            body = None
+    if body is not None:
+        _local_cache().set((version.warehouse_id, endpoint, version.variant), version.last_seq, body)
+        RESPONSE_CACHE_LOOKUPS.inc(endpoint=endpoint, result="shared_hit")
+        return body
+    RESPONSE_CACHE_LOOKUPS.inc(endpoint=endpoint, result="miss")
+    return None
+
+
+def get_cached_body(endpoint: str, version: WarehouseVersion) -> bytes | None:
+    if not settings.response_cache_enabled:
+        return None
+    body = _local_body(endpoint, version)
+    return body if body is not None else _shared_body(endpoint, version)
+
+
+async def get_cached_body_async(endpoint: str, version: WarehouseVersion) -> bytes | None:
+    # Process-cache hits stay on the event loop; the shared backend may block on a socket, so it
+    # runs in the threadpool like any other sync I/O.
+    if not settings.response_cache_enabled:
+        return None
+    body = _local_body(endpoint, version)
+    if body is not None:
+        return body
+    if _shared_cache() is None:
+        RESPONSE_CACHE_LOOKUPS.inc(endpoint=endpoint, result="miss")
+        return None
+    return await run_in_threadpool(_shared_body, endpoint, version)
+
+
+def _store_local(endpoint: str, version: WarehouseVersion, body: bytes) -> bool:
+    if not settings.response_cache_enabled:
+        return False
+    stored = _local_cache().set((version.warehouse_id, endpoint, version.variant), version.last_seq, body)
+    if not stored:
+        logger.debug(
+            "Response not cached endpoint=%s warehouse_id=%s bytes=%s",
+            endpoint,
+            version.warehouse_id,
+            len(body),
+        )
+    return stored
+
+
+def _store_shared(endpoint: str, version: WarehouseVersion, body: bytes) -> None:
+    shared = _shared_cache()
+    if shared is None:
+        return
+    try:
+        shared.set(_shared_key(endpoint, version), body, settings.response_cache_shared_ttl_seconds)
+    except Exception:
+        logger.warning("Shared response cache write failed endpoint=%s", endpoint, exc_info=True)
+
+
+def store_body(endpoint: str, version: WarehouseVersion, body: bytes) -> None:
+    if _store_local(endpoint, version, body):
+        _store_shared(endpoint, version, body)
+
+
+async def store_body_async(endpoint: str, version: WarehouseVersion, body: bytes) -> None:
+    if _store_local(endpoint, version, body) and _shared_cache() is not None:
+        await run_in_threadpool(_store_shared, endpoint, version, body)
+
+
+def cached_json_response(body: bytes, version: WarehouseVersion) -> Response:
+    # Returning a Response skips FastAPI's response_model validation, so hits never touch Pydantic.
+    return FastJSONResponse(content=body, headers=version.headers)
+
+
+def render_cached_json(endpoint: str, version: WarehouseVersion, render: Callable[[], bytes]) -> Response:
+    body = get_cached_body(endpoint, version)
+    if body is None:
+        body = render()
+        store_body(endpoint, version, body)
+    return cached_json_response(body, version)
+
+
+def _collect_response_cache_metrics() -> None:
+    entries, size = _local_cache().stats()
+    RESPONSE_CACHE_ENTRIES.set(entries)
+    RESPONSE_CACHE_BYTES.set(size)
+
+
+REGISTRY.register_collector(_collect_response_cache_metrics)
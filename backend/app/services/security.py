@@ -1,13 +1,25 @@
+from datetime import datetime, timedelta, timezone
 import hashlib
 import secrets
-from datetime import datetime, timedelta, timezone
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+def build_password_context() -> CryptContext:
+    # Hashes created with other argon2 costs report needs_update, so logins rehash them.
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=settings.argon2_time_cost,
+        argon2__memory_cost=settings.argon2_memory_cost_kib,
+        argon2__parallelism=settings.argon2_parallelism,
+    )
+
+
+pwd_context = build_password_context()
 
 
 def hash_password(password: str) -> str:
@@ -18,6 +30,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def build_access_token(user_id: str, remember_me: bool = False) -> str:
     now = datetime.now(timezone.utc)
     payload = {"sub": user_id, "type": "access", "iat": int(now.timestamp())}
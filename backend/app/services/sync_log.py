@@ -1,3 +1,4 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.models.change_log import ChangeLog
@@ -23,3 +24,10 @@ def append_change_log(
     )
     db.add(entry)
     return entry
+
+
+def latest_change_seq(db: Session, warehouse_id: str) -> int:
+    return int(
+        db.scalar(select(func.coalesce(func.max(ChangeLog.seq), 0)).where(ChangeLog.warehouse_id == warehouse_id))
+        or 0
+    )
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+import logging
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.refresh_token import RefreshToken
+from app.utils.datetime import ensure_utc, utcnow
+
+logger = logging.getLogger(__name__)
+
+# Persistent remember_me access tokens carry no exp (see A-024) and are stored with this expiry, so
+# their revocations are kept for the life of the process. The set therefore grows only with revoked
+# persistent logins (one per device per logout or password change); every other hash is pruned once
+# its token has expired.
+_NEVER_EXPIRES = datetime.max.replace(tzinfo=UTC)
+
+
+class TokenRevocationSet:
+    def __init__(
+        self,
+        *,
+        refresh_interval_seconds: float,
+        overlap_seconds: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._refresh_interval_seconds = max(0.0, refresh_interval_seconds)
+        self._overlap = timedelta(seconds=max(0.0, overlap_seconds))
+        self._session_factory = session_factory
+        self._clock = clock
+        self._state_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._revoked: dict[str, datetime] = {}
+        self._watermark: datetime | None = None
+        self._refreshed_at: float | None = None
+
+    @property
+    def size(self) -> int:
+        with self._state_lock:
+            return len(self._revoked)
+
+    def is_revoked(self, token_hash: str) -> bool:
+        self._refresh_if_stale()
+        with self._state_lock:
+            return token_hash in self._revoked
+
+    def mark_revoked(self, token_hashes: Iterable[str]) -> None:
+        # The real expiry arrives with the next refresh, which re-reads these rows by updated_at.
+        with self._state_lock:
+            for token_hash in token_hashes:
+                self._revoked.setdefault(token_hash, _NEVER_EXPIRES)
+
+    def refresh(self) -> int:
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def reset(self) -> None:
+        with self._refresh_lock, self._state_lock:
+            self._revoked.clear()
+            self._watermark = None
+            self._refreshed_at = None
+
+    def _refresh_if_stale(self) -> None:
+        with self._state_lock:
+            refreshed_at = self._refreshed_at
+        if refreshed_at is not None and self._clock() - refreshed_at < self._refresh_interval_seconds:
+            return
+        if refreshed_at is None:
+            # Nothing loaded yet: every caller must wait for the initial snapshot.
+            self.refresh()
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            # Another request is already refreshing; the current snapshot is at most one interval old.
+            return
+        try:
+            self._refresh_locked()
+        except Exception:
+            logger.exception("Token revocation refresh failed; keeping previous snapshot")
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_locked(self) -> int:
+        with self._state_lock:
+            watermark = self._watermark
+        now = utcnow()
+        query = select(RefreshToken.token_hash, RefreshToken.expires_at, RefreshToken.updated_at).where(
+            RefreshToken.revoked.is_(True),
+            RefreshToken.expires_at > now,
+        )
+        if watermark is not None:
+            # updated_at comes from the database clock at transaction start, so re-read an overlap
+            # window to catch revocations committed by transactions that began before the watermark.
+            query = query.where(RefreshToken.updated_at >= watermark - self._overlap)
+        with self._session_factory() as db:
+            rows = db.execute(query).all()
+
+        with self._state_lock:
+            for token_hash, expires_at, updated_at in rows:
+                self._revoked[token_hash] = ensure_utc(expires_at)
+                if updated_at is not None and (self._watermark is None or ensure_utc(updated_at) > self._watermark):
+                    self._watermark = ensure_utc(updated_at)
+            # An expired token is rejected on its own exp, so its revocation no longer needs keeping.
+            expired = [token_hash for token_hash, expires_at in self._revoked.items() if expires_at <= now]
+            for token_hash in expired:
+                del self._revoked[token_hash]
+            self._refreshed_at = self._clock()
+            size = len(self._revoked)
+        logger.debug(
+            "Token revocations refreshed incremental=%s fetched=%s pruned=%s revoked_total=%s",
+            watermark is not None,
+            len(rows),
+            len(expired),
+            size,
+        )
+        return len(rows)
+
+
+_REVOCATIONS = TokenRevocationSet(
+    refresh_interval_seconds=settings.token_revocation_refresh_seconds,
+    overlap_seconds=settings.token_revocation_overlap_seconds,
+)
+
+
+def is_token_revoked(token_hash: str) -> bool:
+    return _REVOCATIONS.is_revoked(token_hash)
+
+
+def mark_tokens_revoked(token_hashes: Iterable[str]) -> None:
+    _REVOCATIONS.mark_revoked(token_hashes)
+
+
+def refresh_token_revocations() -> int:
+    return _REVOCATIONS.refresh()
+
+
+def reset_token_revocations() -> None:
+    _REVOCATIONS.reset()
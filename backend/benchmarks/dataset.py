@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+from base64 import b64decode
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+import logging
+from pathlib import Path
+import random
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.models.box import Box
+from app.models.change_log import ChangeLog
+from app.models.intake_batch import IntakeBatch
+from app.models.intake_draft import IntakeDraft
+from app.models.item import Item
+from app.models.membership import Membership
+from app.models.stock_movement import StockMovement
+from app.models.user import User
+from app.models.warehouse import Warehouse
+from app.services.box_codes import format_short_code
+from app.services.security import hash_password
+from app.services.stock import initial_stock_command_id
+
+logger = logging.getLogger(__name__)
+
+BENCH_PASSWORD = "benchmark-password"
+INSERT_CHUNK_SIZE = 5000
+# 1x1 PNG, enough for the intake commit path which only moves files around.
+PLACEHOLDER_PNG = b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+_NOUNS = (
+    "cable", "battery", "drill", "screw", "hammer", "lamp", "charger", "tape", "glue", "brush",
+    "wrench", "sensor", "router", "adapter", "filter", "valve", "hinge", "bolt", "nail", "switch",
+    "fuse", "socket", "plug", "bulb", "pump", "hose", "clamp", "saw", "blade", "level",
+)
+_ADJECTIVES = (
+    "red", "blue", "small", "large", "spare", "old", "new", "usb", "metal", "plastic",
+    "steel", "copper", "long", "short", "heavy", "light", "outdoor", "indoor", "quick", "mini",
+)
+_LOCATIONS = ("garage", "attic", "basement", "office", "kitchen", "shed", "hallway", "workshop")
+
+
+@dataclass(frozen=True)
+class DatasetScale:
+    boxes: int
+    box_depth: int
+    items: int
+    stock_movements: int
+    tags: int = 200
+    seed: int = 20261019
+
+
+SCALES: dict[str, DatasetScale] = {
+    "smoke": DatasetScale(boxes=40, box_depth=5, items=300, stock_movements=900, tags=30),
+    "medium": DatasetScale(boxes=1000, box_depth=8, items=20_000, stock_movements=200_000),
+    "large": DatasetScale(boxes=10_000, box_depth=12, items=200_000, stock_movements=2_000_000),
+}
+
+
+@dataclass
+class Dataset:
+    scale: DatasetScale
+    user_id: str
+    email: str
+    password: str
+    warehouse_id: str
+    inbound_box_id: str
+    box_ids: list[str] = field(default_factory=list)
+    box_parents: dict[str, str | None] = field(default_factory=dict)
+    deepest_root_id: str = ""
+    item_ids: list[str] = field(default_factory=list)
+    tag_names: list[str] = field(default_factory=list)
+    search_terms: list[str] = field(default_factory=list)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _chunks(rows: list[dict], size: int = INSERT_CHUNK_SIZE) -> Iterator[list[dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _insert_rows(conn: Connection, model, rows: list[dict]) -> None:
+    for chunk in _chunks(rows):
+        conn.execute(insert(model), chunk)
+
+
+def _box_tree(rng: random.Random, scale: DatasetScale) -> tuple[list[str], dict[str, str | None], str]:
+    # One chain guarantees the requested depth; the rest hang off random shallower boxes.
+    # Parents are always emitted before their children, so inserts never hit a missing parent.
+    box_ids: list[str] = []
+    parents: dict[str, str | None] = {}
+    levels: dict[str, int] = {}
+    depth = max(1, min(scale.box_depth, scale.boxes))
+    parent_id: str | None = None
+    for level in range(depth):
+        box_id = _uuid(rng)
+        box_ids.append(box_id)
+        parents[box_id] = parent_id
+        levels[box_id] = level
+        parent_id = box_id
+
+    for _ in range(scale.boxes - depth):
+        box_id = _uuid(rng)
+        candidate = rng.choice(box_ids)
+        if rng.random() < 0.1 or levels[candidate] >= depth - 1:
+            parents[box_id] = None
+            levels[box_id] = 0
+        else:
+            parents[box_id] = candidate
+            levels[box_id] = levels[candidate] + 1
+        box_ids.append(box_id)
+    return box_ids, parents, box_ids[0]
+
+
+def generate_dataset(conn: Connection, scale: DatasetScale, *, email: str = "bench@example.com") -> Dataset:
+    rng = random.Random(scale.seed)
+    user_id = _uuid(rng)
+    warehouse_id = _uuid(rng)
+    inbound_box_id = _uuid(rng)
+    tag_names = [f"{rng.choice(_ADJECTIVES)}-{rng.choice(_NOUNS)}-{index}" for index in range(scale.tags)]
+
+    conn.execute(
+        insert(User),
+        [{"id": user_id, "email": email, "password_hash": hash_password(BENCH_PASSWORD), "display_name": "Bench"}],
+    )
+    conn.execute(insert(Warehouse), [{"id": warehouse_id, "name": "Benchmark", "created_by": user_id}])
+    conn.execute(insert(Membership), [{"user_id": user_id, "warehouse_id": warehouse_id}])
+
+    box_ids, parents, deepest_root_id = _box_tree(rng, scale)
+    box_rows = [
+        {
+            "id": inbound_box_id,
+            "warehouse_id": warehouse_id,
+            "parent_box_id": None,
+            "name": "Entrada",
+            "qr_token": f"{rng.getrandbits(128):032x}",
+            "short_code": format_short_code(0),
+            "is_inbound": True,
+            "version": 1,
+        }
+    ]
+    change_rows: list[dict] = []
+    for index, box_id in enumerate(box_ids, start=1):
+        name = f"{rng.choice(_LOCATIONS)} box {index}"
+        box_rows.append(
+            {
+                "id": box_id,
+                "warehouse_id": warehouse_id,
+                "parent_box_id": parents[box_id],
+                "name": name,
+                "physical_location": rng.choice(_LOCATIONS),
+                "qr_token": f"{rng.getrandbits(128):032x}",
+                "short_code": format_short_code(index),
+                "is_inbound": False,
+                "version": 1,
+            }
+        )
+        change_rows.append(
+            {
+                "warehouse_id": warehouse_id,
+                "entity_type": "box",
+                "entity_id": box_id,
+                "action": "create",
+                "entity_version": 1,
+                "payload_json": {"name": name, "parent_box_id": parents[box_id]},
+            }
+        )
+    _insert_rows(conn, Box, box_rows)
+
+    item_ids: list[str] = []
+    item_rows: list[dict] = []
+    stock_rows: list[dict] = []
+    for index in range(scale.items):
+        item_id = _uuid(rng)
+        item_ids.append(item_id)
+        box_id = rng.choice(box_ids)
+        name = f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)} {index}"
+        item_rows.append(
+            {
+                "id": item_id,
+                "warehouse_id": warehouse_id,
+                "box_id": box_id,
+                "name": name,
+                "description": f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)} for the {rng.choice(_LOCATIONS)}",
+                "tags": rng.sample(tag_names, k=min(len(tag_names), rng.randint(0, 3))),
+                "aliases": [rng.choice(_NOUNS)] if rng.random() < 0.3 else [],
+                "version": 1,
+            }
+        )
+        stock_rows.append(
+            {
+                "id": _uuid(rng),
+                "warehouse_id": warehouse_id,
+                "item_id": item_id,
+                "delta": 1,
+                "command_id": initial_stock_command_id(item_id),
+                "note": "Initial stock on item creation",
+            }
+        )
+        change_rows.append(
+            {
+                "warehouse_id": warehouse_id,
+                "entity_type": "item",
+                "entity_id": item_id,
+                "action": "create",
+                "entity_version": 1,
+                "payload_json": {"name": name, "box_id": box_id},
+            }
+        )
+    _insert_rows(conn, Item, item_rows)
+
+    for index in range(max(0, scale.stock_movements - len(item_ids))):
+        item_id = rng.choice(item_ids)
+        stock_rows.append(
+            {
+                "id": _uuid(rng),
+                "warehouse_id": warehouse_id,
+                "item_id": item_id,
+                "delta": rng.choice((1, 1, 2, -1)),
+                "command_id": f"bench-{index}",
+                "note": None,
+            }
+        )
+        if len(stock_rows) >= INSERT_CHUNK_SIZE * 4:
+            _insert_rows(conn, StockMovement, stock_rows)
+            stock_rows = []
+    _insert_rows(conn, StockMovement, stock_rows)
+    _insert_rows(conn, ChangeLog, change_rows)
+
+    logger.info(
+        "Benchmark dataset generated warehouse_id=%s boxes=%s depth=%s items=%s stock_movements=%s",
+        warehouse_id,
+        len(box_ids),
+        scale.box_depth,
+        len(item_ids),
+        max(scale.stock_movements, len(item_ids)),
+    )
+    return Dataset(
+        scale=scale,
+        user_id=user_id,
+        email=email,
+        password=BENCH_PASSWORD,
+        warehouse_id=warehouse_id,
+        inbound_box_id=inbound_box_id,
+        box_ids=box_ids,
+        box_parents=parents,
+        deepest_root_id=deepest_root_id,
+        item_ids=item_ids,
+        tag_names=tag_names,
+        search_terms=list(_NOUNS[:5]),
+    )
+
+
+def seed_intake_batch(
+    conn: Connection,
+    dataset: Dataset,
+    *,
+    drafts: int,
+    rng: random.Random,
+    draft_status: str = "ready",
+) -> str:
+    # "ready" drafts can be committed straight away; "uploaded" drafts wait for LLM processing.
+    batch_id = _uuid(rng)
+    target_box_id = rng.choice(dataset.box_ids)
+    counter_column = f"{draft_status}_count"
+    conn.execute(
+        insert(IntakeBatch),
+        [
+            {
+                "id": batch_id,
+                "warehouse_id": dataset.warehouse_id,
+                "target_box_id": target_box_id,
+                "created_by": dataset.user_id,
+                "name": "Benchmark batch",
+                "status": "review" if draft_status == "ready" else "drafting",
+                "total_count": drafts,
+                counter_column: drafts,
+            }
+        ],
+    )
+    batch_dir = Path(settings.media_root) / dataset.warehouse_id / "intake" / batch_id
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    media_prefix = settings.media_url_path.rstrip("/")
+    draft_rows = []
+    for position in range(drafts):
+        filename = f"{position:05d}.png"
+        (batch_dir / filename).write_bytes(PLACEHOLDER_PNG)
+        draft_rows.append(
+            {
+                "id": _uuid(rng),
+                "warehouse_id": dataset.warehouse_id,
+                "batch_id": batch_id,
+                "photo_url": f"{media_prefix}/{dataset.warehouse_id}/intake/{batch_id}/{filename}",
+                "status": draft_status,
+                "position": position,
+                "name": f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)}" if draft_status == "ready" else None,
+                "tags": [rng.choice(dataset.tag_names)] if dataset.tag_names and draft_status == "ready" else [],
+                "quantity": rng.randint(1, 3),
+            }
+        )
+    _insert_rows(conn, IntakeDraft, draft_rows)
+    return batch_id
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_GENERATE_CONTENT_PATH = re.compile(r"^/v1beta/models/(?P<model>[^/:]+):generateContent$")
+# The real API only serves some models under their -preview alias, which exercises the alias fallback.
+DEFAULT_MISSING_MODELS = ("gemini-3.1-flash-lite", "gemini-3-flash")
+
+_NAMES = ("usb cable", "drill", "battery pack", "screwdriver set", "led lamp", "tape measure", "glue gun")
+_TAGS = ("tools", "electric", "cable", "hardware", "storage", "garage", "office", "spare", "metal", "plastic")
+
+
+@dataclass(frozen=True)
+class FakeGeminiProfile:
+    latency_ms: float = 400.0
+    # Log-normal spread around latency_ms; 0 keeps every response at exactly latency_ms.
+    latency_sigma: float = 0.5
+    missing_models: tuple[str, ...] = DEFAULT_MISSING_MODELS
+    rate_limit_rpm: int = 0
+    retry_after_seconds: float = 1.0
+    throttle_rate: float = 0.0
+    server_error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang_seconds: float = 15.0
+    malformed_rate: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class FakeGeminiStats:
+    outcomes: Counter[str] = field(default_factory=Counter)
+    models: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        return sum(self.outcomes.values())
+
+
+class _RequestBucket:
+    def __init__(self, requests_per_minute: int) -> None:
+        self._rate = requests_per_minute / 60.0
+        self._capacity = max(1.0, self._rate)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        if self._rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, profile: FakeGeminiProfile, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__((host, port), _FakeGeminiHandler)
+        self.stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stats = FakeGeminiStats()
+        self.configure(profile)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def configure(self, profile: FakeGeminiProfile) -> None:
+        with self._lock:
+            self.profile = profile
+            self._rng = random.Random(profile.seed)
+            self._bucket = _RequestBucket(profile.rate_limit_rpm)
+
+    def reset_stats(self) -> FakeGeminiStats:
+        with self._lock:
+            stats, self._stats = self._stats, FakeGeminiStats()
+        return stats
+
+    def record(self, model: str, outcome: str) -> None:
+        with self._lock:
+            self._stats.outcomes[outcome] += 1
+            self._stats.models[model] += 1
+
+    def draw(self) -> tuple[float, float]:
+        with self._lock:
+            return self._rng.random(), self._rng.gauss(0.0, 1.0)
+
+    def choose(self, values: tuple[str, ...], count: int) -> list[str]:
+        with self._lock:
+            return self._rng.sample(values, k=min(count, len(values)))
+
+    def acquire_rate_limit(self) -> bool:
+        return self._bucket.try_acquire()
+
+    def start(self) -> FakeGeminiServer:
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-gemini", daemon=True)
+        self._thread.start()
+        logger.info("Fake Gemini server listening url=%s profile=%s", self.url, self.profile)
+        return self
+
+    def stop(self) -> None:
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> FakeGeminiServer:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+
+class _FakeGeminiHandler(BaseHTTPRequestHandler):
+    server: FakeGeminiServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.debug("fake-gemini " + format, *args)
+
+    def do_POST(self) -> None:
+        match = _GENERATE_CONTENT_PATH.match(self.path.split("?", 1)[0])
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        if match is None:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+        model = match.group("model")
+        if not self.headers.get("x-goog-api-key"):
+            self.server.record(model, "unauthenticated")
+            self._send_json(403, {"error": {"code": 403, "message": "API key missing", "status": "PERMISSION_DENIED"}})
+            return
+
+        profile = self.server.profile
+        if model in profile.missing_models:
+            self.server.record(model, "not_found")
+            self._send_json(404, {"error": {"code": 404, "message": f"models/{model} is not found", "status": "NOT_FOUND"}})
+            return
+        if not self.server.acquire_rate_limit():
+            self.server.record(model, "rate_limited")
+            self._send_throttled(429)
+            return
+
+        roll, spread = self.server.draw()
+        latency = profile.latency_ms / 1000 * math.exp(profile.latency_sigma * spread)
+        if roll < profile.throttle_rate:
+            self.server.record(model, "throttled")
+            self._send_throttled(429)
+            return
+        roll -= profile.throttle_rate
+        if roll < profile.server_error_rate:
+            self.server.record(model, "server_error")
+            self._send_throttled(503)
+            return
+        roll -= profile.server_error_rate
+        if roll < profile.timeout_rate:
+            self.server.record(model, "timeout")
+            self.server.stopping.wait(profile.hang_seconds)
+            self.close_connection = True
+            return
+        roll -= profile.timeout_rate
+
+        self.server.stopping.wait(latency)
+        if roll < profile.malformed_rate:
+            self.server.record(model, "malformed")
+            self._send_json(200, _candidate_response("{\"name\": \"truncated"))
+            return
+        self.server.record(model, "success")
+        self._send_json(200, _candidate_response(json.dumps(self._draft_payload(raw_body))))
+
+    def _draft_payload(self, raw_body: bytes) -> dict[str, object]:
+        try:
+            parts = json.loads(raw_body or b"{}")["contents"][0]["parts"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            parts = []
+        tags = self.server.choose(_TAGS, 4)
+        if any("inline_data" in part for part in parts):
+            name = self.server.choose(_NAMES, 1)[0]
+            return {
+                "name": name,
+                "description": f"{name} stored in the warehouse",
+                "tags": tags,
+                "aliases": [name.split()[0]],
+                "confidence": 0.9,
+                "warnings": [],
+            }
+        return {"tags": tags, "aliases": tags[:1]}
+
+    def _send_throttled(self, status_code: int) -> None:
+        retry_after = self.server.profile.retry_after_seconds
+        body = {"error": {"code": status_code, "message": "Resource exhausted", "status": "RESOURCE_EXHAUSTED"}}
+        self._send_json(status_code, body, headers={"Retry-After": f"{retry_after:g}"})
+
+    def _send_json(self, status_code: int, payload: dict[str, object], headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _candidate_response(text: str) -> dict[str, object]:
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}]}
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = FakeGeminiProfile()
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Median response latency.")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma, help="Log-normal spread.")
+    parser.add_argument(
+        "--missing-models",
+        default=",".join(defaults.missing_models),
+        help="Comma-separated runtime model names answered with 404.",
+    )
+    parser.add_argument("--rate-limit-rpm", type=int, default=defaults.rate_limit_rpm, help="0 disables.")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after_seconds)
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate, help="Random 429 share.")
+    parser.add_argument("--server-error-rate", type=float, default=defaults.server_error_rate, help="Random 503 share.")
+    parser.add_argument("--timeout-rate", type=float, default=defaults.timeout_rate, help="Share of hung requests.")
+    parser.add_argument("--hang-seconds", type=float, default=defaults.hang_seconds)
+    parser.add_argument("--malformed-rate", type=float, default=defaults.malformed_rate, help="Share of broken JSON.")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def profile_from_args(args: argparse.Namespace) -> FakeGeminiProfile:
+    return replace(
+        FakeGeminiProfile(),
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        missing_models=tuple(model.strip() for model in args.missing_models.split(",") if model.strip()),
+        rate_limit_rpm=args.rate_limit_rpm,
+        retry_after_seconds=args.retry_after,
+        throttle_rate=args.throttle_rate,
+        server_error_rate=args.server_error_rate,
+        timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Gemini generateContent API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    server = FakeGeminiServer(profile_from_args(args), host=args.host, port=args.port)
+    print(f"Fake Gemini listening on {server.url}; start the API with GEMINI_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from benchmarks.fake_gemini import FakeGeminiServer, add_profile_arguments, profile_from_args
+
+if TYPE_CHECKING:
+    from benchmarks.dataset import Dataset
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_DATA_DIR = BENCH_DIR / ".data"
+_WORKER_SCALE_KWARGS = {"boxes": 3, "box_depth": 2, "items": 0, "stock_movements": 0, "tags": 5}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int
+    base_seconds: float
+    max_seconds: float
+
+    @property
+    def label(self) -> str:
+        return f"{self.max_retries}x{self.base_seconds:g}s"
+
+
+@dataclass
+class IntakeRunResult:
+    workers: int
+    retry_policy: str
+    drafts: int
+    elapsed_seconds: float
+    drafts_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    error_rate: float
+    gemini_requests: int
+    gemini_outcomes: dict[str, int]
+
+
+def parse_retry_policies(raw: str) -> list[RetryPolicy]:
+    # "retries:base[:max]" entries separated by commas, e.g. "0:1,2:0.5:4".
+    policies: list[RetryPolicy] = []
+    for entry in raw.split(","):
+        parts = [part.strip() for part in entry.split(":") if part.strip()]
+        if not parts:
+            continue
+        max_retries = int(parts[0])
+        base_seconds = float(parts[1]) if len(parts) > 1 else 1.0
+        max_seconds = float(parts[2]) if len(parts) > 2 else 30.0
+        policies.append(RetryPolicy(max_retries=max_retries, base_seconds=base_seconds, max_seconds=max_seconds))
+    return policies
+
+
+@contextmanager
+def _timed_draft_calls(module, attribute: str, sink: list[float]) -> Iterator[None]:
+    original: Callable[..., object] = getattr(module, attribute)
+    lock = threading.Lock()
+
+    def timed(*args: object, **kwargs: object) -> object:
+        started_at = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            with lock:
+                sink.append(elapsed_ms)
+
+    setattr(module, attribute, timed)
+    try:
+        yield
+    finally:
+        setattr(module, attribute, original)
+
+
+def run_intake_benchmark(
+    server: FakeGeminiServer,
+    *,
+    drafts: int,
+    worker_counts: list[int],
+    retry_policies: list[RetryPolicy],
+    seed: int = 20261019,
+) -> list[IntakeRunResult]:
+    from sqlalchemy import insert
+
+    from app.core.config import settings
+    from app.db.session import engine
+    from app.models.llm_setting import LLMSetting
+    from app.services.llm_rate_limit import reset_llm_rate_limiter
+    from app.services.secret_store import encrypt_secret
+    from benchmarks.dataset import DatasetScale, generate_dataset
+
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        dataset = generate_dataset(
+            conn,
+            DatasetScale(**_WORKER_SCALE_KWARGS, seed=seed),
+            email=f"intake-bench-{rng.getrandbits(32):08x}@example.com",
+        )
+        conn.execute(
+            insert(LLMSetting),
+            [
+                {
+                    "warehouse_id": dataset.warehouse_id,
+                    "api_key_encrypted": encrypt_secret("fake-gemini-key"),
+                    "updated_by": dataset.user_id,
+                }
+            ],
+        )
+
+    original_policy = (settings.llm_max_retries, settings.llm_retry_base_seconds, settings.llm_retry_max_seconds)
+    results: list[IntakeRunResult] = []
+    try:
+        for policy in retry_policies:
+            for workers in worker_counts:
+                settings.llm_max_retries = policy.max_retries
+                settings.llm_retry_base_seconds = policy.base_seconds
+                settings.llm_retry_max_seconds = policy.max_seconds
+                results.append(_run_once(server, dataset, drafts=drafts, workers=workers, policy=policy, rng=rng))
+    finally:
+        settings.llm_max_retries, settings.llm_retry_base_seconds, settings.llm_retry_max_seconds = original_policy
+        reset_llm_rate_limiter()
+    return results
+
+
+def _run_once(
+    server: FakeGeminiServer,
+    dataset: Dataset,
+    *,
+    drafts: int,
+    workers: int,
+    policy: RetryPolicy,
+    rng: random.Random,
+) -> IntakeRunResult:
+    from sqlalchemy import func, select
+
+    from app.db.session import engine
+    from app.models.intake_draft import IntakeDraft
+    from app.services import intake_processing
+    from app.services.llm_rate_limit import reset_llm_rate_limiter
+    from benchmarks.dataset import seed_intake_batch
+    from benchmarks.suite import percentile
+
+    reset_llm_rate_limiter()
+    server.reset_stats()
+    with engine.begin() as conn:
+        batch_id = seed_intake_batch(conn, dataset, drafts=drafts, rng=rng, draft_status="uploaded")
+
+    latencies_ms: list[float] = []
+    with _timed_draft_calls(intake_processing, "_process_photo_url", latencies_ms):
+        started_at = time.perf_counter()
+        intake_processing.process_intake_batch(dataset.warehouse_id, batch_id, max_parallel_workers=workers)
+        elapsed = time.perf_counter() - started_at
+
+    with engine.connect() as conn:
+        errors = conn.scalar(
+            select(func.count())
+            .select_from(IntakeDraft)
+            .where(IntakeDraft.batch_id == batch_id, IntakeDraft.status == "error")
+        )
+    stats = server.reset_stats()
+    return IntakeRunResult(
+        workers=workers,
+        retry_policy=policy.label,
+        drafts=drafts,
+        elapsed_seconds=round(elapsed, 3),
+        drafts_per_second=round(drafts / elapsed, 2) if elapsed > 0 else 0.0,
+        p50_ms=round(percentile(latencies_ms, 0.50), 1),
+        p95_ms=round(percentile(latencies_ms, 0.95), 1),
+        p99_ms=round(percentile(latencies_ms, 0.99), 1),
+        error_rate=round((errors or 0) / drafts, 3) if drafts else 0.0,
+        gemini_requests=stats.requests,
+        gemini_outcomes=dict(stats.outcomes),
+    )
+
+
+def format_results(results: list[IntakeRunResult]) -> str:
+    header = (
+        f"{'workers':>8}{'retries':>10}{'drafts/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'errors':>8}{'req/draft':>11}  outcomes"
+    )
+    lines = [header, "-" * (len(header) + 20)]
+    for result in results:
+        per_draft = result.gemini_requests / result.drafts if result.drafts else 0.0
+        outcomes = " ".join(f"{name}={count}" for name, count in sorted(result.gemini_outcomes.items()))
+        lines.append(
+            f"{result.workers:>8}{result.retry_policy:>10}{result.drafts_per_second:>10.2f}{result.p50_ms:>10.1f}"
+            f"{result.p95_ms:>10.1f}{result.p99_ms:>10.1f}{result.error_rate:>8.1%}{per_draft:>11.2f}  {outcomes}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure intake batch throughput against a fake Gemini server.")
+    parser.add_argument("--drafts", type=int, default=40, help="Drafts per batch run.")
+    parser.add_argument("--workers", default="1,4,8", help="Comma-separated worker counts to sweep.")
+    parser.add_argument(
+        "--retry-policies",
+        default="0:1,2:0.5",
+        help="Comma-separated retries:base_seconds[:max_seconds] policies to sweep.",
+    )
+    parser.add_argument("--llm-requests-per-minute", type=int, default=0, help="Client-side limit; 0 disables.")
+    parser.add_argument("--llm-max-concurrency", type=int, default=8)
+    parser.add_argument("--output", type=Path, help="Write the raw results as JSON.")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = FakeGeminiServer(profile_from_args(args)).start()
+    DEFAULT_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    # Settings are read at import time, so the environment must be ready before importing the app.
+    os.environ["DATABASE_URL"] = f"sqlite:///{DEFAULT_DATA_DIR / 'bench-intake.db'}"
+    os.environ["GEMINI_BASE_URL"] = server.url
+    os.environ["MAINTENANCE_ENABLED"] = "false"
+    os.environ["LLM_RATE_LIMIT_BACKEND"] = "memory"
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = str(args.llm_requests_per_minute)
+    os.environ["LLM_MAX_CONCURRENCY"] = str(args.llm_max_concurrency)
+    os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+    os.environ.setdefault("MEDIA_ROOT", tempfile.mkdtemp(prefix="mw-bench-intake-"))
+    logging.basicConfig(level=os.environ["LOG_LEVEL"].upper(), format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    from app.db import base as _db_base  # noqa: F401
+    from app.db.session import engine
+    from app.models.base import Base
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    try:
+        results = run_intake_benchmark(
+            server,
+            drafts=args.drafts,
+            worker_counts=[int(value) for value in args.workers.split(",") if value.strip()],
+            retry_policies=parse_retry_policies(args.retry_policies),
+            seed=args.seed or 20261019,
+        )
+    finally:
+        server.stop()
+
+    print(format_results(results))
+    if args.output:
+        args.output.write_text(json.dumps([asdict(result) for result in results], indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+import random
+import sys
+import tempfile
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINES = BENCH_DIR / "baselines.json"
+DEFAULT_DATA_DIR = BENCH_DIR / ".data"
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the my-warehouse API benchmark suite.")
+    parser.add_argument("--scale", default="smoke", choices=("smoke", "medium", "large"))
+    parser.add_argument("--iterations", type=int, default=30, help="Timed requests per scenario.")
+    parser.add_argument("--heavy-iterations", type=int, default=5, help="Timed requests for export/import/intake.")
+    parser.add_argument("--only", default="", help="Comma-separated scenario names to run.")
+    parser.add_argument("--database-url", default="", help="Defaults to a fresh SQLite file under benchmarks/.data.")
+    parser.add_argument("--baselines", type=Path, default=DEFAULT_BASELINES)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p95 slowdown before failing.")
+    parser.add_argument("--update-baselines", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--output", type=Path, help="Write the raw results as JSON.")
+    return parser.parse_args(argv)
+
+
+def _configure_environment(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so the environment must be ready before importing the app.
+    DEFAULT_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    database_url = args.database_url or f"sqlite:///{DEFAULT_DATA_DIR / f'bench-{args.scale}.db'}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ["MAINTENANCE_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("MEDIA_ROOT", tempfile.mkdtemp(prefix="mw-bench-media-"))
+    # Budget warnings would flood the output at large scales; the suite reports query counts itself.
+    os.environ.setdefault("QUERY_COUNT_WARNING_THRESHOLD", "0")
+    os.environ.setdefault("QUERY_REPEATED_STATEMENT_THRESHOLD", "0")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    _configure_environment(args)
+
+    from fastapi.testclient import TestClient
+
+    from app.db import base as _db_base  # noqa: F401
+    from app.db.session import engine
+    from app.main import app
+    from app.models.base import Base
+    from benchmarks.dataset import SCALES, generate_dataset
+    from benchmarks.suite import BenchContext, find_regressions, format_table, login, run_suite
+
+    logging.getLogger("benchmarks").setLevel(logging.INFO)
+    scale = SCALES[args.scale]
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        dataset = generate_dataset(conn, scale)
+
+    only = {name.strip() for name in args.only.split(",") if name.strip()} or None
+    with TestClient(app) as client:
+        ctx = BenchContext(
+            client=client,
+            engine=engine,
+            dataset=dataset,
+            headers=login(client, dataset),
+            rng=random.Random(scale.seed),
+        )
+        suite = run_suite(
+            ctx,
+            args.scale,
+            iterations=args.iterations,
+            heavy_iterations=args.heavy_iterations,
+            only=only,
+        )
+
+    print(format_table(suite))
+    if args.output:
+        args.output.write_text(json.dumps(suite.as_dict(), indent=2) + "\n")
+
+    baselines = json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+    if args.update_baselines:
+        baselines[args.scale] = suite.as_dict()
+        args.baselines.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline updated for scale={args.scale} in {args.baselines}")
+        return 0
+
+    regressions = find_regressions(suite, baselines, args.threshold)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    if args.scale not in baselines:
+        print(f"\nNo baseline stored for scale={args.scale}; run with --update-baselines to record one.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
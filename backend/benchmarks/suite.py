@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+import logging
+import math
+import random
+import resource
+import sys
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy.engine import Engine
+
+from app.core.query_budget import (
+    RequestQueryReport,
+    add_query_report_listener,
+    remove_query_report_listener,
+)
+from benchmarks.dataset import Dataset, seed_intake_batch
+
+logger = logging.getLogger(__name__)
+
+SYNC_PUSH_COMMANDS = 50
+SYNC_PULL_WINDOW = 500
+INTAKE_COMMIT_DRAFTS = 25
+IMPORT_MAX_BOXES = 200
+IMPORT_MAX_ITEMS = 1000
+# Latency regressions smaller than this are treated as timer noise.
+MIN_REGRESSION_MS = 2.0
+
+
+@dataclass
+class BenchContext:
+    client: TestClient
+    engine: Engine
+    dataset: Dataset
+    headers: dict[str, str]
+    rng: random.Random
+    snapshot: dict | None = None
+
+    @property
+    def base(self) -> str:
+        return f"/api/v1/warehouses/{self.dataset.warehouse_id}"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    call: Callable[[BenchContext, object], Response]
+    prepare: Callable[[BenchContext], object] | None = None
+    heavy: bool = False
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    queries_p50: float
+    queries_max: int
+    peak_rss_mb: float
+    errors: int = 0
+
+
+@dataclass
+class SuiteResult:
+    scale: str
+    results: list[ScenarioResult] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {"scale": self.scale, "scenarios": {result.name: asdict(result) for result in self.results}}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _list_items(ctx: BenchContext, _prepared: object) -> Response:
+    return ctx.client.get(f"{ctx.base}/items", headers=ctx.headers)
+
+
+def _search_items(ctx: BenchContext, _prepared: object) -> Response:
+    term = ctx.rng.choice(ctx.dataset.search_terms)
+    return ctx.client.get(f"{ctx.base}/items", params={"q": term}, headers=ctx.headers)
+
+
+def _filter_items_by_tag(ctx: BenchContext, _prepared: object) -> Response:
+    tag = ctx.rng.choice(ctx.dataset.tag_names)
+    return ctx.client.get(f"{ctx.base}/items", params={"tag": tag}, headers=ctx.headers)
+
+
+def _box_tree(ctx: BenchContext, _prepared: object) -> Response:
+    return ctx.client.get(f"{ctx.base}/boxes/tree", headers=ctx.headers)
+
+
+def _box_items_recursive(ctx: BenchContext, _prepared: object) -> Response:
+    return ctx.client.get(f"{ctx.base}/boxes/{ctx.dataset.deepest_root_id}/items", headers=ctx.headers)
+
+
+def _tag_cloud(ctx: BenchContext, _prepared: object) -> Response:
+    return ctx.client.get(f"{ctx.base}/tags/cloud", headers=ctx.headers)
+
+
+def _sync_push(ctx: BenchContext, _prepared: object) -> Response:
+    commands = [
+        {
+            "command_id": str(uuid.uuid4()),
+            "type": "stock.adjust",
+            "entity_id": ctx.rng.choice(ctx.dataset.item_ids),
+            "payload": {"delta": 1},
+        }
+        for _ in range(SYNC_PUSH_COMMANDS)
+    ]
+    return ctx.client.post(
+        "/api/v1/sync/push",
+        json={"warehouse_id": ctx.dataset.warehouse_id, "device_id": "bench-device", "commands": commands},
+        headers=ctx.headers,
+    )
+
+
+def _sync_pull(ctx: BenchContext, _prepared: object) -> Response:
+    total_changes = len(ctx.dataset.box_ids) + len(ctx.dataset.item_ids)
+    since_seq = max(0, total_changes - SYNC_PULL_WINDOW)
+    return ctx.client.get(
+        "/api/v1/sync/pull",
+        params={"warehouse_id": ctx.dataset.warehouse_id, "since_seq": since_seq},
+        headers=ctx.headers,
+    )
+
+
+def _export(ctx: BenchContext, _prepared: object) -> Response:
+    return ctx.client.get(f"{ctx.base}/export", headers=ctx.headers)
+
+
+def _import_snapshot(ctx: BenchContext) -> dict:
+    if ctx.snapshot is not None:
+        return ctx.snapshot
+    exported = _export(ctx, None)
+    exported.raise_for_status()
+    full = exported.json()
+    candidates = {box["id"]: box for box in full["boxes"] if not box["is_inbound"]}
+    boxes: list[dict] = []
+    box_ids: set[str] = set()
+    # Take whole root-to-leaf chains so the import never references a parent outside the snapshot.
+    for box in candidates.values():
+        if len(boxes) >= IMPORT_MAX_BOXES:
+            break
+        chain = []
+        current: dict | None = box
+        while current is not None and current["id"] not in box_ids:
+            chain.append(current)
+            current = candidates.get(current["parent_box_id"]) if current["parent_box_id"] else None
+        for entry in reversed(chain):
+            boxes.append(entry)
+            box_ids.add(entry["id"])
+    items = [item for item in full["items"] if item["box_id"] in box_ids][:IMPORT_MAX_ITEMS]
+    item_ids = {item["id"] for item in items}
+    movements = [movement for movement in full["stock_movements"] if movement["item_id"] in item_ids]
+    ctx.snapshot = {**full, "boxes": boxes, "items": items, "stock_movements": movements}
+    return ctx.snapshot
+
+
+def _prepare_import(ctx: BenchContext) -> str:
+    _import_snapshot(ctx)
+    res = ctx.client.post("/api/v1/warehouses", json={"name": "Bench import"}, headers=ctx.headers)
+    res.raise_for_status()
+    return res.json()["id"]
+
+
+def _import(ctx: BenchContext, target_warehouse_id: object) -> Response:
+    return ctx.client.post(
+        f"/api/v1/warehouses/{target_warehouse_id}/import",
+        json=_import_snapshot(ctx),
+        headers=ctx.headers,
+    )
+
+
+def _prepare_intake_commit(ctx: BenchContext) -> str:
+    with ctx.engine.begin() as conn:
+        return seed_intake_batch(conn, ctx.dataset, drafts=INTAKE_COMMIT_DRAFTS, rng=ctx.rng)
+
+
+def _intake_commit(ctx: BenchContext, batch_id: object) -> Response:
+    return ctx.client.post(
+        f"{ctx.base}/intake/batches/{batch_id}/commit",
+        json={"include_review": False},
+        headers=ctx.headers,
+    )
+
+
+SCENARIOS: tuple[Scenario, ...] = (
+    Scenario("list_items", _list_items),
+    Scenario("list_items_search", _search_items),
+    Scenario("list_items_tag", _filter_items_by_tag),
+    Scenario("box_tree", _box_tree),
+    Scenario("box_items_recursive", _box_items_recursive),
+    Scenario("tag_cloud", _tag_cloud),
+    Scenario("sync_push", _sync_push),
+    Scenario("sync_pull", _sync_pull),
+    Scenario("export", _export, heavy=True),
+    Scenario("import", _import, prepare=_prepare_import, heavy=True),
+    Scenario("intake_commit", _intake_commit, prepare=_prepare_intake_commit, heavy=True),
+)
+
+
+def run_scenario(ctx: BenchContext, scenario: Scenario, iterations: int, warmup: int = 1) -> ScenarioResult:
+    reports: list[RequestQueryReport] = []
+    latencies_ms: list[float] = []
+    query_counts: list[int] = []
+    errors = 0
+    for iteration in range(warmup + iterations):
+        prepared = scenario.prepare(ctx) if scenario.prepare is not None else None
+        reports.clear()
+        add_query_report_listener(reports.append)
+        try:
+            started_at = time.perf_counter()
+            response = scenario.call(ctx, prepared)
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+        finally:
+            remove_query_report_listener(reports.append)
+        if iteration < warmup:
+            continue
+        if response.status_code >= 400:
+            errors += 1
+            logger.warning("Benchmark request failed scenario=%s status=%s", scenario.name, response.status_code)
+        latencies_ms.append(elapsed_ms)
+        query_counts.append(sum(report.query_count for report in reports))
+
+    return ScenarioResult(
+        name=scenario.name,
+        iterations=iterations,
+        p50_ms=round(percentile(latencies_ms, 0.50), 2),
+        p95_ms=round(percentile(latencies_ms, 0.95), 2),
+        p99_ms=round(percentile(latencies_ms, 0.99), 2),
+        max_ms=round(max(latencies_ms, default=0.0), 2),
+        queries_p50=percentile([float(count) for count in query_counts], 0.50),
+        queries_max=max(query_counts, default=0),
+        peak_rss_mb=round(peak_rss_mb(), 1),
+        errors=errors,
+    )
+
+
+def login(client: TestClient, dataset: Dataset) -> dict[str, str]:
+    res = client.post("/api/v1/auth/login", json={"email": dataset.email, "password": dataset.password})
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def run_suite(
+    ctx: BenchContext,
+    scale_name: str,
+    *,
+    iterations: int,
+    heavy_iterations: int,
+    only: set[str] | None = None,
+) -> SuiteResult:
+    suite = SuiteResult(scale=scale_name)
+    # Snapshot before any write scenario runs, so import cost does not depend on which scenarios ran first.
+    _import_snapshot(ctx)
+    for scenario in SCENARIOS:
+        if only and scenario.name not in only:
+            continue
+        count = heavy_iterations if scenario.heavy else iterations
+        result = run_scenario(ctx, scenario, count)
+        logger.info(
+            "Benchmark scenario finished name=%s p50_ms=%s p95_ms=%s queries_max=%s",
+            result.name,
+            result.p50_ms,
+            result.p95_ms,
+            result.queries_max,
+        )
+        suite.results.append(result)
+    return suite
+
+
+def find_regressions(suite: SuiteResult, baseline: dict, threshold: float) -> list[str]:
+    regressions: list[str] = []
+    expected = baseline.get(suite.scale, {}).get("scenarios", {})
+    for result in suite.results:
+        base = expected.get(result.name)
+        if base is None:
+            continue
+        allowed_ms = base["p95_ms"] * (1 + threshold)
+        if result.p95_ms > allowed_ms and result.p95_ms - base["p95_ms"] > MIN_REGRESSION_MS:
+            regressions.append(f"{result.name}: p95 {result.p95_ms}ms > baseline {base['p95_ms']}ms (+{threshold:.0%})")
+        if result.queries_max > base["queries_max"]:
+            regressions.append(f"{result.name}: {result.queries_max} queries > baseline {base['queries_max']}")
+        if result.errors:
+            regressions.append(f"{result.name}: {result.errors} failed requests")
+    return regressions
+
+
+def format_table(suite: SuiteResult) -> str:
+    header = f"{'scenario':<22}{'iter':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'rss MB':>9}"
+    lines = [header, "-" * len(header)]
+    for result in suite.results:
+        lines.append(
+            f"{result.name:<22}{result.iterations:>6}{result.p50_ms:>10.2f}{result.p95_ms:>10.2f}"
+            f"{result.p99_ms:>10.2f}{result.queries_max:>9}{result.peak_rss_mb:>9.1f}"
+        )
+    return "\n".join(lines)
@@ -1,18 +1,27 @@
+from contextlib import contextmanager
 import os
 from pathlib import Path
 
-import pytest
 from fastapi.testclient import TestClient
+import pytest
 
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 os.environ["JWT_SECRET"] = "test-secret"
+os.environ["MAINTENANCE_ENABLED"] = "false"
+
+from sqlalchemy.orm import Session
 
-from app.db import base as _db_base  # noqa: E402,F401
-from app.db.session import engine, get_db  # noqa: E402
-from app.main import app  # noqa: E402
-from app.models.base import Base  # noqa: E402
-from app.services.intake_workers import shutdown_batch_workers  # noqa: E402
-from sqlalchemy.orm import Session  # noqa: E402
+from app.core.query_budget import add_query_report_listener, remove_query_report_listener
+from app.db import base as _db_base  # noqa: F401
+from app.db.session import dispose_engines, engine, get_db
+from app.main import app
+from app.models.base import Base
+from app.services.auth_cache import clear_auth_caches
+from app.services.box_codes import clear_short_code_pool
+from app.services.box_lookup import clear_box_lookup_cache
+from app.services.intake_workers import shutdown_batch_workers
+from app.services.response_cache import reset_response_cache
+from app.services.token_revocation import reset_token_revocations
 
 TEST_DB_FILES = [Path("test.db"), Path("test.db-shm"), Path("test.db-wal")]
 
@@ -20,14 +29,19 @@ TEST_DB_FILES = [Path("test.db"), Path("test.db-shm"), Path("test.db-wal")]
 @pytest.fixture(autouse=True)
 def setup_db():
     shutdown_batch_workers(timeout_seconds=2.0)
-    engine.dispose()
+    clear_auth_caches()
+    clear_box_lookup_cache()
+    clear_short_code_pool()
+    reset_response_cache()
+    reset_token_revocations()
+    dispose_engines()
     for path in TEST_DB_FILES:
         if path.exists():
             path.unlink()
     Base.metadata.create_all(bind=engine)
     yield
     shutdown_batch_workers(timeout_seconds=2.0)
-    engine.dispose()
+    dispose_engines()
     for path in TEST_DB_FILES:
         if path.exists():
             path.unlink()
@@ -46,3 +60,26 @@ def client() -> TestClient:
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def query_budget():
+    # Usage: `with query_budget(12): client.post(...)` fails when any request inside the block
+    # runs more than 12 SQL statements.
+    @contextmanager
+    def budget(max_queries: int):
+        reports = []
+        add_query_report_listener(reports.append)
+        try:
+            yield reports
+        finally:
+            remove_query_report_listener(reports.append)
+        assert reports, "No HTTP request was made inside the query budget block"
+        for report in reports:
+            repeated = "".join(f"\n  {count}x {statement}" for statement, count in report.repeated_statements)
+            assert report.query_count <= max_queries, (
+                f"{report.method} {report.route} ran {report.query_count} queries "
+                f"(budget {max_queries}){repeated}"
+            )
+
+    return budget
@@ -0,0 +1,107 @@
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+from app.models.activity_daily_rollup import ActivityDailyRollup
+from app.models.activity_event import ActivityEvent
+from app.models.user import User
+from app.services.maintenance import roll_up_expired_activity
+
+
+def signup_and_login(client, email: str) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "password123", "display_name": email.split("@")[0]},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def create_warehouse(client, headers) -> str:
+    res = client.post("/api/v1/warehouses", json={"name": "Activity WH"}, headers=headers)
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def user_id_for(email: str) -> str:
+    with Session(bind=engine) as db:
+        return db.scalar(select(User.id).where(User.email == email))
+
+
+def add_events(warehouse_id: str, actor_user_id: str, created_at: datetime, specs: list[tuple[str, str | None]]) -> None:
+    with Session(bind=engine) as db:
+        for event_type, entity_id in specs:
+            db.add(
+                ActivityEvent(
+                    warehouse_id=warehouse_id,
+                    actor_user_id=actor_user_id,
+                    event_type=event_type,
+                    entity_type="item" if entity_id else None,
+                    entity_id=entity_id,
+                    metadata_json={},
+                    created_at=created_at,
+                )
+            )
+        db.commit()
+
+
+def test_activity_feed_pages_with_a_stable_cursor_and_filters(client):
+    headers = signup_and_login(client, "activity-feed@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    actor_id = user_id_for("activity-feed@example.com")
+    # Events sharing a timestamp must still page without gaps or repeats.
+    same_instant = datetime(2026, 10, 1, 12, 0, tzinfo=UTC)
+    add_events(warehouse_id, actor_id, same_instant, [("item.created", f"item-{index}") for index in range(5)])
+    add_events(warehouse_id, actor_id, same_instant - timedelta(hours=1), [("item.deleted", "item-0")] * 2)
+    url = f"/api/v1/warehouses/{warehouse_id}/activity"
+
+    total = len(client.get(url, params={"limit": 200}, headers=headers).json())
+    seen: list[str] = []
+    params = {"limit": 3}
+    while True:
+        page = client.get(url, params=params, headers=headers)
+        assert page.status_code == 200
+        seen.extend(row["id"] for row in page.json())
+        cursor = page.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        params = {"limit": 3, "cursor": cursor}
+    assert len(seen) == len(set(seen)) == total
+
+    deleted = client.get(url, params={"event_type": "item.deleted"}, headers=headers).json()
+    assert [row["event_type"] for row in deleted] == ["item.deleted", "item.deleted"]
+    history = client.get(url, params={"entity_type": "item", "entity_id": "item-0"}, headers=headers).json()
+    assert [row["event_type"] for row in history] == ["item.created", "item.deleted", "item.deleted"]
+    assert client.get(url, params={"actor_user_id": "someone-else"}, headers=headers).json() == []
+    assert client.get(url, params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+
+
+def test_retention_job_rolls_old_events_into_daily_counts(client):
+    headers = signup_and_login(client, "activity-rollup@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    actor_id = user_id_for("activity-rollup@example.com")
+    recent = len(client.get(f"/api/v1/warehouses/{warehouse_id}/activity", headers=headers).json())
+    old_day = datetime.now(UTC) - timedelta(days=200)
+    add_events(warehouse_id, actor_id, old_day, [("item.created", "item-a"), ("item.created", "item-b")])
+    add_events(warehouse_id, actor_id, old_day.replace(hour=0, minute=5), [("item.deleted", "item-a")])
+
+    assert roll_up_expired_activity() == 3
+    assert roll_up_expired_activity() == 0
+
+    with Session(bind=engine) as db:
+        remaining = db.scalar(select(func.count()).where(ActivityEvent.warehouse_id == warehouse_id))
+        rollups = db.scalars(select(ActivityDailyRollup).where(ActivityDailyRollup.warehouse_id == warehouse_id)).all()
+    assert remaining == recent
+    assert {(rollup.event_type, rollup.event_count) for rollup in rollups} == {("item.created", 2), ("item.deleted", 1)}
+
+    daily = client.get(
+        f"/api/v1/warehouses/{warehouse_id}/activity/daily",
+        params={"since": (old_day.date() - timedelta(days=1)).isoformat()},
+        headers=headers,
+    )
+    assert daily.status_code == 200
+    assert {row["day"] for row in daily.json()} == {old_day.date().isoformat()}
+    assert sum(row["event_count"] for row in daily.json()) == 3
+    assert date.fromisoformat(daily.json()[0]["day"]) == old_day.date()
@@ -1,12 +1,19 @@
+import asyncio
 from datetime import UTC, datetime, timedelta
+import threading
 
-from sqlalchemy import select
+import pytest
+from sqlalchemy import event, select, update
 from sqlalchemy.orm import Session
 
-from app.db.session import engine
 from app.core.config import settings
+from app.db.session import engine
 from app.models.refresh_token import RefreshToken
-from app.services.security import decode_token
+from app.models.user import User
+from app.services import security
+from app.services.password_hashing import PasswordHashingBusyError, PasswordHashingPool
+from app.services.security import decode_token, hash_token
+from app.services.token_revocation import refresh_token_revocations
 
 
 def test_signup_login_and_create_warehouse(client):
@@ -246,3 +253,179 @@ def test_logout_revokes_refresh_token_and_clears_cookie(client):
         json={"refresh_token": refresh_token, "remember_me": True},
     )
     assert refresh_res.status_code == 401
+
+
+def test_auth_and_membership_lookups_are_cached_until_invalidated(client):
+    from sqlalchemy import event
+
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": "cached@example.com", "password": "password123", "display_name": "Cached"},
+    )
+    login_res = client.post(
+        "/api/v1/auth/login",
+        json={"email": "cached@example.com", "password": "password123", "remember_me": True},
+    )
+    access_token = login_res.json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    warehouse_id = client.post("/api/v1/warehouses", json={"name": "Cache"}, headers=headers).json()["id"]
+
+    statements: list[str] = []
+
+    def capture(_conn, _cursor, statement, _params, _context, _executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert client.get(f"/api/v1/sync/pull?warehouse_id={warehouse_id}", headers=headers).status_code == 200
+        statements.clear()
+        assert client.get(f"/api/v1/sync/pull?warehouse_id={warehouse_id}", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert not [statement for statement in statements if "FROM users" in statement]
+    assert not [statement for statement in statements if "FROM memberships" in statement]
+    assert not [statement for statement in statements if "FROM refresh_tokens" in statement]
+
+    change_res = client.post(
+        "/api/v1/auth/change-password",
+        json={"current_password": "password123", "new_password": "password456"},
+        headers=headers,
+    )
+    assert change_res.status_code == 200
+    assert client.get(f"/api/v1/sync/pull?warehouse_id={warehouse_id}", headers=headers).status_code == 401
+
+
+def test_login_rehashes_password_when_argon2_costs_change(client, monkeypatch):
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": "rehash@example.com", "password": "password123", "display_name": "Rehash"},
+    )
+    with Session(bind=engine) as db:
+        original_hash = db.scalar(select(User.password_hash).where(User.email == "rehash@example.com"))
+    assert "m=65536,t=3,p=4" in original_hash
+
+    monkeypatch.setattr(settings, "argon2_time_cost", 2)
+    monkeypatch.setattr(settings, "argon2_memory_cost_kib", 8192)
+    monkeypatch.setattr(settings, "argon2_parallelism", 1)
+    monkeypatch.setattr(security, "pwd_context", security.build_password_context())
+
+    login_res = client.post("/api/v1/auth/login", json={"email": "rehash@example.com", "password": "password123"})
+    assert login_res.status_code == 200
+    with Session(bind=engine) as db:
+        upgraded_hash = db.scalar(select(User.password_hash).where(User.email == "rehash@example.com"))
+    assert "m=8192,t=2,p=1" in upgraded_hash
+
+    relogin_res = client.post("/api/v1/auth/login", json={"email": "rehash@example.com", "password": "password123"})
+    assert relogin_res.status_code == 200
+
+
+def test_password_hashing_pool_rejects_work_beyond_its_queue():
+    pool = PasswordHashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        running = asyncio.ensure_future(pool.run(release.wait, 5))
+        queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordHashingBusyError):
+            await pool.run(lambda: "rejected")
+        stats = pool.stats()
+        assert (stats.in_flight, stats.queued, stats.rejected) == (1, 1, 1)
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    stats = pool.stats()
+    assert (stats.completed, stats.in_flight, stats.queued) == (2, 0, 0)
+
+
+def test_remember_me_tokens_skip_db_lookup_and_pick_up_remote_revocations(client):
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": "revocation@example.com", "password": "password123", "display_name": "Revocation"},
+    )
+    login_res = client.post(
+        "/api/v1/auth/login",
+        json={"email": "revocation@example.com", "password": "password123", "remember_me": True},
+    )
+    access_token = login_res.json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert not [statement for statement in statements if "refresh_tokens" in statement]
+
+    # Simulate another replica revoking the token: this process only learns about it on refresh.
+    with Session(bind=engine) as db:
+        db.execute(
+            update(RefreshToken).where(RefreshToken.token_hash == hash_token(access_token)).values(revoked=True)
+        )
+        db.commit()
+    assert refresh_token_revocations() >= 1
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+    second_login = client.post(
+        "/api/v1/auth/login",
+        json={"email": "revocation@example.com", "password": "password123", "remember_me": True},
+    )
+    second_token = second_login.json()["access_token"]
+    with Session(bind=engine) as db:
+        db.execute(
+            update(RefreshToken).where(RefreshToken.token_hash == hash_token(second_token)).values(revoked=True)
+        )
+        db.commit()
+    refresh_token_revocations()
+    assert client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {second_token}"}).status_code == 401
+
+
+def test_token_revocations_prune_expired_hashes_but_keep_persistent_ones(client, monkeypatch):
+    from app.services import token_revocation
+
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": "revocation-prune@example.com", "password": "password123", "display_name": "Prune"},
+    )
+    now = datetime.now(UTC)
+    with Session(bind=engine) as db:
+        user_id = db.scalar(select(User.id).where(User.email == "revocation-prune@example.com"))
+        db.add_all(
+            [
+                RefreshToken(
+                    user_id=user_id,
+                    token_hash="short-lived",
+                    expires_at=now + timedelta(hours=1),
+                    revoked=True,
+                ),
+                RefreshToken(
+                    user_id=user_id,
+                    token_hash="persistent",
+                    expires_at=datetime.max.replace(tzinfo=UTC),
+                    revoked=True,
+                ),
+            ]
+        )
+        db.commit()
+
+    revocations = token_revocation.TokenRevocationSet(refresh_interval_seconds=60, overlap_seconds=120)
+    assert revocations.refresh() == 2
+    assert revocations.size == 2
+
+    monkeypatch.setattr(token_revocation, "utcnow", lambda: now + timedelta(hours=2))
+    revocations.refresh()
+    assert revocations.size == 1
+    assert revocations.is_revoked("persistent")
+    assert not revocations.is_revoked("short-lived")
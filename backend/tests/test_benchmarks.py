@@ -0,0 +1,84 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from app.db.session import engine
+from benchmarks.dataset import DatasetScale, generate_dataset
+from benchmarks.suite import (
+    BenchContext,
+    ScenarioResult,
+    SuiteResult,
+    find_regressions,
+    login,
+    percentile,
+    run_suite,
+)
+
+
+def scenario_result(name: str, p95_ms: float, queries_max: int) -> ScenarioResult:
+    return ScenarioResult(
+        name=name,
+        iterations=10,
+        p50_ms=p95_ms / 2,
+        p95_ms=p95_ms,
+        p99_ms=p95_ms,
+        max_ms=p95_ms,
+        queries_p50=queries_max,
+        queries_max=queries_max,
+        peak_rss_mb=100.0,
+    )
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.95) == 0.0
+
+
+def test_find_regressions_flags_latency_and_query_growth():
+    baseline = {
+        "smoke": {
+            "scenarios": {
+                "list_items": {"p95_ms": 10.0, "queries_max": 4},
+                "box_tree": {"p95_ms": 10.0, "queries_max": 2},
+                "tag_cloud": {"p95_ms": 10.0, "queries_max": 1},
+            }
+        }
+    }
+    suite = SuiteResult(
+        scale="smoke",
+        results=[
+            scenario_result("list_items", 20.0, 4),
+            scenario_result("box_tree", 11.0, 3),
+            scenario_result("tag_cloud", 12.0, 1),
+            scenario_result("export", 500.0, 40),
+        ],
+    )
+
+    regressions = find_regressions(suite, baseline, threshold=0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("list_items: p95")
+    assert regressions[1].startswith("box_tree: 3 queries")
+
+
+def test_suite_drives_endpoints_against_generated_dataset(client: TestClient):
+    scale = DatasetScale(boxes=12, box_depth=4, items=40, stock_movements=80, tags=5, seed=7)
+    with engine.begin() as conn:
+        dataset = generate_dataset(conn, scale)
+
+    ctx = BenchContext(
+        client=client,
+        engine=engine,
+        dataset=dataset,
+        headers=login(client, dataset),
+        rng=random.Random(scale.seed),
+    )
+    suite = run_suite(ctx, "test", iterations=2, heavy_iterations=1)
+
+    results = {result.name: result for result in suite.results}
+    assert set(results) >= {"list_items", "box_tree", "sync_push", "sync_pull", "import", "intake_commit"}
+    assert all(result.errors == 0 for result in results.values())
+    assert results["box_tree"].queries_max > 0
+    assert results["list_items"].p95_ms > 0
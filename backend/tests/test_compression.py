@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, is_compressible, negotiate_encoding
+from app.core.config import settings
+from app.core.media import sign_media_url
+
+
+def signup_and_login(client, email: str) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "password123", "display_name": email.split("@")[0]},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_large_json_is_gzipped_and_still_revalidates(client):
+    headers = signup_and_login(client, "gzip@example.com")
+    warehouse_id = client.post("/api/v1/warehouses", json={"name": "Gzip WH"}, headers=headers).json()["id"]
+    box_id = client.post(f"/api/v1/warehouses/{warehouse_id}/boxes", json={"name": "Shelf"}, headers=headers).json()["id"]
+    for index in range(20):
+        client.post(
+            f"/api/v1/warehouses/{warehouse_id}/items",
+            json={"box_id": box_id, "name": f"Tornillo {index}", "tags": ["ferretería"]},
+            headers=headers,
+        )
+    url = f"/api/v1/warehouses/{warehouse_id}/items"
+
+    compressed = client.get(url, headers={**headers, "Accept-Encoding": "gzip"})
+    assert compressed.status_code == 200
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["vary"]
+    assert compressed.headers["etag"].startswith('W/"')
+    assert len(compressed.json()) == 20
+
+    plain = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["vary"]
+    assert plain.content == compressed.content
+
+    revalidated = client.get(url, headers={**headers, "If-None-Match": compressed.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_small_bodies_and_photos_are_sent_as_is(client):
+    small = client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    photo = Path(settings.media_root) / "compression-test.png"
+    photo.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 4096)
+    try:
+        res = client.get(
+            sign_media_url(f"{settings.media_url_path}/compression-test.png"),
+            headers={"Accept-Encoding": "gzip"},
+        )
+    finally:
+        photo.unlink()
+    assert res.status_code == 200
+    assert "content-encoding" not in res.headers
+    assert "Accept-Encoding" not in res.headers.get("vary", "")
+
+
+def test_streaming_bodies_are_compressed_incrementally():
+    app = FastAPI()
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse((b'{"chunk":%d}\n' % index for index in range(200)), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    with TestClient(app) as client:
+        res = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["content-encoding"] == "gzip"
+    assert "content-length" not in res.headers
+    assert res.text.splitlines()[-1] == '{"chunk":199}'
+
+
+def test_encoding_negotiation_and_content_types():
+    assert negotiate_encoding("gzip, deflate, br", ("br", "gzip")) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("br;q=0, *", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("identity", ("br", "gzip")) is None
+    assert negotiate_encoding("", ("gzip",)) is None
+
+    assert is_compressible("application/json")
+    assert is_compressible("text/csv; charset=utf-8")
+    assert is_compressible("application/problem+json")
+    assert is_compressible("image/svg+xml")
+    assert not is_compressible("image/jpeg")
+    assert not is_compressible("text/event-stream")
@@ -0,0 +1,111 @@
+def signup_and_login(client, email: str) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "password123", "display_name": email.split("@")[0]},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def create_warehouse(client, headers) -> str:
+    res = client.post("/api/v1/warehouses", json={"name": "ETag WH"}, headers=headers)
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def create_box(client, headers, warehouse_id: str) -> str:
+    res = client.post(f"/api/v1/warehouses/{warehouse_id}/boxes", json={"name": "Shelf"}, headers=headers)
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def create_item(client, headers, warehouse_id: str, box_id: str, name: str) -> str:
+    res = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/items",
+        json={"box_id": box_id, "name": name, "tags": ["tools"]},
+        headers=headers,
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def revalidate(client, url: str, headers: dict[str, str], etag: str, **kwargs):
+    return client.get(url, headers={**headers, "If-None-Match": etag}, **kwargs)
+
+
+def test_read_endpoints_return_304_for_matching_etag(client, query_budget):
+    headers = signup_and_login(client, "etag-reads@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    box_id = create_box(client, headers, warehouse_id)
+    create_item(client, headers, warehouse_id, box_id, "Drill")
+
+    base = f"/api/v1/warehouses/{warehouse_id}"
+    for url in (f"{base}/items", f"{base}/boxes/tree", f"{base}/boxes/{box_id}", f"{base}/tags", f"{base}/tags/cloud"):
+        first = client.get(url, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        # Only auth and the change_log max(seq) lookup run before the 304.
+        with query_budget(3):
+            cached = revalidate(client, url, headers, etag)
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        assert revalidate(client, url, headers, f'W/{etag}').status_code == 304
+        assert revalidate(client, url, headers, '"stale", ' + etag).status_code == 304
+        assert revalidate(client, url, headers, '"stale"').status_code == 200
+
+
+def test_etag_changes_with_mutations_and_query_params(client):
+    headers = signup_and_login(client, "etag-mutations@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    box_id = create_box(client, headers, warehouse_id)
+    item_id = create_item(client, headers, warehouse_id, box_id, "Drill")
+    url = f"/api/v1/warehouses/{warehouse_id}/items"
+
+    etag = client.get(url, headers=headers).headers["etag"]
+    filtered_etag = client.get(url, params={"q": "drill"}, headers=headers).headers["etag"]
+    assert filtered_etag != etag
+    assert revalidate(client, url, headers, etag, params={"q": "drill"}).status_code == 200
+
+    updated = client.patch(f"{url}/{item_id}", json={"name": "Hammer"}, headers=headers)
+    assert updated.status_code == 200
+
+    refreshed = revalidate(client, url, headers, etag)
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()[0]["name"] == "Hammer"
+
+
+def test_item_list_etag_is_scoped_per_user(client):
+    owner_headers = signup_and_login(client, "etag-owner@example.com")
+    guest_headers = signup_and_login(client, "etag-guest@example.com")
+    warehouse_id = create_warehouse(client, owner_headers)
+    invite = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/invites",
+        json={"email": "etag-guest@example.com"},
+        headers=owner_headers,
+    )
+    assert invite.status_code == 201
+    accept = client.post(f"/api/v1/invites/{invite.json()['invite_token']}/accept", headers=guest_headers)
+    assert accept.status_code == 200
+    box_id = create_box(client, owner_headers, warehouse_id)
+    item_id = create_item(client, owner_headers, warehouse_id, box_id, "Drill")
+
+    base = f"/api/v1/warehouses/{warehouse_id}"
+    owner_etag = client.get(f"{base}/items", headers=owner_headers).headers["etag"]
+    guest_etag = client.get(f"{base}/items", headers=guest_headers).headers["etag"]
+    assert owner_etag != guest_etag
+    assert revalidate(client, f"{base}/items", guest_headers, owner_etag).status_code == 200
+
+    tree_etag = client.get(f"{base}/boxes/tree", headers=owner_headers).headers["etag"]
+    assert revalidate(client, f"{base}/boxes/tree", guest_headers, tree_etag).status_code == 304
+
+    favorite = client.post(f"{base}/items/{item_id}/favorite", json={"is_favorite": True}, headers=owner_headers)
+    assert favorite.status_code == 200
+    owner_items = revalidate(client, f"{base}/items", owner_headers, owner_etag)
+    assert owner_items.status_code == 200
+    assert owner_items.json()[0]["is_favorite"] is True
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db import async_session
+from app.db import session as db_session
+from app.db.async_session import HotPathSession, resolve_async_database_url
+from app.db.session import engine
+
+
+def test_resolve_async_database_url_maps_known_backends():
+    assert resolve_async_database_url("postgresql+psycopg://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert resolve_async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert resolve_async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert resolve_async_database_url("mysql://u:p@db/app") is None
+
+
+def test_hot_path_session_falls_back_to_threadpool(monkeypatch):
+    monkeypatch.setattr(async_session.settings, "async_db_enabled", True)
+    monkeypatch.setattr(async_session, "create_async_engine", None)
+    assert async_session.async_db_active() is False
+
+    caller_thread = threading.get_ident()
+
+    def probe(db: Session, offset: int) -> tuple[int, bool]:
+        return db.scalar(text("SELECT 41")) + offset, threading.get_ident() != caller_thread
+
+    with Session(bind=engine) as db:
+        hot_path = HotPathSession(sync_session=db)
+        assert hot_path.is_async is False
+        assert asyncio.run(hot_path.run(probe, 1)) == (42, True)
+
+
+class LoopRunSyncSession:
+    # Stands in for AsyncSession.run_sync, which runs the callable on the event-loop thread.
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.db, *args, **kwargs)
+
+
+def test_hot_path_render_runs_off_the_event_loop():
+    def load(db: Session, *, offset: int) -> tuple[int, int]:
+        return db.scalar(text("SELECT 41")) + offset, threading.get_ident()
+
+    def render(loaded: tuple[int, int]) -> tuple[int, bool]:
+        value, load_thread = loaded
+        return value, threading.get_ident() != load_thread
+
+    with Session(bind=engine) as db:
+        hot_path = HotPathSession(async_session=LoopRunSyncSession(db))
+        assert asyncio.run(hot_path.run_and_render(load, render, offset=1)) == (42, True)
+
+
+def test_sqlite_engine_applies_wal_pragmas():
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == db_session.settings.sqlite_busy_timeout_ms
+
+
+def test_postgres_engines_set_role_timeouts_and_pool_options(monkeypatch):
+    captured: dict[str, dict] = {}
+
+    def fake_create_engine(url, **kwargs):
+        captured[kwargs["connect_args"]["application_name"]] = kwargs
+        return engine
+
+    monkeypatch.setattr(db_session, "create_engine", fake_create_engine)
+    db_session.build_engine("postgresql+psycopg://u:p@db/app", role=db_session.ENGINE_ROLE_API)
+    db_session.build_engine("postgresql+psycopg://u:p@db/app", role=db_session.ENGINE_ROLE_WORKER)
+
+    api_kwargs = captured["my-warehouse-api:api"]
+    worker_kwargs = captured["my-warehouse-api:worker"]
+    assert api_kwargs["connect_args"]["options"] == "-c statement_timeout=30000"
+    assert worker_kwargs["connect_args"]["options"] == "-c statement_timeout=300000"
+    assert api_kwargs["pool_pre_ping"] is True
+    assert api_kwargs["pool_size"] == db_session.settings.db_pool_size
+
+
+def test_read_your_writes_pins_client_to_primary_after_write(client, monkeypatch):
+    from app.db.replica import should_use_replica
+
+    monkeypatch.setattr(db_session.settings, "database_replica_url", "postgresql+psycopg://ro@replica/app")
+    cookie_name = db_session.settings.replica_pin_cookie_name
+
+    assert should_use_replica("GET", {}) is True
+    assert should_use_replica("POST", {}) is False
+
+    signup = client.post(
+        "/api/v1/auth/signup",
+        json={"email": "replica@example.com", "password": "password123", "display_name": "Replica"},
+    )
+    assert signup.status_code == 201
+    assert cookie_name in signup.headers.get("set-cookie", "")
+    pinned_cookies = {cookie_name: client.cookies.get(cookie_name)}
+    assert should_use_replica("GET", pinned_cookies) is False
+
+    health = client.get("/healthz")
+    assert cookie_name not in health.headers.get("set-cookie", "")
+
+    rejected = client.post("/api/v1/auth/login", json={"email": "replica@example.com", "password": "wrong-password"})
+    assert rejected.status_code == 401
+    assert cookie_name not in rejected.headers.get("set-cookie", "")
@@ -0,0 +1,92 @@
+import json
+from urllib import error, request
+
+import pytest
+
+from app.core.config import settings
+from app.services import llm_enrichment
+from app.services.llm_rate_limit import reset_llm_rate_limiter
+from benchmarks.fake_gemini import FakeGeminiProfile, FakeGeminiServer
+from benchmarks.intake_throughput import RetryPolicy, parse_retry_policies, run_intake_benchmark
+
+IMAGE_DATA_URL = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+
+
+@pytest.fixture()
+def fake_gemini(monkeypatch):
+    monkeypatch.setattr(settings, "llm_requests_per_minute", 0)
+    monkeypatch.setattr(settings, "llm_max_retries", 0)
+    reset_llm_rate_limiter()
+    server = FakeGeminiServer(FakeGeminiProfile(latency_ms=1, latency_sigma=0)).start()
+    monkeypatch.setattr(settings, "gemini_base_url", server.url)
+    yield server
+    server.stop()
+    reset_llm_rate_limiter()
+
+
+def _post(server: FakeGeminiServer, model: str, body: dict) -> dict:
+    req = request.Request(
+        f"{server.url}/v1beta/models/{model}:generateContent",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json", "x-goog-api-key": "k"},
+        method="POST",
+    )
+    with request.urlopen(req, timeout=5) as res:
+        return json.loads(res.read())
+
+
+def test_fake_gemini_serves_aliases_throttles_and_malformed_json(fake_gemini):
+    with pytest.raises(error.HTTPError) as not_found:
+        _post(fake_gemini, "gemini-3-flash", {"contents": []})
+    assert not_found.value.code == 404
+
+    payload = _post(fake_gemini, "gemini-3-flash-preview", {"contents": [{"parts": [{"text": "tags"}]}]})
+    parsed = json.loads(payload["candidates"][0]["content"]["parts"][0]["text"])
+    assert set(parsed) == {"tags", "aliases"}
+
+    fake_gemini.configure(FakeGeminiProfile(latency_ms=1, latency_sigma=0, throttle_rate=1.0, retry_after_seconds=7))
+    with pytest.raises(error.HTTPError) as throttled:
+        _post(fake_gemini, "gemini-2.5-flash", {"contents": []})
+    assert throttled.value.code == 429
+    assert throttled.value.headers["Retry-After"] == "7"
+
+    fake_gemini.configure(FakeGeminiProfile(latency_ms=1, latency_sigma=0, malformed_rate=1.0))
+    payload = _post(fake_gemini, "gemini-2.5-flash", {"contents": []})
+    with pytest.raises(ValueError):
+        json.loads(payload["candidates"][0]["content"]["parts"][0]["text"])
+
+    stats = fake_gemini.reset_stats()
+    assert stats.outcomes == {"not_found": 1, "success": 1, "throttled": 1, "malformed": 1}
+
+
+def test_photo_draft_falls_back_through_aliases_against_fake_gemini(fake_gemini):
+    draft = llm_enrichment.generate_item_draft_from_photo(IMAGE_DATA_URL, api_key="fake-key")
+
+    assert draft["llm_used"] is True
+    assert draft["name"]
+    stats = fake_gemini.reset_stats()
+    assert stats.models["gemini-3.1-flash-lite"] == 1
+    assert stats.models["gemini-3.1-flash-lite-preview"] == 1
+    assert stats.outcomes == {"not_found": 1, "success": 1}
+
+
+def test_intake_throughput_harness_reports_rates_and_errors(fake_gemini):
+    assert parse_retry_policies("0:1,2:0.5:4") == [
+        RetryPolicy(max_retries=0, base_seconds=1.0, max_seconds=30.0),
+        RetryPolicy(max_retries=2, base_seconds=0.5, max_seconds=4.0),
+    ]
+    fake_gemini.configure(FakeGeminiProfile(latency_ms=1, latency_sigma=0, missing_models=()))
+
+    results = run_intake_benchmark(
+        fake_gemini,
+        drafts=4,
+        worker_counts=[2],
+        retry_policies=[RetryPolicy(max_retries=0, base_seconds=0.1, max_seconds=0.1)],
+    )
+
+    assert len(results) == 1
+    result = results[0]
+    assert result.drafts == 4
+    assert result.error_rate == 0.0
+    assert result.drafts_per_second > 0
+    assert result.gemini_outcomes == {"success": 4}
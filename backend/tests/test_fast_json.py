@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+from app.core.json_response import FastJSONResponse
+from app.schemas.box import BoxItemResponse
+from app.schemas.item import ItemResponse
+from app.schemas.sync import SyncChangeEntry, SyncPullResponse
+from app.schemas.transfer import ExportBox, ExportItem, ExportStockMovement, WarehouseExportResponse
+
+
+def signup_and_login(client, email: str) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "password123", "display_name": email.split("@")[0]},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def seed_warehouse(client, headers) -> tuple[str, str]:
+    warehouse_id = client.post("/api/v1/warehouses", json={"name": "Fast JSON"}, headers=headers).json()["id"]
+    box_id = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/boxes",
+        json={"name": "Shelf"},
+        headers=headers,
+    ).json()["id"]
+    for name in ("Drill", "Cinta métrica"):
+        res = client.post(
+            f"/api/v1/warehouses/{warehouse_id}/items",
+            json={"box_id": box_id, "name": name, "tags": ["tools"]},
+            headers=headers,
+        )
+        assert res.status_code == 201
+    return warehouse_id, box_id
+
+
+def assert_matches_schema(rows: list[dict], model) -> None:
+    assert rows
+    for row in rows:
+        assert set(row) == set(model.model_fields)
+
+
+def test_fast_json_response_matches_pydantic_encoding():
+    payload = [{"name": "Cinta métrica", "created_at": datetime(2026, 10, 19, 8, 30, 1, 250), "tags": []}]
+    response = FastJSONResponse(payload)
+
+    assert response.media_type == "application/json"
+    assert response.body == TypeAdapter(list[dict]).dump_json(payload)
+    assert FastJSONResponse(b'{"ok":true}').body == b'{"ok":true}'
+
+
+def test_list_endpoints_encode_rows_that_match_their_schemas(client):
+    headers = signup_and_login(client, "fast-json@example.com")
+    warehouse_id, box_id = seed_warehouse(client, headers)
+    base = f"/api/v1/warehouses/{warehouse_id}"
+
+    for params in ({}, {"q": "drill"}):
+        items = client.get(f"{base}/items", params=params, headers=headers)
+        assert items.status_code == 200
+        assert_matches_schema(items.json(), ItemResponse)
+        TypeAdapter(list[ItemResponse]).validate_json(items.content)
+
+    box_items = client.get(f"{base}/boxes/{box_id}/items", headers=headers)
+    assert box_items.status_code == 200
+    assert_matches_schema(box_items.json(), BoxItemResponse)
+    assert "Cinta métrica".encode() in box_items.content
+
+    exported = client.get(f"{base}/export", headers=headers)
+    assert exported.status_code == 200
+    export = WarehouseExportResponse.model_validate_json(exported.content)
+    assert len(export.items) == 2
+    assert_matches_schema(exported.json()["boxes"], ExportBox)
+    assert_matches_schema(exported.json()["items"], ExportItem)
+    assert_matches_schema(exported.json()["stock_movements"], ExportStockMovement)
+
+    pulled = client.get("/api/v1/sync/pull", params={"warehouse_id": warehouse_id}, headers=headers)
+    assert pulled.status_code == 200
+    pull = SyncPullResponse.model_validate_json(pulled.content)
+    assert pull.last_seq == pull.changes[-1].seq
+    assert_matches_schema(pulled.json()["changes"], SyncChangeEntry)
@@ -0,0 +1,157 @@
+import io
+import json
+from urllib import error
+
+from app.services import llm_enrichment
+from app.services.llm_rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    LLMRateLimiter,
+    MemoryTokenBucket,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeResponse(io.BytesIO):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+
+def _throttled(code: int, retry_after: str | None = None) -> error.HTTPError:
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return error.HTTPError(url="https://example.invalid", code=code, msg="Too Many Requests", hdrs=headers, fp=None)
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("") is None
+    assert parse_retry_after("not-a-date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_token_bucket_refills_at_configured_rate_and_honours_block():
+    clock = FakeClock()
+    bucket = MemoryTokenBucket(rate_per_second=2.0, capacity=2, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+
+    clock.now += 0.5
+    assert bucket.reserve() == 0.0
+
+    bucket.block_for(10)
+    assert bucket.reserve() == 10.0
+
+
+def test_concurrency_limiter_applies_aimd():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(minimum=1, maximum=8, clock=clock)
+    assert limiter.limit == 8
+
+    limiter.on_congestion()
+    assert limiter.limit == 4
+    limiter.on_congestion()
+    assert limiter.limit == 4
+
+    clock.now += 2
+    limiter.on_congestion()
+    assert limiter.limit == 2
+
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.limit > 2
+
+    assert limiter.acquire(timeout_seconds=0)
+    assert limiter.acquire(timeout_seconds=0)
+    assert limiter.acquire(timeout_seconds=0)
+    limiter.release()
+
+
+def test_gemini_request_retries_after_429_with_shared_backoff(monkeypatch):
+    clock = FakeClock()
+    limiter = LLMRateLimiter(
+        backend="memory",
+        requests_per_minute=600,
+        burst=5,
+        min_concurrency=1,
+        max_concurrency=4,
+        max_wait_seconds=60,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    monkeypatch.setattr(llm_enrichment, "get_llm_rate_limiter", lambda: limiter)
+
+    responses = [_throttled(429, "3"), FakeResponse(json.dumps({"candidates": []}).encode("utf-8"))]
+    calls: list[float] = []
+
+    def fake_urlopen(_req, timeout):
+        calls.append(clock.now)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(llm_enrichment.request, "urlopen", fake_urlopen)
+
+    payload = llm_enrichment._post_gemini_generate_content(
+        api_key="secret",
+        model="gemini-3-flash",
+        body={"contents": []},
+        timeout_seconds=5,
+    )
+
+    assert payload == {"candidates": []}
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 3
+    assert limiter.concurrency.limit == 2
+
+
+def test_gemini_request_gives_up_after_max_retries(monkeypatch):
+    clock = FakeClock()
+    limiter = LLMRateLimiter(
+        backend="memory",
+        requests_per_minute=0,
+        burst=1,
+        min_concurrency=1,
+        max_concurrency=2,
+        max_wait_seconds=60,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    monkeypatch.setattr(llm_enrichment, "get_llm_rate_limiter", lambda: limiter)
+    attempts: list[int] = []
+
+    def fake_urlopen(_req, timeout):
+        attempts.append(1)
+        raise _throttled(503)
+
+    monkeypatch.setattr(llm_enrichment.request, "urlopen", fake_urlopen)
+
+    try:
+        llm_enrichment._post_gemini_generate_content(
+            api_key="secret",
+            model="gemini-3-flash",
+            body={"contents": []},
+            timeout_seconds=5,
+        )
+    except error.HTTPError as exc:
+        assert exc.code == 503
+    else:
+        raise AssertionError("Expected HTTPError after exhausting retries")
+
+    assert len(attempts) == llm_enrichment.settings.llm_max_retries + 1
+    assert limiter.concurrency.in_flight == 0
@@ -0,0 +1,124 @@
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.datastructures import QueryParams
+
+from app.core.config import settings
+from app.core.media import MediaFiles, sign_media_url, signing_epoch, verify_media_signature
+from app.db.session import engine
+from app.models.item import Item
+from app.services.conditional_get import build_warehouse_version
+
+PHOTO_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+
+
+def signup_and_login(client, email: str) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "password123", "display_name": email.split("@")[0]},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def media_client(tmp_path: Path, offload: str) -> TestClient:
+    app = FastAPI()
+    app.mount("/media", MediaFiles(directory=str(tmp_path), offload=offload), name="media")
+    return TestClient(app)
+
+
+def test_media_is_cached_immutably_and_honours_conditional_and_range_requests(client):
+    photo = Path(settings.media_root) / "media-cache-test.png"
+    photo.write_bytes(PHOTO_BYTES)
+    url = sign_media_url(f"{settings.media_url_path}/media-cache-test.png")
+    try:
+        first = client.get(url)
+        assert first.status_code == 200
+        assert first.content == PHOTO_BYTES
+        assert first.headers["cache-control"] == f"public, max-age={settings.media_cache_max_age_seconds}, immutable"
+        assert first.headers["accept-ranges"] == "bytes"
+
+        cached = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert "immutable" in cached.headers["cache-control"]
+
+        partial = client.get(url, headers={"Range": "bytes=8-15"})
+        assert partial.status_code == 206
+        assert partial.content == PHOTO_BYTES[8:16]
+        assert partial.headers["content-range"] == f"bytes 8-15/{len(PHOTO_BYTES)}"
+    finally:
+        photo.unlink()
+
+
+def test_x_accel_offload_skips_the_file_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "media_offload_internal_prefix", "/_media_internal/")
+    with media_client(tmp_path, "x-accel-redirect") as client:
+        res = client.get(sign_media_url("/media/wh-1/items/photo one.jpg"))
+        assert res.status_code == 200
+        assert res.content == b""
+        assert res.headers["x-accel-redirect"] == "/_media_internal/wh-1/items/photo%20one.jpg"
+        assert res.headers["content-type"] == "image/jpeg"
+        assert "immutable" in res.headers["cache-control"]
+
+        assert client.get("/media/wh-1/photo.jpg").status_code == 403
+        monkeypatch.setattr(settings, "media_signed_urls_enabled", False)
+        assert client.get("/media/wh-1/%2E%2E/%2E%2E/secret.txt").status_code == 404
+        assert client.post("/media/wh-1/photo.jpg").status_code == 405
+
+
+def test_x_sendfile_offload_points_inside_the_media_root(tmp_path):
+    with media_client(tmp_path, "x-sendfile") as client:
+        res = client.get(sign_media_url("/media/wh-1/photo.webp"))
+    assert res.status_code == 200
+    assert res.headers["x-sendfile"] == str(tmp_path.resolve() / "wh-1" / "photo.webp")
+    assert res.headers["content-type"] == "image/webp"
+
+
+def test_photo_urls_are_stored_relative_and_signed_on_the_way_out(client):
+    headers = signup_and_login(client, "signed-media@example.com")
+    warehouse_id = client.post("/api/v1/warehouses", json={"name": "Signed WH"}, headers=headers).json()["id"]
+    box_id = client.post(f"/api/v1/warehouses/{warehouse_id}/boxes", json={"name": "Shelf"}, headers=headers).json()["id"]
+    path = f"/media/{warehouse_id}/photo.png"
+    created = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/items",
+        json={"box_id": box_id, "name": "Drill", "photo_url": f"http://old-host:8000{path}"},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    assert created.json()["photo_url"] == sign_media_url(path)
+
+    with Session(bind=engine) as db:
+        assert db.scalar(select(Item.photo_url).where(Item.id == created.json()["id"])) == path
+
+    listed = client.get(f"/api/v1/warehouses/{warehouse_id}/items", headers=headers).json()
+    assert listed[0]["photo_url"] == sign_media_url(path)
+    exported = client.get(f"/api/v1/warehouses/{warehouse_id}/export", headers=headers).json()
+    assert exported["items"][0]["photo_url"] == path
+
+
+def test_media_signatures_expire_and_bind_the_path():
+    signed = sign_media_url("/media/wh-1/photo.png", now=1_000_000)
+    query = parse_qs(urlsplit(signed).query)
+    expires, signature = query["exp"][0], query["sig"][0]
+    window = settings.media_url_ttl_seconds
+
+    # Every URL issued within one window is identical, so caches keep hitting.
+    assert sign_media_url("/media/wh-1/photo.png", now=1_000_000 + 1) == signed
+    assert verify_media_signature("/media/wh-1/photo.png", expires, signature, now=1_000_000 + window)
+    assert not verify_media_signature("/media/wh-1/photo.png", expires, signature, now=int(expires))
+    assert not verify_media_signature("/media/wh-2/photo.png", expires, signature, now=1_000_000)
+    assert not verify_media_signature("/media/wh-1/photo.png", str(int(expires) + 1), signature, now=1_000_000)
+    assert sign_media_url("https://example.com/photo.png") == "https://example.com/photo.png"
+
+    versions = [
+        build_warehouse_version(
+            warehouse_id="wh-1", path="/items", query_params=QueryParams(""), last_seq=3, media_epoch=epoch
+        )
+        for epoch in (signing_epoch(1_000_000), signing_epoch(1_000_000 + window))
+    ]
+    assert versions[0].etag != versions[1].etag
@@ -0,0 +1,40 @@
+from app.core.memory_cache import MemoryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_cache_expires_entries_and_evicts_least_recently_used():
+    clock = FakeClock()
+    evictions: list[int] = []
+    cache: MemoryCache[str, str] = MemoryCache(max_entries=2, ttl_seconds=10, on_evict=evictions.append, clock=clock)
+
+    assert cache.set("a", "1")
+    assert cache.set("b", "2", ttl_seconds=30)
+    assert cache.get("a") == "1"
+    assert cache.set("c", "3")
+    assert cache.get("b") is None
+    assert evictions == [1]
+
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.set("zero", "x", ttl_seconds=0) is False
+    assert len(cache) == 1
+
+
+def test_memory_cache_tracks_bytes_and_honours_replace_veto():
+    cache: MemoryCache[str, tuple[int, bytes]] = MemoryCache(max_entries=10, max_bytes=8)
+
+    assert cache.set("a", (1, b"aaaa"), size=4)
+    assert cache.set("b", (1, b"bbbb"), size=4)
+    assert cache.set("big", (1, b"x" * 9), size=9) is False
+    assert cache.set("a", (0, b"old"), size=3, replace_if=lambda previous: previous[0] <= 0) is False
+    assert cache.get("a") == (1, b"aaaa")
+    assert cache.set("c", (1, b"cc"), size=2)
+    assert cache.stats() == (2, 6)
+    assert cache.discard_where(lambda key, _value: key == "c") == 1
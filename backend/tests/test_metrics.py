@@ -0,0 +1,51 @@
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = Counter("demo_requests_total", "Demo requests.", ("route",))
+    latency = Histogram("demo_latency_seconds", "Demo latency.", ("route",), buckets=(0.1, 1.0))
+    registry.register(requests)
+    registry.register(latency)
+
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(3, route="/a")
+
+    rendered = registry.render()
+    assert "# TYPE demo_requests_total counter" in rendered
+    assert 'demo_requests_total{route="/a\\"b"} 3' in rendered
+    assert 'demo_latency_seconds_bucket{route="/a",le="0.1"} 1' in rendered
+    assert 'demo_latency_seconds_bucket{route="/a",le="1"} 2' in rendered
+    assert 'demo_latency_seconds_bucket{route="/a",le="+Inf"} 3' in rendered
+    assert 'demo_latency_seconds_sum{route="/a"} 3.55' in rendered
+    assert 'demo_latency_seconds_count{route="/a"} 3' in rendered
+
+
+def test_metrics_endpoint_reports_route_latency_and_query_counts(client):
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": "metrics@example.com", "password": "password123", "display_name": "Metrics"},
+    )
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "metrics@example.com", "password": "password123"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    warehouse_id = client.post("/api/v1/warehouses", json={"name": "Main"}, headers=headers).json()["id"]
+    assert client.get(f"/api/v1/warehouses/{warehouse_id}/items", headers=headers).status_code == 200
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    body = res.text
+    route = "/api/v1/warehouses/{warehouse_id}/items"
+    assert f'mw_http_requests_total{{method="GET",route="{route}",status="200"}}' in body
+    assert f'mw_http_request_duration_seconds_count{{method="GET",route="{route}"}}' in body
+    assert f'mw_http_request_db_queries_count{{method="GET",route="{route}"}}' in body
+    assert "mw_threadpool_capacity_threads" in body
+    assert "mw_intake_batch_workers_active 0" in body
+    assert "# TYPE mw_llm_requests_total counter" in body
+    assert warehouse_id not in body
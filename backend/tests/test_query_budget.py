@@ -0,0 +1,121 @@
+import logging
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.query_budget import QueryBudgetMiddleware
+from app.db.session import engine
+
+
+def signup_and_login(client, email: str) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "password123", "display_name": email.split("@")[0]},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def create_warehouse(client, headers, name: str = "Budget WH") -> str:
+    res = client.post("/api/v1/warehouses", json={"name": name}, headers=headers)
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def create_box(client, headers, warehouse_id: str) -> str:
+    res = client.post(f"/api/v1/warehouses/{warehouse_id}/boxes", json={"name": "Shelf"}, headers=headers)
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def push_item_creates(client, headers, warehouse_id: str, box_id: str, count: int):
+    commands = [
+        {
+            "command_id": str(uuid.uuid4()),
+            "type": "item.create",
+            "entity_id": str(uuid.uuid4()),
+            "payload": {"box_id": box_id, "name": f"Item {index}"},
+        }
+        for index in range(count)
+    ]
+    return client.post(
+        "/api/v1/sync/push",
+        json={"warehouse_id": warehouse_id, "device_id": "budget-device", "commands": commands},
+        headers=headers,
+    )
+
+
+def build_probe_app(repeats: int, *, server_timing: bool) -> FastAPI:
+    probe = FastAPI()
+    probe.add_middleware(QueryBudgetMiddleware, server_timing=server_timing)
+
+    @probe.get("/probe/{name}")
+    def run_queries(name: str) -> dict[str, str]:
+        with engine.connect() as conn:
+            for _ in range(repeats):
+                conn.execute(text("SELECT 1")).scalar()
+        return {"name": name}
+
+    return probe
+
+
+def test_read_endpoints_do_not_scale_queries_with_rows(client, query_budget):
+    headers = signup_and_login(client, "budget-reads@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    box_id = create_box(client, headers, warehouse_id)
+    assert push_item_creates(client, headers, warehouse_id, box_id, 10).status_code == 200
+
+    # Includes the change_log max(seq) lookup that backs the ETag of items and tree.
+    with query_budget(5):
+        assert client.get(f"/api/v1/warehouses/{warehouse_id}/items", headers=headers).status_code == 200
+        assert client.get(f"/api/v1/warehouses/{warehouse_id}/boxes/tree", headers=headers).status_code == 200
+        assert client.get(f"/api/v1/warehouses/{warehouse_id}/export", headers=headers).status_code == 200
+
+
+def test_bulk_write_endpoints_stay_within_budget(client, query_budget):
+    headers = signup_and_login(client, "budget-writes@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    box_id = create_box(client, headers, warehouse_id)
+
+    # Both endpoints still apply rows one at a time; these budgets pin today's cost so loops do not grow.
+    with query_budget(105):
+        assert push_item_creates(client, headers, warehouse_id, box_id, 10).status_code == 200
+
+    snapshot = client.get(f"/api/v1/warehouses/{warehouse_id}/export", headers=headers).json()
+    target_warehouse_id = create_warehouse(client, headers, "Budget Target")
+    with query_budget(120):
+        imported = client.post(f"/api/v1/warehouses/{target_warehouse_id}/import", json=snapshot, headers=headers)
+        assert imported.status_code == 200
+
+
+def test_query_budget_middleware_sets_server_timing_and_warns_on_repeats(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "query_count_warning_threshold", 5)
+    monkeypatch.setattr(settings, "query_repeated_statement_threshold", 3)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_budget"):
+        with TestClient(build_probe_app(6, server_timing=True)) as probe_client:
+            res = probe_client.get("/probe/loop")
+
+    assert res.status_code == 200
+    server_timing = res.headers["server-timing"]
+    assert server_timing.startswith("db;dur=")
+    assert 'desc="6 queries"' in server_timing
+    assert "app;dur=" in server_timing
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("query budget exceeded" in message and "route=/probe/{name}" in message for message in messages)
+    assert any("Possible N+1 query" in message and "repeats=6" in message for message in messages)
+
+
+def test_query_budget_middleware_omits_server_timing_outside_debug(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "query_count_warning_threshold", 5)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_budget"):
+        with TestClient(build_probe_app(2, server_timing=False)) as probe_client:
+            res = probe_client.get("/probe/quiet")
+
+    assert res.status_code == 200
+    assert "server-timing" not in res.headers
+    assert caplog.records == []
@@ -0,0 +1,131 @@
+import os
+import re
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.sql import Select
+
+from app.api.v1.endpoints import boxes as boxes_endpoint
+from app.api.v1.endpoints import intake as intake_endpoint
+from app.api.v1.endpoints import items as items_endpoint
+from app.api.v1.endpoints import sync as sync_endpoint
+from app.api.v1.endpoints import warehouses as warehouses_endpoint
+from app.db.session import engine
+from app.models.base import Base
+from app.services.intake_processing import pending_drafts_query
+from app.services.read_models import box_nodes_query
+
+WAREHOUSE_ID = "00000000-0000-0000-0000-000000000001"
+
+# Each statement comes from the builder the endpoint or worker itself executes.
+HOT_QUERIES: dict[str, tuple[Select, str, str]] = {
+    "items_list": (
+        items_endpoint._items_list_query(warehouse_id=WAREHOUSE_ID, include_deleted=False, with_photo=None),
+        "items",
+        "ix_items_warehouse_active_created",
+    ),
+    "box_items": (
+        boxes_endpoint._subtree_items_query(WAREHOUSE_ID, {"box-a", "box-b"}, None),
+        "items",
+        "ix_items_warehouse_box_active",
+    ),
+    "box_tree": (
+        box_nodes_query(WAREHOUSE_ID),
+        "boxes",
+        "ix_boxes_warehouse_deleted",
+    ),
+    "box_short_code_lookup": (
+        boxes_endpoint._short_code_lookup_query("BX-ABC123"),
+        "boxes",
+        "ix_boxes_short_code",
+    ),
+    "sync_pull": (
+        sync_endpoint._changes_since_query(WAREHOUSE_ID, 10),
+        "change_log",
+        "ix_change_log_warehouse_seq",
+    ),
+    "intake_pending_drafts": (
+        pending_drafts_query(WAREHOUSE_ID, "batch-a"),
+        "intake_drafts",
+        "ix_intake_drafts_batch_status_position",
+    ),
+    "activity_feed": (
+        warehouses_endpoint._activity_feed_query(WAREHOUSE_ID, limit=51),
+        "activity_events",
+        "ix_activity_events_warehouse_created_id",
+    ),
+    "activity_entity_history": (
+        warehouses_endpoint._activity_feed_query(WAREHOUSE_ID, entity_type="item", entity_id="item-a", limit=51),
+        "activity_events",
+        "ix_activity_events_warehouse_entity",
+    ),
+    "intake_batches_list": (
+        intake_endpoint._batches_list_query(WAREHOUSE_ID, user_id=None, include_committed=True, limit=20),
+        "intake_batches",
+        "ix_intake_batches_warehouse_updated",
+    ),
+}
+
+# change_log.seq is the SQLite rowid, which every secondary index already carries.
+SQLITE_EQUIVALENT_INDEXES = {"ix_change_log_warehouse_seq": ("ix_change_log_warehouse_id",)}
+
+
+def _compile(statement: Select, bind) -> str:
+    return str(statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.parametrize("query_name", sorted(HOT_QUERIES))
+def test_sqlite_hot_queries_use_composite_indexes(query_name):
+    statement, table_name, index_name = HOT_QUERIES[query_name]
+    with engine.connect() as conn:
+        plan = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {_compile(statement, engine)}")]
+
+    table_steps = [step for step in plan if re.search(rf"\b{table_name}\b", step)]
+    assert table_steps, plan
+    assert not [step for step in table_steps if step.startswith("SCAN") and "INDEX" not in step], plan
+    accepted = {index_name, *SQLITE_EQUIVALENT_INDEXES.get(index_name, ())}
+    assert any(name in step for step in table_steps for name in accepted), plan
+
+
+@pytest.fixture(scope="module")
+def postgres_engine():
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    # A throwaway schema, so pointing TEST_POSTGRES_URL at a shared database never drops its tables.
+    schema = f"query_plans_{uuid.uuid4().hex[:12]}"
+    admin_engine = create_engine(url, future=True)
+    with admin_engine.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    pg_engine = create_engine(url, future=True, connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        Base.metadata.create_all(bind=pg_engine)
+        yield pg_engine
+    finally:
+        pg_engine.dispose()
+        with admin_engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin_engine.dispose()
+
+
+def _plan_nodes(node: dict) -> list[dict]:
+    nodes = [node]
+    for child in node.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+@pytest.mark.parametrize("query_name", sorted(HOT_QUERIES))
+def test_postgres_hot_queries_avoid_sequential_scans(postgres_engine, query_name):
+    statement, table_name, index_name = HOT_QUERIES[query_name]
+    with postgres_engine.begin() as conn:
+        # Empty test tables would always favour a seq scan; force the planner to show usable indexes.
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        raw_plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {_compile(statement, postgres_engine)}")).scalar_one()
+
+    nodes = _plan_nodes(raw_plan[0]["Plan"])
+    table_nodes = [node for node in nodes if node.get("Relation Name") == table_name]
+    assert table_nodes, raw_plan
+    assert not [node for node in table_nodes if node["Node Type"] == "Seq Scan"], raw_plan
+    assert any(node.get("Index Name") == index_name for node in table_nodes), raw_plan
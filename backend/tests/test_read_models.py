@@ -0,0 +1,84 @@
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+from app.models.item import Item
+from app.services.read_models import (
+    BoxNode,
+    ItemRow,
+    children_by_parent,
+    count_active_items_by_box,
+    fetch_rows,
+    load_active_item_tags,
+    load_box_nodes,
+    select_columns,
+)
+
+
+def signup_and_login(client, email: str) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "password123", "display_name": email.split("@")[0]},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def create_box(client, headers, warehouse_id: str, name: str, parent_box_id: str | None = None) -> str:
+    res = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/boxes",
+        json={"name": name, "parent_box_id": parent_box_id},
+        headers=headers,
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def create_item(client, headers, warehouse_id: str, box_id: str, name: str, tags: list[str]) -> str:
+    res = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/items",
+        json={"box_id": box_id, "name": name, "tags": tags},
+        headers=headers,
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def test_read_models_load_tuples_without_touching_the_identity_map(client):
+    headers = signup_and_login(client, "read-models@example.com")
+    warehouse_id = client.post("/api/v1/warehouses", json={"name": "Read WH"}, headers=headers).json()["id"]
+    garage = create_box(client, headers, warehouse_id, "Garage")
+    shelf = create_box(client, headers, warehouse_id, "Shelf", garage)
+    create_item(client, headers, warehouse_id, garage, "Drill", ["tools"])
+    create_item(client, headers, warehouse_id, shelf, "Tape", ["tools", "office"])
+    removed = create_item(client, headers, warehouse_id, shelf, "Broken", ["junk"])
+    assert client.delete(f"/api/v1/warehouses/{warehouse_id}/items/{removed}", headers=headers).status_code == 200
+
+    with Session(bind=engine) as db:
+        nodes = load_box_nodes(db, warehouse_id)
+        items = fetch_rows(db, ItemRow, select_columns(Item, ItemRow).where(Item.warehouse_id == warehouse_id))
+
+        assert isinstance(nodes[shelf], BoxNode)
+        assert nodes[shelf].parent_box_id == garage
+        assert shelf in children_by_parent(nodes)[garage]
+        assert {item.name for item in items} == {"Drill", "Tape", "Broken"}
+        assert count_active_items_by_box(db, warehouse_id) == {garage: 1, shelf: 1}
+        assert sorted(load_active_item_tags(db, warehouse_id)) == [["tools"], ["tools", "office"]]
+        assert len(db.identity_map) == 0
+
+
+def test_tree_counts_from_grouped_item_counts(client):
+    headers = signup_and_login(client, "read-tree@example.com")
+    warehouse_id = client.post("/api/v1/warehouses", json={"name": "Tree WH"}, headers=headers).json()["id"]
+    garage = create_box(client, headers, warehouse_id, "Garage")
+    shelf = create_box(client, headers, warehouse_id, "Shelf", garage)
+    create_item(client, headers, warehouse_id, garage, "Drill", ["tools"])
+    create_item(client, headers, warehouse_id, shelf, "Tape", ["tools"])
+
+    tree = client.get(f"/api/v1/warehouses/{warehouse_id}/boxes/tree", headers=headers).json()
+    nodes = {node["box"]["name"]: node for node in tree}
+    assert nodes["Garage"]["level"] == 0
+    assert nodes["Garage"]["total_items_recursive"] == 2
+    assert nodes["Garage"]["total_boxes_recursive"] == 1
+    assert nodes["Shelf"]["level"] == 1
+    assert nodes["Shelf"]["total_items_recursive"] == 1
+    assert nodes["Shelf"]["box"]["short_code"]
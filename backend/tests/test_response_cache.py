@@ -0,0 +1,184 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.response_cache import (
+    RESPONSE_CACHE_LOOKUPS,
+    LocalSharedResponseCache,
+    MemoryResponseCache,
+    reset_response_cache,
+    set_shared_response_cache,
+)
+
+
+def signup_and_login(client, email: str) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "password123", "display_name": email.split("@")[0]},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def create_warehouse(client, headers) -> str:
+    res = client.post("/api/v1/warehouses", json={"name": "Cache WH"}, headers=headers)
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def create_box(client, headers, warehouse_id: str, name: str = "Shelf") -> str:
+    res = client.post(f"/api/v1/warehouses/{warehouse_id}/boxes", json={"name": name}, headers=headers)
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def create_item(client, headers, warehouse_id: str, box_id: str, name: str) -> str:
+    res = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/items",
+        json={"box_id": box_id, "name": name, "tags": ["tools"]},
+        headers=headers,
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def lookups(endpoint: str, result: str) -> float:
+    return RESPONSE_CACHE_LOOKUPS.value(endpoint=endpoint, result=result)
+
+
+def test_tree_and_tag_cloud_hits_skip_the_heavy_queries(client, query_budget):
+    headers = signup_and_login(client, "cache-tree@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    box_id = create_box(client, headers, warehouse_id)
+    create_item(client, headers, warehouse_id, box_id, "Drill")
+    base = f"/api/v1/warehouses/{warehouse_id}"
+
+    for endpoint, url in (("box_tree", f"{base}/boxes/tree"), ("tag_cloud", f"{base}/tags/cloud")):
+        misses, hits = lookups(endpoint, "miss"), lookups(endpoint, "hit")
+        first = client.get(url, headers=headers)
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "application/json"
+
+        with query_budget(3):
+            second = client.get(url, headers=headers)
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert lookups(endpoint, "miss") == misses + 1
+        assert lookups(endpoint, "hit") == hits + 1
+
+    create_box(client, headers, warehouse_id, "Attic")
+    tree = client.get(f"{base}/boxes/tree", headers=headers).json()
+    assert "Attic" in [node["box"]["name"] for node in tree]
+
+
+def test_item_list_cache_is_per_user_and_skips_searches(client):
+    owner_headers = signup_and_login(client, "cache-owner@example.com")
+    guest_headers = signup_and_login(client, "cache-guest@example.com")
+    warehouse_id = create_warehouse(client, owner_headers)
+    invite = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/invites",
+        json={"email": "cache-guest@example.com"},
+        headers=owner_headers,
+    )
+    client.post(f"/api/v1/invites/{invite.json()['invite_token']}/accept", headers=guest_headers)
+    box_id = create_box(client, owner_headers, warehouse_id)
+    item_id = create_item(client, owner_headers, warehouse_id, box_id, "Drill")
+    url = f"/api/v1/warehouses/{warehouse_id}/items"
+
+    favorite = client.post(f"{url}/{item_id}/favorite", json={"is_favorite": True}, headers=owner_headers)
+    assert favorite.status_code == 200
+    assert client.get(url, headers=owner_headers).json()[0]["is_favorite"] is True
+    assert client.get(url, headers=guest_headers).json()[0]["is_favorite"] is False
+    assert client.get(url, headers=owner_headers).json()[0]["is_favorite"] is True
+
+    misses = lookups("items", "miss")
+    searched = client.get(url, params={"q": "drill"}, headers=owner_headers)
+    assert searched.status_code == 200
+    assert searched.json()[0]["name"] == "Drill"
+    assert lookups("items", "miss") == misses
+
+
+def test_shared_backend_fills_a_cold_process_cache(client):
+    shared = LocalSharedResponseCache()
+    set_shared_response_cache(shared)
+    headers = signup_and_login(client, "cache-shared@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    create_box(client, headers, warehouse_id)
+    url = f"/api/v1/warehouses/{warehouse_id}/boxes/tree"
+    first = client.get(url, headers=headers)
+
+    # A fresh process cache (another worker) still finds the body in the shared backend.
+    reset_response_cache()
+    set_shared_response_cache(shared)
+    shared_hits = lookups("box_tree", "shared_hit")
+    second = client.get(url, headers=headers)
+    assert second.content == first.content
+    assert lookups("box_tree", "shared_hit") == shared_hits + 1
+
+
+class LoopCheckingSharedCache(LocalSharedResponseCache):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls_on_loop = 0
+
+    def _record(self) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self.calls_on_loop += 1
+
+    def get(self, key: str) -> bytes | None:
+        self._record()
+        return super().get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._record()
+        super().set(key, value, ttl_seconds)
+
+
+def test_async_item_list_keeps_shared_cache_io_off_the_event_loop(client):
+    shared = LoopCheckingSharedCache()
+    set_shared_response_cache(shared)
+    headers = signup_and_login(client, "cache-shared-async@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    create_item(client, headers, warehouse_id, create_box(client, headers, warehouse_id), "Drill")
+    url = f"/api/v1/warehouses/{warehouse_id}/items"
+    first = client.get(url, headers=headers)
+
+    reset_response_cache()
+    set_shared_response_cache(shared)
+    shared_hits = lookups("items", "shared_hit")
+    assert client.get(url, headers=headers).content == first.content
+    assert lookups("items", "shared_hit") == shared_hits + 1
+    assert shared.calls_on_loop == 0
+
+
+def test_disabled_cache_still_serves_fresh_bodies(client, monkeypatch):
+    monkeypatch.setattr(settings, "response_cache_enabled", False)
+    headers = signup_and_login(client, "cache-disabled@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    create_box(client, headers, warehouse_id)
+    url = f"/api/v1/warehouses/{warehouse_id}/boxes/tree"
+
+    hits = lookups("box_tree", "hit")
+    assert client.get(url, headers=headers).json() == client.get(url, headers=headers).json()
+    assert lookups("box_tree", "hit") == hits
+
+
+def test_memory_cache_enforces_limits_and_keeps_newest_seq():
+    cache = MemoryResponseCache(max_entries=2, max_bytes=10, max_entry_bytes=6)
+    assert cache.set(("wh", "tree", "a"), 1, b"1234567") is False
+    assert cache.set(("wh", "tree", "a"), 1, b"aaaa")
+    assert cache.set(("wh", "tree", "b"), 1, b"bbbb")
+    assert cache.get(("wh", "tree", "a"), 1) == b"aaaa"
+
+    # Over max_bytes: the least recently used variant goes first.
+    assert cache.set(("wh", "tree", "c"), 1, b"cccc")
+    assert cache.get(("wh", "tree", "b"), 1) is None
+    assert cache.stats() == (2, 8)
+
+    assert cache.set(("wh", "tree", "a"), 3, b"new")
+    assert cache.get(("wh", "tree", "a"), 1) is None
+    assert cache.set(("wh", "tree", "a"), 2, b"old") is False
+    assert cache.get(("wh", "tree", "a"), 3) == b"new"
@@ -2,8 +2,9 @@ from base64 import b64decode
 from pathlib import Path
 import time
 
-from app.core.config import settings
+import pytest
 
+from app.core.config import settings
 
 SAMPLE_IMAGE_DATA_URL = (
     "data:image/png;base64,"
@@ -857,3 +858,260 @@ def test_delete_draft_removes_temp_photo_and_draft_row(client):
         headers=headers,
     )
     assert patch_deleted.status_code == 404
+
+
+def test_batch_event_stream_pushes_draft_results(client, monkeypatch):
+    import json
+
+    from app.api.v1.endpoints import intake as intake_endpoint
+    from app.services import intake_processing as intake_service
+
+    headers = signup_and_login(client, "slice10-events@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    box_id = create_box(client, headers, warehouse_id)
+
+    created = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches",
+        json={"target_box_id": box_id, "name": "Lote streaming"},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    batch_id = created.json()["batch"]["id"]
+
+    png_bytes = b64decode(SAMPLE_IMAGE_DATA_URL.split(",", 1)[1])
+    upload = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}/photos",
+        files=[("files", ("stream.png", png_bytes, "image/png"))],
+        headers=headers,
+    )
+    assert upload.status_code == 201
+    draft_id = upload.json()["drafts"][0]["id"]
+
+    def slow_process_photo_url(**_kwargs):
+        time.sleep(0.3)
+        return {
+            "name": "Articulo en streaming",
+            "description": "Procesado en segundo plano.",
+            "tags": ["streaming", "inventario", "lote"],
+            "aliases": [],
+            "confidence": 0.8,
+            "warnings": [],
+            "llm_used": True,
+        }
+
+    monkeypatch.setattr(intake_service, "_process_photo_url", slow_process_photo_url)
+    monkeypatch.setattr(intake_endpoint, "_SSE_POLL_SECONDS", 0.2)
+    monkeypatch.setattr(intake_endpoint, "_SSE_MAX_STREAM_SECONDS", 1.5)
+
+    start = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}/start",
+        json={"retry_errors": False},
+        headers=headers,
+    )
+    assert start.status_code == 200
+
+    stream = client.get(f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}/events", headers=headers)
+    assert stream.status_code == 200
+    assert stream.headers["content-type"].startswith("text/event-stream")
+
+    events: list[tuple[str, dict]] = []
+    for chunk in stream.text.split("\n\n"):
+        lines = chunk.strip().splitlines()
+        if len(lines) == 2 and lines[0].startswith("event: "):
+            events.append((lines[0][len("event: ") :], json.loads(lines[1][len("data: ") :])))
+
+    assert events[0][0] == "snapshot"
+    assert events[0][1]["batch"]["id"] == batch_id
+    draft_events = [payload for name, payload in events if name == "draft"]
+    assert draft_events
+    assert draft_events[-1]["draft"]["id"] == draft_id
+    assert draft_events[-1]["draft"]["status"] == "ready"
+    assert draft_events[-1]["batch"]["processed_count"] == 1
+
+    forbidden_headers = signup_and_login(client, "slice10-events-outsider@example.com")
+    forbidden = client.get(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}/events",
+        headers=forbidden_headers,
+    )
+    assert forbidden.status_code == 403
+
+
+def test_batch_status_counters_track_draft_transitions(client):
+    from sqlalchemy import update
+
+    from app.db.session import SessionLocal
+    from app.models.intake_batch import IntakeBatch
+    from app.services.intake_processing import (
+        batch_status_counts,
+        process_intake_batch,
+        reconcile_batch_counters,
+        resolve_batch_status_counts,
+    )
+
+    headers = signup_and_login(client, "slice10-counters@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    box_id = create_box(client, headers, warehouse_id)
+
+    created = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches",
+        json={"target_box_id": box_id, "name": "Lote contadores"},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    batch_id = created.json()["batch"]["id"]
+    assert created.json()["batch"]["total_count"] == 0
+
+    png_bytes = b64decode(SAMPLE_IMAGE_DATA_URL.split(",", 1)[1])
+    upload = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}/photos",
+        files=[("files", (f"counter-{index}.png", png_bytes, "image/png")) for index in range(3)],
+        headers=headers,
+    )
+    assert upload.status_code == 201
+    assert upload.json()["batch"]["total_count"] == 3
+    assert upload.json()["batch"]["status_counts"] == {"uploaded": 3}
+    draft_ids = [draft["id"] for draft in upload.json()["drafts"]]
+
+    rejected = client.patch(
+        f"/api/v1/warehouses/{warehouse_id}/intake/drafts/{draft_ids[0]}",
+        json={"status": "rejected"},
+        headers=headers,
+    )
+    assert rejected.status_code == 200
+
+    deleted = client.delete(
+        f"/api/v1/warehouses/{warehouse_id}/intake/drafts/{draft_ids[1]}",
+        headers=headers,
+    )
+    assert deleted.status_code == 200
+
+    detail = client.get(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}",
+        headers=headers,
+    )
+    assert detail.status_code == 200
+    assert detail.json()["batch"]["status_counts"] == {"uploaded": 1, "rejected": 1}
+    assert detail.json()["batch"]["total_count"] == 2
+    assert detail.json()["batch"]["processed_count"] == 1
+
+    with SessionLocal() as db:
+        batch = db.get(IntakeBatch, batch_id)
+        assert batch_status_counts(batch) == resolve_batch_status_counts(db, batch_id)
+        assert reconcile_batch_counters(db, batch_ids=[batch_id]) == 0
+
+        db.execute(update(IntakeBatch).where(IntakeBatch.id == batch_id).values(uploaded_count=7, total_count=8))
+        db.commit()
+        assert reconcile_batch_counters(db, only_open=True) == 1
+        db.commit()
+        db.refresh(batch)
+        assert batch_status_counts(batch) == {"uploaded": 1, "rejected": 1}
+        assert batch.total_count == 2
+
+    rejected = client.patch(
+        f"/api/v1/warehouses/{warehouse_id}/intake/drafts/{draft_ids[2]}",
+        json={"status": "rejected"},
+        headers=headers,
+    )
+    assert rejected.status_code == 200
+
+    # An endpoint marks the batch processing, but another worker already drained the drafts.
+    stuck = {"status": "processing", "finished_at": None}
+    with SessionLocal() as db:
+        db.execute(update(IntakeBatch).where(IntakeBatch.id == batch_id).values(**stuck))
+        db.commit()
+    assert process_intake_batch(warehouse_id, batch_id) == 0
+    with SessionLocal() as db:
+        batch = db.get(IntakeBatch, batch_id)
+        assert batch.status == "review"
+        assert batch.finished_at is not None
+
+        db.execute(update(IntakeBatch).where(IntakeBatch.id == batch_id).values(**stuck))
+        db.commit()
+        assert reconcile_batch_counters(db, only_open=True) == 1
+        db.commit()
+        db.refresh(batch)
+        assert batch.status == "review"
+        assert batch.finished_at is not None
+        assert reconcile_batch_counters(db, only_open=True) == 0
+
+
+def test_bulk_commit_writes_items_stock_and_change_log_in_draft_order(client, monkeypatch):
+    from sqlalchemy import select
+
+    from app.api.v1.endpoints import intake as intake_endpoints
+    from app.db.session import SessionLocal
+    from app.models.change_log import ChangeLog
+    from app.models.stock_movement import StockMovement
+
+    headers = signup_and_login(client, "slice10-bulk-commit@example.com")
+    warehouse_id = create_warehouse(client, headers)
+    box_id = create_box(client, headers, warehouse_id)
+
+    created = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches",
+        json={"target_box_id": box_id, "name": "Lote masivo"},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    batch_id = created.json()["batch"]["id"]
+
+    png_bytes = b64decode(SAMPLE_IMAGE_DATA_URL.split(",", 1)[1])
+    upload = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}/photos",
+        files=[("files", (f"bulk-{index}.png", png_bytes, "image/png")) for index in range(3)],
+        headers=headers,
+    )
+    assert upload.status_code == 201
+    draft_ids = [draft["id"] for draft in upload.json()["drafts"]]
+    for index, draft_id in enumerate(draft_ids):
+        ready = client.patch(
+            f"/api/v1/warehouses/{warehouse_id}/intake/drafts/{draft_id}",
+            json={"name": f"Articulo {index}", "quantity": index + 1, "status": "ready"},
+            headers=headers,
+        )
+        assert ready.status_code == 200
+
+    batch_dir = Path(settings.media_root) / warehouse_id / "intake" / batch_id
+
+    def failing_activity(*_args, **_kwargs):
+        raise RuntimeError("activity store unavailable")
+
+    monkeypatch.setattr(intake_endpoints, "record_activity", failing_activity)
+    with pytest.raises(RuntimeError):
+        client.post(
+            f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}/commit",
+            json={"include_review": False},
+            headers=headers,
+        )
+    assert len(list(batch_dir.iterdir())) == 3
+    monkeypatch.undo()
+
+    commit = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/intake/batches/{batch_id}/commit",
+        json={"include_review": False},
+        headers=headers,
+    )
+    assert commit.status_code == 200
+    assert commit.json()["created"] == 3
+    assert commit.json()["batch"]["status"] == "committed"
+    assert commit.json()["batch"]["committed_count"] == 3
+
+    items = client.get(f"/api/v1/warehouses/{warehouse_id}/items", headers=headers)
+    assert sorted((item["name"], item["stock"]) for item in items.json()) == [
+        ("Articulo 0", 1),
+        ("Articulo 1", 2),
+        ("Articulo 2", 3),
+    ]
+
+    with SessionLocal() as db:
+        entries = db.scalars(
+            select(ChangeLog)
+            .where(ChangeLog.warehouse_id == warehouse_id, ChangeLog.entity_type.in_(["item", "stock"]))
+            .order_by(ChangeLog.seq.asc())
+        ).all()
+        assert [(entry.entity_type, entry.action) for entry in entries] == [("item", "create"), ("stock", "adjust")] * 3
+        assert [entry.payload_json.get("name") for entry in entries[::2]] == ["Articulo 0", "Articulo 1", "Articulo 2"]
+        movements = db.scalars(select(StockMovement).where(StockMovement.warehouse_id == warehouse_id)).all()
+        assert {movement.command_id for movement in movements} == {
+            entry.payload_json["command_id"] for entry in entries[1::2]
+        }
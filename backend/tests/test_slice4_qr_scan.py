@@ -1,7 +1,21 @@
-from app.db.session import engine
-from app.models.box import Box
+import threading
+
+from sqlalchemy import event, select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.box import Box
+from app.models.box_code_sequence import BoxCodeSequence
+from app.services.box_codes import (
+    SHORT_CODE_SPACE,
+    clear_short_code_pool,
+    coerce_unique_short_code,
+    format_short_code,
+    generate_unique_short_code,
+    scramble_short_code_value,
+)
+
 
 def signup_and_login(client, email: str) -> dict[str, str]:
     client.post(
@@ -115,3 +129,137 @@ def test_box_resolve_by_short_code_returns_conflict_when_ambiguous(client):
 
     resolved = client.get(f"/api/v1/boxes/resolve/{duplicate_short_code}", headers=owner_headers)
     assert resolved.status_code == 409
+
+
+def test_box_lookup_cache_is_invalidated_by_box_updates_and_deletes(client):
+    owner_headers = signup_and_login(client, "qr-cache@example.com")
+    warehouse_id = create_warehouse(client, owner_headers)
+    box = client.post(
+        f"/api/v1/warehouses/{warehouse_id}/boxes",
+        json={"name": "Cached Box"},
+        headers=owner_headers,
+    ).json()
+
+    assert client.get(f"/api/v1/boxes/by-qr/{box['qr_token']}", headers=owner_headers).json()["name"] == "Cached Box"
+    assert client.get(f"/api/v1/boxes/resolve/{box['short_code']}", headers=owner_headers).status_code == 200
+
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        cached = client.get(f"/api/v1/boxes/by-qr/{box['qr_token']}", headers=owner_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert cached.status_code == 200
+    assert not [statement for statement in statements if "FROM boxes" in statement or "FROM memberships" in statement]
+
+    renamed = client.patch(
+        f"/api/v1/warehouses/{warehouse_id}/boxes/{box['id']}",
+        json={"name": "Renamed Box"},
+        headers=owner_headers,
+    )
+    assert renamed.status_code == 200
+    assert client.get(f"/api/v1/boxes/by-qr/{box['qr_token']}", headers=owner_headers).json()["name"] == "Renamed Box"
+
+    with Session(bind=engine) as db:
+        stored = db.get(Box, box["id"])
+        assert stored is not None
+        stored.short_code = "  bx-lower1 "
+        db.commit()
+        assert stored.short_code == "BX-LOWER1"
+    assert client.get(f"/api/v1/boxes/resolve/{box['short_code']}", headers=owner_headers).status_code == 404
+    assert client.get("/api/v1/boxes/resolve/bx-lower1", headers=owner_headers).status_code == 200
+
+    deleted = client.request(
+        "DELETE",
+        f"/api/v1/warehouses/{warehouse_id}/boxes/{box['id']}",
+        json={},
+        headers=owner_headers,
+    )
+    assert deleted.status_code == 200
+    assert client.get(f"/api/v1/boxes/by-qr/{box['qr_token']}", headers=owner_headers).status_code == 404
+
+
+def test_short_code_scramble_is_a_bijection():
+    key = 0xA5C3F1
+    scrambled = {scramble_short_code_value(value, key) for value in range(1 << 16)}
+    assert len(scrambled) == 1 << 16
+    assert all(0 <= value < SHORT_CODE_SPACE for value in scrambled)
+    assert format_short_code(0xABC) == "BX-000ABC"
+
+
+def test_short_code_allocator_reserves_blocks_and_skips_legacy_codes(client):
+    owner_headers = signup_and_login(client, "code-alloc@example.com")
+    warehouse_id = create_warehouse(client, owner_headers)
+    clear_short_code_pool()
+
+    with Session(bind=engine) as db:
+        sequence = db.get(BoxCodeSequence, "box_short_code")
+        assert sequence is not None
+        legacy_code = format_short_code(scramble_short_code_value(sequence.next_value, sequence.scramble_key))
+        inbound_box = db.scalar(select(Box).where(Box.warehouse_id == warehouse_id))
+        inbound_box.short_code = legacy_code
+        db.commit()
+
+        statements: list[str] = []
+
+        def record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            codes = [generate_unique_short_code(db) for _ in range(600)]
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    assert len(set(codes)) == 600
+    assert legacy_code not in codes
+    # Three 256-code blocks: one UPDATE ... RETURNING and one IN probe each, nothing per code.
+    assert sum("box_code_sequences" in statement for statement in statements) == 3
+    assert len(statements) <= 3 * 2
+
+
+def test_concurrent_sessions_reserve_disjoint_short_code_blocks(client):
+    signup_and_login(client, "code-race@example.com")
+    clear_short_code_pool()
+    barrier = threading.Barrier(2)
+    results: list[set[str]] = []
+
+    def reserve() -> None:
+        with SessionLocal() as db:
+            barrier.wait()
+            codes = {generate_unique_short_code(db) for _ in range(10)}
+            db.commit()
+        results.append(codes)
+
+    threads = [threading.Thread(target=reserve) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 2
+    assert not results[0] & results[1]
+
+
+def test_pooled_short_code_taken_as_preferred_code_is_skipped(client):
+    owner_headers = signup_and_login(client, "code-pool@example.com")
+    warehouse_id = create_warehouse(client, owner_headers)
+    clear_short_code_pool()
+
+    with Session(bind=engine) as db:
+        first = generate_unique_short_code(db)
+        db.commit()
+        sequence = db.get(BoxCodeSequence, "box_short_code")
+        block_start = sequence.next_value - settings.box_short_code_block_size
+        assert first == format_short_code(scramble_short_code_value(block_start, sequence.scramble_key))
+        # The rest of the block now sits in the process pool; an import keeps the next one as a preferred code.
+        pooled_next = format_short_code(scramble_short_code_value(block_start + 1, sequence.scramble_key))
+        inbound_box = db.scalar(select(Box).where(Box.warehouse_id == warehouse_id))
+        inbound_box.short_code = coerce_unique_short_code(db, pooled_next, exclude_box_id=inbound_box.id)
+        db.commit()
+
+        assert inbound_box.short_code == pooled_next
+        assert generate_unique_short_code(db) not in {first, pooled_next}
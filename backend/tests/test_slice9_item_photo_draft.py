@@ -142,7 +142,8 @@ def test_upload_photo_and_use_photo_url_in_item(client):
     assert f"/media/{warehouse_id}/" in photo_url
 
     photo_path = urlparse(photo_url).path
-    fetched = client.get(photo_path)
+    assert client.get(photo_path).status_code == 403
+    fetched = client.get(photo_url)
     assert fetched.status_code == 200
     assert fetched.headers["content-type"] == "image/png"
 
@@ -15,6 +15,7 @@ import { finalize, switchMap } from 'rxjs/operators';
 import { generateUuid } from '../core/uuid';
 import {
   IntakeBatch,
+  IntakeBatchStreamEvent,
   IntakeDraft,
   IntakeService
 } from '../services/intake.service';
@@ -43,6 +44,7 @@ interface CaptureUploadEntry {
 }
 
 const AUTO_REFRESH_INTERVAL_MS = 5000;
+const BATCH_STREAM_RETRY_MS = 10000;
 
 @Component({
   selector: 'app-item-intake-batch',
@@ -989,6 +991,9 @@ export class ItemIntakeBatchComponent implements OnInit, OnDestroy {
   private batchLoadInFlight = false;
   private pendingLoad: { batchId: string; silent: boolean } | null = null;
   private autoRefreshBatchId: string | null = null;
+  private batchStreamSub?: Subscription;
+  private batchStreamConnected = false;
+  private batchStreamRetryTimer: ReturnType<typeof setTimeout> | null = null;
   private pendingCapturedFile: File | null = null;
   private cameraStream: MediaStream | null = null;
   private uploadQueueBusy = false;
@@ -1585,16 +1590,21 @@ export class ItemIntakeBatchComponent implements OnInit, OnDestroy {
       return;
     }
 
+    const streamTargetChanged = this.autoRefreshBatchId !== batchId || !this.batchStreamSub;
     this.autoRefreshBatchId = batchId;
     if (this.refreshTimer) {
       clearTimeout(this.refreshTimer);
       this.refreshTimer = null;
     }
+    if (streamTargetChanged) {
+      this.openBatchStream(batchId);
+    }
     this.scheduleNextAutoRefresh();
   }
 
   private stopAutoRefresh(): void {
     this.autoRefreshBatchId = null;
+    this.closeBatchStream();
     if (!this.refreshTimer) {
       return;
     }
@@ -1602,6 +1612,75 @@ export class ItemIntakeBatchComponent implements OnInit, OnDestroy {
     this.refreshTimer = null;
   }
 
+  private openBatchStream(batchId: string): void {
+    this.closeBatchStream();
+    if (!this.selectedWarehouseId) {
+      return;
+    }
+
+    this.batchStreamSub = this.intakeService.watchBatch(this.selectedWarehouseId, batchId).subscribe({
+      next: (event) => {
+        this.batchStreamConnected = true;
+        this.applyBatchStreamEvent(batchId, event);
+      },
+      error: () => this.retryBatchStream(batchId),
+      complete: () => this.retryBatchStream(batchId, 0)
+    });
+  }
+
+  private closeBatchStream(): void {
+    this.batchStreamConnected = false;
+    this.batchStreamSub?.unsubscribe();
+    this.batchStreamSub = undefined;
+    if (this.batchStreamRetryTimer) {
+      clearTimeout(this.batchStreamRetryTimer);
+      this.batchStreamRetryTimer = null;
+    }
+  }
+
+  private retryBatchStream(batchId: string, delayMs = BATCH_STREAM_RETRY_MS): void {
+    this.batchStreamConnected = false;
+    this.batchStreamSub = undefined;
+    if (this.autoRefreshBatchId !== batchId || this.batchStreamRetryTimer) {
+      return;
+    }
+    // Polling keeps the view fresh while the stream is down.
+    this.scheduleNextAutoRefresh();
+    this.batchStreamRetryTimer = setTimeout(() => {
+      this.batchStreamRetryTimer = null;
+      if (this.autoRefreshBatchId === batchId) {
+        this.openBatchStream(batchId);
+      }
+    }, delayMs);
+  }
+
+  private applyBatchStreamEvent(batchId: string, event: IntakeBatchStreamEvent): void {
+    if (this.batch && this.batch.id !== batchId) {
+      return;
+    }
+
+    if (event.type === 'snapshot') {
+      if (!this.batchLoadInFlight) {
+        this.applyBatchPayload(event.payload.batch, event.payload.drafts);
+      }
+      return;
+    }
+
+    if (event.type === 'deleted') {
+      this.loadBatch(batchId, true);
+      return;
+    }
+
+    this.batch = event.payload.batch;
+    if (event.type === 'draft') {
+      if (this.drafts.some((draft) => draft.id === event.payload.draft.id)) {
+        this.replaceDraft(event.payload.draft);
+      } else {
+        this.loadBatch(batchId, true);
+      }
+    }
+  }
+
   private setActionError(message: string): void {
     this.errorMessage = message;
     this.notificationService.error(message);
@@ -1673,6 +1752,10 @@ export class ItemIntakeBatchComponent implements OnInit, OnDestroy {
       if (!this.autoRefreshBatchId) {
         return;
       }
+      if (this.batchStreamConnected) {
+        this.scheduleNextAutoRefresh();
+        return;
+      }
       this.loadBatch(this.autoRefreshBatchId, true);
     }, AUTO_REFRESH_INTERVAL_MS);
   }
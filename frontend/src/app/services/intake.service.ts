@@ -1,4 +1,4 @@
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpDownloadProgressEvent, HttpEventType } from '@angular/common/http';
 import { Injectable } from '@angular/core';
 import { Observable } from 'rxjs';
 
@@ -81,6 +81,12 @@ export interface IntakeBatchCommitResponse {
   errors: number;
 }
 
+export type IntakeBatchStreamEvent =
+  | { type: 'snapshot'; payload: IntakeBatchDetail }
+  | { type: 'draft'; payload: { batch: IntakeBatch; draft: IntakeDraft } }
+  | { type: 'batch'; payload: { batch: IntakeBatch } }
+  | { type: 'deleted'; payload: { batch_id: string } };
+
 @Injectable({ providedIn: 'root' })
 export class IntakeService {
   constructor(private readonly http: HttpClient) {}
@@ -106,6 +112,43 @@ export class IntakeService {
     return this.http.get<IntakeBatchDetail>(`${environment.apiBaseUrl}/warehouses/${warehouseId}/intake/batches/${batchId}`);
   }
 
+  watchBatch(warehouseId: string, batchId: string): Observable<IntakeBatchStreamEvent> {
+    return new Observable<IntakeBatchStreamEvent>((subscriber) => {
+      let consumed = 0;
+      const emitCompleteBlocks = (text: string) => {
+        let boundary = text.indexOf('\n\n', consumed);
+        while (boundary >= 0) {
+          const parsed = this.parseStreamBlock(text.slice(consumed, boundary));
+          consumed = boundary + 2;
+          if (parsed) {
+            subscriber.next(parsed);
+          }
+          boundary = text.indexOf('\n\n', consumed);
+        }
+      };
+
+      const request = this.http
+        .get(`${environment.apiBaseUrl}/warehouses/${warehouseId}/intake/batches/${batchId}/events`, {
+          observe: 'events',
+          reportProgress: true,
+          responseType: 'text'
+        })
+        .subscribe({
+          next: (event) => {
+            if (event.type === HttpEventType.DownloadProgress) {
+              emitCompleteBlocks((event as HttpDownloadProgressEvent).partialText ?? '');
+            } else if (event.type === HttpEventType.Response) {
+              emitCompleteBlocks(event.body ?? '');
+            }
+          },
+          error: (error: unknown) => subscriber.error(error),
+          complete: () => subscriber.complete()
+        });
+
+      return () => request.unsubscribe();
+    });
+  }
+
   uploadPhotos(warehouseId: string, batchId: string, files: File[]): Observable<IntakeBatchUploadResponse> {
     const formData = new FormData();
     for (const file of files) {
@@ -168,4 +211,24 @@ export class IntakeService {
   deleteBatch(warehouseId: string, batchId: string): Observable<{ message: string }> {
     return this.http.delete<{ message: string }>(`${environment.apiBaseUrl}/warehouses/${warehouseId}/intake/batches/${batchId}`);
   }
+
+  private parseStreamBlock(block: string): IntakeBatchStreamEvent | null {
+    let eventName = '';
+    const dataLines: string[] = [];
+    for (const line of block.split('\n')) {
+      if (line.startsWith('event: ')) {
+        eventName = line.slice('event: '.length).trim();
+      } else if (line.startsWith('data: ')) {
+        dataLines.push(line.slice('data: '.length));
+      }
+    }
+    if (!eventName || dataLines.length === 0) {
+      return null;
+    }
+    try {
+      return { type: eventName, payload: JSON.parse(dataLines.join('\n')) } as IntakeBatchStreamEvent;
+    } catch {
+      return null;
+    }
+  }
 }